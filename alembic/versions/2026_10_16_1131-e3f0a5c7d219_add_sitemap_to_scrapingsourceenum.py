@@ -0,0 +1,36 @@
+"""Add Sitemap to ScrapingSourceEnum
+
+Revision ID: e3f0a5c7d219
+Revises: b84d2e61c0a7
+Create Date: 2026-10-16 11:31:42.208417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f0a5c7d219'
+down_revision: Union[str, Sequence[str], None] = 'b84d2e61c0a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE scrapingsourceenum ADD VALUE IF NOT EXISTS 'Sitemap'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Postgres cannot drop a value from an enum type, so recreate the type without it
+    op.execute("UPDATE scraping_sources SET source_type = 'Webpage' WHERE source_type = 'Sitemap'")
+    op.execute("ALTER TYPE scrapingsourceenum RENAME TO scrapingsourceenum_old")
+    op.execute("CREATE TYPE scrapingsourceenum AS ENUM ('Webpage', 'Rss', 'Api')")
+    op.execute(
+        "ALTER TABLE scraping_sources ALTER COLUMN source_type TYPE scrapingsourceenum "
+        "USING source_type::text::scrapingsourceenum"
+    )
+    op.execute("DROP TYPE scrapingsourceenum_old")
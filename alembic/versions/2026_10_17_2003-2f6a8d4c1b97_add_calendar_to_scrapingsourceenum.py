@@ -0,0 +1,36 @@
+"""Add Calendar to ScrapingSourceEnum
+
+Revision ID: 2f6a8d4c1b97
+Revises: 7b3f9e0c2d58
+Create Date: 2026-10-17 20:03:12.660385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f6a8d4c1b97'
+down_revision: Union[str, Sequence[str], None] = '7b3f9e0c2d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE scrapingsourceenum ADD VALUE IF NOT EXISTS 'Calendar'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Postgres cannot drop a value from an enum type, so recreate the type without it
+    op.execute("DELETE FROM scraping_sources WHERE source_type = 'Calendar'")
+    op.execute("ALTER TYPE scrapingsourceenum RENAME TO scrapingsourceenum_old")
+    op.execute("CREATE TYPE scrapingsourceenum AS ENUM ('Webpage', 'Rss', 'Api', 'Sitemap')")
+    op.execute(
+        "ALTER TABLE scraping_sources ALTER COLUMN source_type TYPE scrapingsourceenum "
+        "USING source_type::text::scrapingsourceenum"
+    )
+    op.execute("DROP TYPE scrapingsourceenum_old")
@@ -141,6 +141,16 @@ async def update_scraping_source(
     for field, value in source_update.model_dump(exclude_unset=True).items():
         setattr(source, field, value)
 
+    # Make sure the next run processes the source from scratch if what or how it scrapes has changed
+    if any(
+        field in source_update.model_fields_set
+        for field in ["base_url", "source_type", "degrees_of_separation", "scraping_config"]
+    ):
+        source.http_etag = None
+        source.http_last_modified = None
+        source.listing_links_hash = None
+        source.api_cursor = None
+
     await db.commit()
     await db.refresh(source)
     return source
@@ -51,6 +51,51 @@ class Settings(BaseSettings):
     DB_CONNECTION_RETRIES: int = 3
     DB_RETRY_DELAY_BASE: int = 2
 
+    # Scraping HTTP client settings
+    SCRAPING_HTTP_MAX_CONNECTIONS: int = 100
+    SCRAPING_HTTP_MAX_CONNECTIONS_PER_HOST: int = 4
+    SCRAPING_HTTP_TIMEOUT_SECONDS: int = 60
+    SCRAPING_HTTP_CONNECT_TIMEOUT_SECONDS: int = 10
+    SCRAPING_MAX_DOWNLOAD_BYTES: int = 20 * 1024 * 1024
+    # Articles are capped at MAX_ARTICLE_LENGTH characters of text times this many bytes of HTML per character
+    SCRAPING_HTML_BYTES_PER_ARTICLE_CHAR: int = 100
+
+    # Default politeness per domain, can be overridden per ScrapingSource via scraping_config
+    SCRAPING_DOMAIN_REQUESTS_PER_SECOND: float = 1.0
+    SCRAPING_DOMAIN_BURST: int = 2
+
+    # Per-domain exponential backoff after throttling responses and timeouts. Backoffs longer than the max wait skip
+    # the request instead of waiting. After repeated failures the domain's circuit opens for the cooldown period
+    SCRAPING_DOMAIN_BACKOFF_BASE_SECONDS: float = 2.0
+    SCRAPING_DOMAIN_BACKOFF_MAX_SECONDS: float = 5 * 60
+    SCRAPING_DOMAIN_BACKOFF_MAX_WAIT_SECONDS: float = 30
+    SCRAPING_DOMAIN_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    SCRAPING_DOMAIN_CIRCUIT_COOLDOWN_SECONDS: int = 30 * 60
+
+    # Article fan-out: parallel downloads per scraping source (overridable via scraping_config) and across all jobs
+    SCRAPING_SOURCE_CONCURRENCY: int = 8
+    SCRAPING_MAX_CONCURRENT_DOWNLOADS: int = 32
+
+    # Process pool for CPU-heavy parsing (newspaper, content heuristics, markdown, feeds). 0 workers parses in threads
+    SCRAPING_PROCESS_POOL_WORKERS: int = 2
+    SCRAPING_PROCESS_POOL_MAX_TASKS_PER_CHILD: int = 200
+
+    # Time budget per scraping run. Extraction stops this long before the end to leave time for committing events
+    SCRAPING_RUN_BUDGET_SECONDS: int = 30 * 60
+    SCRAPING_COMMIT_RESERVE_SECONDS: int = 5 * 60
+
+    # Compressed on-disk cache of fetched pages. Empty dir disables it, offline mode serves cached pages regardless of age
+    SCRAPING_HTML_CACHE_DIR: str = ".cache/html"
+    SCRAPING_HTML_CACHE_TTL_SECONDS: int = 6 * 60 * 60
+    SCRAPING_HTML_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    SCRAPING_HTML_CACHE_OFFLINE: bool = False
+
+    # Events embedded as schema.org structured data replace the LLM's extraction if they are this similar to the topic
+    SCRAPING_STRUCTURED_EVENT_MIN_TOPIC_SIMILARITY: float = 0.3
+
+    # Only paragraphs mentioning dates go into event extraction prompts, pages without upcoming dates skip the LLM
+    SCRAPING_DATE_PREFILTER: bool = True
+
     PROJECT_EMAIL: str
     PROJECT_EMAIL_PASSWORD: SecretStr
     PROJECT_EMAIL_FROM_NAME: str
@@ -5,6 +5,20 @@ class ScrapingSourceEnum(Enum):
     WEBPAGE = "Webpage"
     RSS = "Rss"
     API = "Api"
+    SITEMAP = "Sitemap"
+    CALENDAR = "Calendar"  # iCalendar (.ics) feed
+
+
+class ScrapeOutcomeEnum(Enum):
+    COMPLETED = "Completed"
+    NOT_MODIFIED = "Not modified"  # Source document unchanged since the last run, so the run was skipped
+    PARTIAL = "Partial"  # Run budget exhausted, the results committed until then are kept
+    FAILED = "Failed"
+
+
+class EventProvenanceEnum(Enum):
+    LLM = "LLM"  # Extracted from the page's text by the event extracting LLM
+    STRUCTURED_DATA = "Structured data"  # Taken from schema.org JSON-LD or microdata embedded in the page
 
 
 def get_enum_values(enum) -> list:
@@ -15,14 +15,19 @@ from fastapi.staticfiles import StaticFiles
 
 from app.api.v1.router import api_router
 from app.core.config import settings
+from app.worker.http_client import close_http_session
+from app.worker.process_pool import shutdown_process_pool, warm_up_process_pool
 from app.worker.scheduler import scheduler
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    warm_up_process_pool()
     scheduler.start()
     yield
     scheduler.shutdown()
+    await close_http_session()
+    shutdown_process_pool()
 
 
 app = FastAPI(
@@ -1,3 +1,6 @@
+from .discovered_url import DiscoveredUrlDB
+from .domain_boilerplate import DomainBoilerplateDB
+from .domain_health import DomainHealthDB
 from .event import EventDB
 from .event_comparison import EventComparisonDB
 from .extracted_event import ExtractedEventDB
@@ -6,4 +9,15 @@ from .topic import TopicDB
 from .user import UserDB
 from .websource import WebSourceDB
 
-__all__ = ["UserDB", "TopicDB", "EventDB", "EventComparisonDB", "ScrapingSourceDB", "ExtractedEventDB", "WebSourceDB"]
+__all__ = [
+    "UserDB",
+    "TopicDB",
+    "EventDB",
+    "EventComparisonDB",
+    "ScrapingSourceDB",
+    "ExtractedEventDB",
+    "WebSourceDB",
+    "DiscoveredUrlDB",
+    "DomainHealthDB",
+    "DomainBoilerplateDB",
+]
@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+if TYPE_CHECKING:
+    from app.models.scraping_source import ScrapingSourceDB
+
+
+class DiscoveredUrlDB(Base):
+    """Article URL that has already been found on the listing page of a ScrapingSource"""
+
+    __tablename__ = "discovered_urls"
+    __table_args__ = (UniqueConstraint("scraping_source_id", "url"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    url: Mapped[str] = mapped_column(String(2048), nullable=False)
+
+    # Scraping Source on whose listing page the URL was found
+    scraping_source_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("scraping_sources.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    scraping_source: Mapped["ScrapingSourceDB"] = relationship(
+        "ScrapingSourceDB", back_populates="discovered_urls", lazy="raise"
+    )
+
+    # Timestamps
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
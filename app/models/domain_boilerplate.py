@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class DomainBoilerplateDB(Base):
+    """Text block fingerprints seen on the pages of a domain, to recognise its navigation, footers and teasers"""
+
+    __tablename__ = "domain_boilerplate"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    domain: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
+
+    pages_seen: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Block fingerprint -> number of pages it was seen on
+    block_counts: Mapped[dict[str, int]] = mapped_column(JSON, nullable=False, default=dict)
+    # Keys of recently recorded pages, so pages parsed again don't count twice
+    recent_pages: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
+    # Structural path of the element that held the main content of the domain's articles, see element_path()
+    content_path: Mapped[list | None] = mapped_column(JSON, nullable=True)
+
+    # Timestamps
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
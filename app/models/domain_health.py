@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class DomainHealthDB(Base):
+    """Backoff and circuit breaker state of a domain that recently throttled or timed out, kept across scraping runs"""
+
+    __tablename__ = "domain_health"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    domain: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
+
+    consecutive_failures: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # HTTP status of the last failure, null for timeouts and connection errors
+    last_failure_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    backoff_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    circuit_open_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Timestamps
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
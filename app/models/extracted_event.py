@@ -4,9 +4,11 @@ from typing import TYPE_CHECKING, Any, Dict
 import pytz
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import JSON, DateTime, Float, ForeignKey, Integer, Interval, String, Text
+from sqlalchemy import Enum as SqlEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
+from app.core.enums import EventProvenanceEnum, get_enum_values
 from app.database import Base
 
 if TYPE_CHECKING:
@@ -32,6 +34,12 @@ class ExtractedEventDB(Base):
     significance: Mapped[float] = mapped_column(Float, nullable=False)
     duration: Mapped[timedelta | None] = mapped_column(Interval, nullable=True)
     additional_infos: Mapped[dict[str, str] | None] = mapped_column(JSON, nullable=True)
+    provenance: Mapped[EventProvenanceEnum] = mapped_column(
+        SqlEnum(EventProvenanceEnum, values_callable=get_enum_values, native_enum=False),
+        nullable=False,
+        default=EventProvenanceEnum.LLM,
+        server_default=EventProvenanceEnum.LLM.value,
+    )
 
     # Fields that mirror the WebSource from which the ExtractedEvent was extracted
     source_url: Mapped[str] = mapped_column(String(1000), nullable=False)
@@ -97,7 +105,12 @@ class ExtractedEventDB(Base):
                 pass
 
         if event_date.tzinfo:
-            event_date = event_date.replace(tzinfo=None)
+            if extracted_event.provenance == EventProvenanceEnum.LLM:
+                # Times read by the LLM are the local time of the event, whatever offset it put on them
+                event_date = event_date.replace(tzinfo=None)
+            else:
+                # Dates with an offset from structured data or calendars are converted, not just relabeled
+                event_date = event_date.astimezone(event_country_timezone).replace(tzinfo=None)
         event_date = event_country_timezone.localize(event_date)
 
         # Localize source published date to UTC
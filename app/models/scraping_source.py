@@ -16,10 +16,11 @@ from sqlalchemy import Enum as SqlEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
-from app.core.enums import ScrapingSourceEnum, get_enum_values
+from app.core.enums import ScrapeOutcomeEnum, ScrapingSourceEnum, get_enum_values
 from app.database import Base
 
 if TYPE_CHECKING:
+    from app.models.discovered_url import DiscoveredUrlDB
     from app.models.extracted_event import ExtractedEventDB
     from app.models.topic import TopicDB
     from app.models.websource import WebSourceDB
@@ -61,6 +62,18 @@ class ScrapingSourceDB(Base):
     )
     currently_scraping: Mapped[bool] = mapped_column(Boolean, default=False, nullable=True)
     last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_scrape_outcome: Mapped[ScrapeOutcomeEnum | None] = mapped_column(
+        SqlEnum(ScrapeOutcomeEnum, values_callable=get_enum_values, native_enum=False),
+        nullable=True,
+    )
+
+    # HTTP validators of the source document as of the last completed run, sent along for conditional GET requests
+    http_etag: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    http_last_modified: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # Hash of the article links found on the listing page as of the last completed run
+    listing_links_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Highest cursor field value of the API records read during the last completed run
+    api_cursor: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
     # Topic relationship
     topic_id: Mapped[int] = mapped_column(Integer, ForeignKey("topics.id", ondelete="CASCADE"), nullable=False)
@@ -85,6 +98,15 @@ class ScrapingSourceDB(Base):
         lazy="raise",
     )
 
+    # Article URLs already found on this ScrapingSource's listing page
+    discovered_urls: Mapped[list["DiscoveredUrlDB"]] = relationship(
+        "DiscoveredUrlDB",
+        back_populates="scraping_source",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
+    )
+
     # Timestamps
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime.datetime] = mapped_column(
@@ -3,6 +3,8 @@ from typing import Any, Dict, List
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.core.enums import EventProvenanceEnum
+
 
 class ExtractedEventBase(BaseModel):
     """Base schema for extracted events"""
@@ -33,6 +35,7 @@ class ExtractedEventBase(BaseModel):
     significance: float = Field(..., ge=0.0, le=1.0)
     duration: timedelta | None = None
     additional_infos: Dict[str, str] | None = None
+    provenance: EventProvenanceEnum = EventProvenanceEnum.LLM
     # Source fields
     source_url: str = Field(..., max_length=1000)
     source_title: str | None = Field(None, max_length=500)
@@ -3,7 +3,7 @@ from typing import Any, Dict
 
 from pydantic import BaseModel, Field
 
-from app.core.enums import ScrapingSourceEnum
+from app.core.enums import ScrapeOutcomeEnum, ScrapingSourceEnum
 
 
 class ScrapingSourceBase(BaseModel):
@@ -11,7 +11,7 @@ class ScrapingSourceBase(BaseModel):
 
     name: str = Field(..., min_length=1, max_length=200)
     base_url: str = Field(..., max_length=500)
-    source_type: ScrapingSourceEnum = Field(...)  # "webpage", "rss", "api"
+    source_type: ScrapingSourceEnum = Field(...)  # "webpage", "rss", "api", "sitemap", "calendar"
     country: str | None = Field(None, max_length=100)  # Country name
     country_code: str | None = Field(None, max_length=2)  # ISO 3166-1 alpha-2
     language: str | None = Field(None, max_length=100)  # Language name
@@ -56,6 +56,7 @@ class ScrapingSourceResponse(ScrapingSourceBase):
     last_scraped_at: datetime | None = None
     currently_scraping: bool | None = None
     last_error: str | None = None
+    last_scrape_outcome: ScrapeOutcomeEnum | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Literal
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+from dateutil import parser as date_parser
+from pydantic import BaseModel, Field
+
+from .deadline import Deadline
+from .http_client import fetch
+from .scraping_models import ExtractedEventBase
+from .structured_events import event_from_item
+
+MAX_API_PAGES = 100  # Per run, however many more the API has
+MAX_API_RECORDS = 1000  # Per run. Overridable via scraping_config["api"]["max_records"]
+EPOCH_MILLISECONDS_THRESHOLD = 10**11  # Larger numeric timestamps are in milliseconds
+LINK_HEADER_NEXT_PATTERN = re.compile(r"<([^>]+)>\s*;[^,]*\brel=\"?next\"?", re.IGNORECASE)
+EVENT_DATE_PROPERTIES = ("startDate", "endDate")
+
+
+class ApiPagination(BaseModel):
+    """How to request the pages of an API's results."""
+
+    style: Literal["none", "page", "offset", "cursor", "next_url"] = "none"
+    param: str | None = None  # Query parameter of the page number, offset or cursor. Defaults to the style's name
+    start: int = 1  # Number of the first page
+    size_param: str | None = None  # Query parameter of the number of records per page
+    size: int | None = None  # Records per page. A page with fewer records is the last one
+    cursor_path: str | None = None  # Of the next page's cursor in a response
+    next_url_path: str | None = None  # Of the next page's URL in a response. If unset, the Link header is used
+
+
+class ApiFieldMapping(BaseModel):
+    """Dotted paths of the fields of a record, e.g. "attributes.title" or "links.0.href"."""
+
+    id: str | None = None  # Identifies records without a URL
+    url: str | None = None
+    title: str | None = None
+    date: str | None = None  # Of publication or last update
+    content: str | None = None
+    content_format: Literal["html", "markdown", "text"] = "html"
+    # schema.org Event property -> path, for APIs that publish events, e.g. {"name": "title", "startDate": "starts_at"}
+    event: dict[str, str] = {}
+
+
+class ApiSourceConfig(BaseModel):
+    """How to read records from a JSON API, as configured in scraping_config["api"]."""
+
+    records_path: str = ""  # Of the list of records in a response. Empty if the response is the list
+    params: dict[str, str | int] = {}
+    headers: dict[str, str] = {}
+    pagination: ApiPagination = ApiPagination()
+    fields: ApiFieldMapping = ApiFieldMapping()
+    cursor_param: str | None = None  # Query parameter asking for records after a cursor, e.g. "updated_since"
+    cursor_field: str | None = None  # Path of the record field the next run's cursor is taken from
+    max_records: int = Field(default=MAX_API_RECORDS, ge=1)
+
+
+class ApiRecord(BaseModel):
+    """The mapped fields of a single API record."""
+
+    url: str | None = None
+    title: str | None = None
+    date: datetime | None = None
+    content: str | None = None
+    event: ExtractedEventBase | None = None
+    cursor: Any = None
+
+
+def get_path(data: Any, path: str | None) -> Any:
+    """The value at a dotted path of a JSON document, or None if there is none."""
+    if not path:
+        return data
+    for part in path.split("."):
+        if isinstance(data, dict):
+            data = data.get(part)
+        elif isinstance(data, list) and part.isdigit() and int(part) < len(data):
+            data = data[int(part)]
+        else:
+            return None
+    return data
+
+
+def with_query(url: str, params: dict[str, Any]) -> str:
+    """The URL with the given query parameters added, replacing those of the same name."""
+    parts = urlparse(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({key: str(value) for key, value in params.items()})
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+def parse_record_date(value: Any) -> datetime | None:
+    """A date in UTC from an ISO 8601 or similar string, or from a Unix timestamp in seconds or milliseconds."""
+    if isinstance(value, bool) or value is None or value == "":
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            timestamp = value / 1000 if value > EPOCH_MILLISECONDS_THRESHOLD else value
+            return datetime.fromtimestamp(timestamp, timezone.utc)
+        parsed = date_parser.parse(str(value))
+    except (ValueError, OverflowError, OSError):
+        return None
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+
+def cursor_key(value: Any) -> tuple:
+    """Sort key of a cursor value, ordering numbers numerically and dates chronologically."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return 0, float(value)
+    text = str(value)
+    try:
+        return 0, float(text)
+    except ValueError:
+        pass
+    try:
+        parsed = datetime.fromisoformat(text)
+        return 1, parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+    except ValueError:
+        return 2, text
+
+
+def map_record(record: Any, config: ApiSourceConfig, base_url: str) -> ApiRecord | None:
+    """Pick the configured fields out of a record. Returns None if the record isn't an object."""
+    if not isinstance(record, dict):
+        return None
+    fields = config.fields
+
+    event = None
+    if fields.event:
+        item = {prop: get_path(record, path) for prop, path in fields.event.items()}
+        # Dates are commonly timestamps in APIs, structured data has them as ISO strings
+        for prop in EVENT_DATE_PROPERTIES:
+            if isinstance(item.get(prop), (int, float)):
+                date = parse_record_date(item[prop])
+                item[prop] = date.isoformat() if date else None
+        event = event_from_item(item)
+
+    url = get_path(record, fields.url) if fields.url else None
+    record_id = get_path(record, fields.id) if fields.id else None
+    if not url and record_id in (None, "") and event is not None:
+        # Like calendar events without a UID, an event is identified by what it is about
+        record_id = hashlib.blake2b(f"{event.title}|{event.date}".encode(), digest_size=8).hexdigest()
+    if not url and record_id not in (None, ""):
+        url = f"{base_url}#{record_id}"
+    title = get_path(record, fields.title) if fields.title else None
+    content = get_path(record, fields.content) if fields.content else None
+    return ApiRecord(
+        url=urljoin(base_url, str(url)) if url else None,
+        title=str(title) if title else None,
+        date=parse_record_date(get_path(record, fields.date)) if fields.date else None,
+        content=content if isinstance(content, str) and content.strip() else None,
+        event=event,
+        cursor=get_path(record, config.cursor_field) if config.cursor_field else None,
+    )
+
+
+async def iter_api_pages(
+    config: ApiSourceConfig, url: str, cursor: str | None, deadline: Deadline
+) -> AsyncIterator[list[Any]]:
+    """Request the pages of an API one after another, yielding the records of each.
+
+    Only one page is held at a time, so a run reads as few pages as it needs. Stops at the first empty or short page,
+    when the response has no next cursor or URL, after MAX_API_PAGES pages, or once the deadline should be shed.
+    """
+    pagination = config.pagination
+    params: dict[str, Any] = dict(config.params)
+    if config.cursor_param and cursor:
+        params[config.cursor_param] = cursor
+    if pagination.size_param and pagination.size:
+        params[pagination.size_param] = pagination.size
+    param = pagination.param or pagination.style
+    page, offset = pagination.start, 0
+
+    for _ in range(MAX_API_PAGES):
+        if deadline.should_shed():
+            return
+        if pagination.style == "page":
+            params[param] = page
+        elif pagination.style == "offset":
+            params[param] = offset
+
+        page_url = with_query(url, params) if params else url
+        # API responses may depend on the configured headers, which the cache doesn't tell apart
+        response = await deadline.run(fetch(page_url, headers=config.headers, cache=False))
+        data = json.loads(response.body)
+        records = get_path(data, config.records_path)
+        if not isinstance(records, list):
+            raise ValueError(f"API response of {response.url} has no list of records at '{config.records_path}'")
+        if not records:
+            return
+        yield records
+
+        page, offset = page + 1, offset + len(records)
+        match pagination.style:
+            case "page" | "offset":
+                if pagination.size and len(records) < pagination.size:
+                    return
+            case "cursor":
+                next_cursor = get_path(data, pagination.cursor_path)
+                if next_cursor in (None, ""):
+                    return
+                params[param] = next_cursor
+            case "next_url":
+                if pagination.next_url_path:
+                    next_url = get_path(data, pagination.next_url_path)
+                else:
+                    match = LINK_HEADER_NEXT_PATTERN.search(response.headers.get("link", ""))
+                    next_url = match.group(1) if match else None
+                if not next_url:
+                    return
+                # The next URL carries the query of the next page already
+                url, params = urljoin(response.url, str(next_url)), {}
+            case _:
+                return
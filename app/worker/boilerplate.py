@@ -0,0 +1,90 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Iterable
+
+from pydantic import BaseModel
+
+from .html_cache import canonical_url
+from .scraping_models import ContentPath
+
+MIN_PAGES_FOR_BOILERPLATE = 3  # A block is boilerplate once it has been seen on this many pages of the domain
+BOILERPLATE_PAGE_SHARE = 0.5  # ... and on this share of the pages seen, like headers and footers are on nearly all
+MAX_FINGERPRINTS_PER_DOMAIN = 5000
+MAX_REMEMBERED_PAGES = 500  # Pages parsed again (e.g. once the cache expires) must not count twice
+
+
+def page_key(url: str) -> str:
+    # Tracking parameters and fragments don't make a different page
+    return hashlib.blake2b(canonical_url(url).encode(), digest_size=8).hexdigest()
+
+
+class DomainBoilerplate(BaseModel):
+    """What was learned about the page structure of a domain: how often normalised text blocks have been seen on its
+    pages, and where its articles keep their main content."""
+
+    domain: str
+    pages_seen: int = 0
+    block_counts: dict[str, int] = {}  # Block fingerprint -> number of pages it was seen on
+    recent_pages: list[str] = []  # page_key() of recently recorded pages
+    content_path: ContentPath | None = None  # Of the main content container found on the last page searched
+    updated_at: datetime | None = None
+
+    def fingerprints(self) -> frozenset[str]:
+        """Fingerprints of the blocks that are boilerplate on this domain."""
+        threshold = max(MIN_PAGES_FOR_BOILERPLATE, self.pages_seen * BOILERPLATE_PAGE_SHARE)
+        return frozenset(fingerprint for fingerprint, count in self.block_counts.items() if count >= threshold)
+
+    def record_page(self, url: str, fingerprints: Iterable[str]) -> bool:
+        """Count the blocks of a parsed page. Returns False if the page had already been recorded."""
+        key = page_key(url)
+        if key in self.recent_pages:
+            return False
+        self.recent_pages = [*self.recent_pages, key][-MAX_REMEMBERED_PAGES:]
+        self.pages_seen += 1
+        for fingerprint in set(fingerprints):
+            self.block_counts[fingerprint] = self.block_counts.get(fingerprint, 0) + 1
+
+        # Forget the rarest blocks first, those are the article-specific ones
+        if len(self.block_counts) > MAX_FINGERPRINTS_PER_DOMAIN:
+            ranked = sorted(self.block_counts.items(), key=lambda item: item[1], reverse=True)
+            self.block_counts = dict(ranked[: int(MAX_FINGERPRINTS_PER_DOMAIN * 0.8)])
+        self.updated_at = datetime.now(timezone.utc)
+        return True
+
+
+class BoilerplateStore:
+    """Process-wide store of block fingerprints per domain, learned incrementally from the pages parsed on it.
+
+    Domains are loaded from the database on first use and changed domains are written back at the end of a job.
+    """
+
+    def __init__(self):
+        self.domains: dict[str, DomainBoilerplate] = {}
+        self.dirty: set[str] = set()
+
+    def get(self, domain: str) -> DomainBoilerplate | None:
+        return self.domains.get(domain)
+
+    def load(self, domain: str, boilerplate: DomainBoilerplate | None):
+        self.domains.setdefault(domain, boilerplate or DomainBoilerplate(domain=domain))
+
+    def record_page(self, domain: str, url: str, fingerprints: Iterable[str]):
+        boilerplate = self.domains.setdefault(domain, DomainBoilerplate(domain=domain))
+        if boilerplate.record_page(url, fingerprints):
+            self.dirty.add(domain)
+
+    def record_content_path(self, domain: str, content_path: ContentPath):
+        boilerplate = self.domains.setdefault(domain, DomainBoilerplate(domain=domain))
+        if boilerplate.content_path != content_path:
+            boilerplate.content_path = content_path
+            boilerplate.updated_at = datetime.now(timezone.utc)
+            self.dirty.add(domain)
+
+    def pop_dirty(self) -> list[DomainBoilerplate]:
+        """Return the domains that changed since the last call, for persisting them."""
+        changed = [self.domains[domain] for domain in self.dirty if domain in self.domains]
+        self.dirty.clear()
+        return changed
+
+
+boilerplate_store = BoilerplateStore()
@@ -0,0 +1,205 @@
+import hashlib
+import io
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from dateutil import rrule
+from pydantic import TypeAdapter, ValidationError
+
+from .scraping_models import CalendarEvent, ExtractedEventBase
+from .structured_events import (
+    MAX_LOCATION_LENGTH,
+    MAX_TITLE_LENGTH,
+    STRUCTURED_EVENT_SIGNIFICANCE,
+    truncate_description,
+)
+
+ESCAPED_TEXT_PATTERN = re.compile(r"\\([\\;,nN])")
+MAX_RRULE_LENGTH = 1000
+# Finding the next occurrence of rules repeating more often than daily can take millions of steps
+SUPPORTED_RRULE_FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+RRULE_FREQUENCY_PATTERN = re.compile(r"FREQ=(\w+)")
+
+duration_adapter = TypeAdapter(timedelta)
+
+
+def parse_calendar(body: bytes, not_before: datetime, keywords: list[str], max_events: int) -> list[CalendarEvent]:
+    """Read the upcoming events of an iCalendar (.ics) feed. Runs in the process pool.
+
+    Events are streamed from the feed one VEVENT at a time. Events that are over by `not_before` or cancelled are
+    skipped, as are events that mention none of `keywords` (if given). Recurring events are represented by their
+    next occurrence. Returns at most `max_events` events, soonest first.
+    """
+    keywords = [keyword.casefold() for keyword in keywords if keyword]
+    events = []
+    for properties in iter_vevents(body):
+        calendar_event = _calendar_event(properties, not_before)
+        if calendar_event is None:
+            continue
+        if keywords:
+            event = calendar_event.event
+            text = f"{event.title}\n{event.description}\n{event.location or ''}".casefold()
+            if not any(keyword in text for keyword in keywords):
+                continue
+        events.append(calendar_event)
+    events.sort(key=lambda calendar_event: _as_utc(calendar_event.event.date))
+    return events[:max_events]
+
+
+def iter_vevents(body: bytes):
+    """Properties of each VEVENT in a calendar, as {name: (parameters, value)} with the first value of each name.
+
+    Properties of components nested in an event, like VALARM, are ignored.
+    """
+    components = []
+    properties = {}
+    for line in _unfold(body):
+        parsed = _parse_content_line(line)
+        if parsed is None:
+            continue
+        name, parameters, value = parsed
+        if name == "BEGIN":
+            components.append(value.upper())
+            if components[-1] == "VEVENT":
+                properties = {}
+        elif name == "END":
+            if components and components.pop() == "VEVENT":
+                yield properties
+        elif components and components[-1] == "VEVENT":
+            properties.setdefault(name, (parameters, value))
+
+
+def _unfold(body: bytes):
+    """Content lines of a calendar, with lines folded onto continuation lines joined again."""
+    current = None
+    for line in io.StringIO(body.decode("utf-8", errors="replace"), newline=None):
+        line = line.rstrip("\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _parse_content_line(line: str) -> tuple[str, dict[str, str], str] | None:
+    """Split a line like DTSTART;TZID="Europe/Berlin":20261103T090000 into name, parameters and value."""
+    in_quotes = False
+    for index, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            break
+    else:
+        return None
+    name, *parameters = line[:index].split(";")
+    parameters = dict(parameter.split("=", 1) for parameter in parameters if "=" in parameter)
+    return (
+        name.strip().upper(),
+        {key.upper(): value.strip('"') for key, value in parameters.items()},
+        line[index + 1 :],
+    )
+
+
+def _text(property: tuple[dict[str, str], str] | None) -> str | None:
+    if property is None:
+        return None
+    text = ESCAPED_TEXT_PATTERN.sub(lambda match: "\n" if match.group(1) in "nN" else match.group(1), property[1])
+    return text.strip() or None
+
+
+def _datetime(property: tuple[dict[str, str], str] | None) -> datetime | date | None:
+    """A DATE or DATE-TIME value. Times are timezone-aware if given in UTC or with a known TZID."""
+    if property is None:
+        return None
+    parameters, value = property
+    value = value.strip().split(",")[0]
+    try:
+        if parameters.get("VALUE") == "DATE" or len(value) == 8:
+            return datetime.strptime(value, "%Y%m%d").date()
+        parsed = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+    except ValueError:
+        return None
+    if value.endswith("Z"):
+        return parsed.replace(tzinfo=timezone.utc)
+    if "TZID" in parameters:
+        try:
+            return parsed.replace(tzinfo=ZoneInfo(parameters["TZID"]))
+        except (ZoneInfoNotFoundError, ValueError):
+            pass  # E.g. Windows timezone names, the local time is still right
+    return parsed
+
+
+def _as_utc(value: datetime | date) -> datetime:
+    """For comparisons only: dates as midnight, naive times as if they were UTC."""
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _next_occurrence(start: datetime | date, rule: str, not_before: datetime) -> datetime | date | None:
+    """The first occurrence of a recurring event that starts at or after not_before."""
+    frequency = RRULE_FREQUENCY_PATTERN.search(rule.upper())
+    if frequency is None or frequency.group(1) not in SUPPORTED_RRULE_FREQUENCIES:
+        return None
+    dtstart = start if isinstance(start, datetime) else datetime.combine(start, time())
+    after = not_before if dtstart.tzinfo else not_before.replace(tzinfo=None)
+    try:
+        occurrence = rrule.rrulestr(rule[:MAX_RRULE_LENGTH], dtstart=dtstart).after(after, inc=True)
+    except (ValueError, TypeError):
+        return None
+    if occurrence is None:
+        return None
+    return occurrence if isinstance(start, datetime) else occurrence.date()
+
+
+def _calendar_event(properties: dict, not_before: datetime) -> CalendarEvent | None:
+    title = _text(properties.get("SUMMARY"))
+    start = _datetime(properties.get("DTSTART"))
+    if not title or start is None or (_text(properties.get("STATUS")) or "").upper() == "CANCELLED":
+        return None
+
+    duration = None
+    if "DURATION" in properties:
+        try:
+            duration = duration_adapter.validate_python(properties["DURATION"][1].strip())
+        except ValidationError:
+            pass
+    else:
+        end = _datetime(properties.get("DTEND"))
+        # DTEND is exclusive, so an all-day event ends on the following day
+        if end is not None and type(end) is type(start) and _as_utc(end) > _as_utc(start):
+            duration = _as_utc(end) - _as_utc(start)
+    duration = duration if duration and duration > timedelta(0) else None
+
+    revision = _datetime(properties.get("LAST-MODIFIED")) or _datetime(properties.get("CREATED"))
+    if "RRULE" in properties:
+        start = _next_occurrence(start, properties["RRULE"][1], not_before)
+        if start is None:
+            return None
+        # Every occurrence is a separate event
+        revision = start
+    elif _as_utc(start) + (duration or timedelta(0)) < not_before:
+        return None
+
+    location = _text(properties.get("LOCATION"))
+    url = _text(properties.get("URL"))
+    return CalendarEvent(
+        # Feeds are required to give UIDs, but not all do
+        uid=_text(properties.get("UID")) or hashlib.blake2b(f"{title}{start}".encode(), digest_size=8).hexdigest(),
+        url=url,
+        revision=_as_utc(revision or start),
+        event=ExtractedEventBase(
+            title=title[:MAX_TITLE_LENGTH],
+            description=truncate_description(_text(properties.get("DESCRIPTION")) or title),
+            date=start,
+            snippet=title[:MAX_TITLE_LENGTH],
+            location=location[:MAX_LOCATION_LENGTH] if location else None,
+            significance=STRUCTURED_EVENT_SIGNIFICANCE,
+            duration=duration,
+            additional_infos={"Event page": url} if url else None,
+        ),
+    )
@@ -0,0 +1,342 @@
+import re
+from datetime import date, datetime, timedelta
+from functools import cache
+from typing import NamedTuple
+
+CONTEXT_PARAGRAPHS = 1  # Kept before and after every paragraph that mentions a date
+MAX_YEARS_AHEAD = 10  # Later years are more likely to be numbers like amounts or case numbers
+OMISSION_MARKER = "[…]"
+PARAGRAPH_SEPARATOR_PATTERN = re.compile(r"\n\s*\n")
+DAY_FORMATS = frozenset({"iso", "slashed", "dotted", "day_month", "month_day"})  # Formats that name a specific day
+
+# Full names and common abbreviations, from January to December
+MONTHS = {
+    "en": [
+        "january|jan",
+        "february|feb",
+        "march|mar",
+        "april|apr",
+        "may",
+        "june|jun",
+        "july|jul",
+        "august|aug",
+        "september|sept|sep",
+        "october|oct",
+        "november|nov",
+        "december|dec",
+    ],
+    "de": [
+        "januar|jänner|jan",
+        "februar|feb",
+        "märz|mär",
+        "april|apr",
+        "mai",
+        "juni|jun",
+        "juli|jul",
+        "august|aug",
+        "september|sept|sep",
+        "oktober|okt",
+        "november|nov",
+        "dezember|dez",
+    ],
+    "fr": [
+        "janvier|janv",
+        "février|fevrier|févr",
+        "mars",
+        "avril|avr",
+        "mai",
+        "juin",
+        "juillet|juil",
+        "août|aout",
+        "septembre|sept",
+        "octobre|oct",
+        "novembre|nov",
+        "décembre|decembre|déc",
+    ],
+    "es": [
+        "enero",
+        "febrero",
+        "marzo",
+        "abril",
+        "mayo",
+        "junio",
+        "julio",
+        "agosto",
+        "septiembre|setiembre",
+        "octubre",
+        "noviembre",
+        "diciembre",
+    ],
+    "it": [
+        "gennaio",
+        "febbraio",
+        "marzo",
+        "aprile",
+        "maggio",
+        "giugno",
+        "luglio",
+        "agosto",
+        "settembre",
+        "ottobre",
+        "novembre",
+        "dicembre",
+    ],
+    "nl": [
+        "januari",
+        "februari",
+        "maart",
+        "april",
+        "mei",
+        "juni",
+        "juli",
+        "augustus",
+        "september",
+        "oktober",
+        "november",
+        "december",
+    ],
+}
+WEEKDAYS = {
+    "en": "monday|tuesday|wednesday|thursday|friday|saturday|sunday",
+    "de": "montag|dienstag|mittwoch|donnerstag|freitag|samstag|sonnabend|sonntag",
+    "fr": "lundi|mardi|mercredi|jeudi|vendredi|samedi|dimanche",
+    "es": "lunes|martes|miércoles|jueves|viernes|sábado|domingo",
+    "it": "lunedì|martedì|mercoledì|giovedì|venerdì|sabato|domenica",
+    "nl": "maandag|dinsdag|woensdag|donderdag|vrijdag|zaterdag|zondag",
+}
+# Expressions that refer to the future by themselves. {weekday} stands for the language's weekdays
+UPCOMING_EXPRESSIONS = {
+    "en": [
+        r"tomorrow",
+        r"tonight",
+        r"upcoming",
+        r"(?:next|coming) (?:week(?:end)?|month|year|{weekday})",
+        r"this (?:weekend|{weekday})",
+        r"later (?:this|in the) (?:week|month|year)",
+        r"in (?:\d+|a|one|two|three|four|a few) (?:days?|weeks?|months?)",
+    ],
+    "de": [
+        r"übermorgen",
+        r"heute abend",
+        r"demnächst",
+        r"(?:nächste|kommende)[nrs]? (?:woche(?:nende)?|monat|jahr|{weekday})",
+        r"(?:diese[nrs]?|ab|bis) (?:wochenende|{weekday})",
+        r"(?:später|noch) in diese[mr] (?:woche|monat|jahr)",
+        r"in (?:\d+|einer|einem|zwei|drei|vier|wenigen) (?:tagen|wochen?|monaten?)",
+    ],
+    "fr": [
+        r"demain",
+        r"ce soir",
+        r"à venir",
+        r"prochaine?s?",
+        r"(?:dans|d'ici) (?:\d+|un|une|deux|trois|quelques) (?:jours?|semaines?|mois)",
+    ],
+    "es": [
+        r"mañana",
+        r"esta noche",
+        r"próxim[oa]s?",
+        r"que viene",
+        r"(?:dentro de|en) (?:\d+|un|una|dos|tres|unos|unas) (?:días?|semanas?|meses)",
+    ],
+    "it": [
+        r"domani",
+        r"stasera",
+        r"prossim[oaie]",
+        r"(?:tra|fra) (?:\d+|un|una|due|tre|pochi|qualche) (?:giorni?|settimane?|mesi|mese)",
+    ],
+    "nl": [
+        r"overmorgen",
+        r"vanavond",
+        r"binnenkort",
+        r"(?:volgende|komende|aanstaande) (?:week|maand|jaar|{weekday})",
+        r"over (?:\d+|een|twee|drie) (?:dagen|weken|maanden)",
+    ],
+}
+# Only matched in lower case, as "Morgen" is the morning
+LOWERCASE_UPCOMING_EXPRESSIONS = {"de": [r"morgen"], "nl": [r"morgen"]}
+# Languages whose numeric dates put the month first, as in 12/3/2026
+MONTH_FIRST_LANGUAGES = {"en"}
+
+# Numeric date and time formats, alternatives of DateMatcher's pattern together with the language-specific ones
+ISO_DATE = r"(?P<iso>(?P<iso_year>20\d{2})-(?P<iso_month>\d{1,2})-(?P<iso_day>\d{1,2})\b)"
+SLASHED_DATE = r"(?P<slashed>(?P<slashed_first>\d{1,2})/(?P<slashed_second>\d{1,2})/(?P<slashed_year>\d{4}|\d{2})\b)"
+DOTTED_DATE = (
+    r"(?P<dotted>(?P<dotted_day>\d{1,2})\.\s?(?P<dotted_month>\d{1,2})\.(?:\s?(?P<dotted_year>\d{4}|\d{2})\b)?)"
+)
+TIME = r"(?P<time>\d{1,2}(?::\d{2}\b|(?:[.:]\d{2})?\s?(?:uhr|a\.m\.|p\.m\.)(?!\w)))"
+YEAR = r"(?P<year>20\d{2}\b)"
+
+
+class DatePassages(NamedTuple):
+    markdown: str  # The kept paragraphs, with omissions marked
+    paragraphs: int
+    kept: int  # Paragraphs, including their context
+    upcoming: int  # Mentions of dates after the reference date
+
+
+class DateMatcher:
+    """Finds date expressions in the given languages and tells whether they refer to a day after a reference date.
+
+    The reference date itself doesn't count, so that a page's own dateline doesn't make it look ahead. All formats are
+    alternatives of a single pattern, matched against the lower-cased text, so a text is scanned only once and an
+    expression like "3. Dezember 2026" counts once rather than as a date, a month and a year.
+    """
+
+    def __init__(self, languages: tuple[str, ...]):
+        self.months = {
+            name: number
+            for language in languages
+            for number, names in enumerate(MONTHS[language], start=1)
+            for name in names.split("|")
+        }
+        month = "|".join(sorted(map(re.escape, self.months), key=len, reverse=True))
+        weekday = "|".join(WEEKDAYS[language] for language in languages)
+        upcoming = "|".join(
+            expression.format(weekday=weekday)
+            for language in languages
+            for expression in UPCOMING_EXPRESSIONS[language]
+        )
+        day_month = (
+            rf"(?P<day_month>(?P<day_month_day>\d{{1,2}})(?:\.|st|nd|rd|th|er)?\s+(?:de\s+)?(?P<day_month_month>{month})\b"
+            rf"\.?(?:,?\s+(?:de\s+)?(?P<day_month_year>\d{{4}})\b)?)"
+        )
+        month_day = (
+            rf"(?P<month_day>(?P<month_day_month>{month})\b\.?\s+(?P<month_day_day>\d{{1,2}})(?:st|nd|rd|th)?\b"
+            rf"(?:,?\s+(?P<month_day_year>\d{{4}})\b)?)"
+        )
+        month_year = rf"(?P<month_year>(?P<month_year_month>{month})\b\.?\s+(?P<month_year_year>\d{{4}})\b)"
+        # Earlier alternatives take precedence, e.g. a full date over the year in it
+        alternatives = [
+            ISO_DATE,
+            SLASHED_DATE,
+            DOTTED_DATE,
+            day_month,
+            TIME,
+            month_day,
+            month_year,
+            YEAR,
+            rf"(?P<weekday>(?:{weekday})\b)",
+            rf"(?P<upcoming>(?:{upcoming})\b)",
+        ]
+        self.pattern = re.compile(r"\b(?:" + "|".join(alternatives) + ")")
+
+        lowercase_expressions = [
+            expression for language in languages for expression in LOWERCASE_UPCOMING_EXPRESSIONS.get(language, [])
+        ]
+        self.lowercase_upcoming = (
+            re.compile(r"\b(?:" + "|".join(dict.fromkeys(lowercase_expressions)) + r")\b")
+            if lowercase_expressions
+            else None
+        )
+        self.month_first = languages[0] in MONTH_FIRST_LANGUAGES
+
+    def scan(self, text: str, reference: date) -> tuple[int, int]:
+        """The number of date expressions in the text, and how many of them refer to a day after the reference date."""
+        mentions, upcoming = 0, 0
+        for is_upcoming in self._dates(text, reference):
+            if is_upcoming is not None:
+                mentions += 1
+                upcoming += is_upcoming
+        return mentions, upcoming
+
+    def mentions_day(self, text: str) -> bool:
+        """Whether the text names a specific day, as announcements of events do."""
+        return any(found.lastgroup in DAY_FORMATS for found in self.pattern.finditer(text.lower()))
+
+    def _dates(self, text: str, reference: date):
+        for found in self.pattern.finditer(text.lower()):
+            group = found.group
+            match found.lastgroup:
+                case "iso":
+                    yield self._day(reference, group("iso_day"), group("iso_month"), group("iso_year"))
+                case "slashed":
+                    first, second, year = group("slashed_first"), group("slashed_second"), group("slashed_year")
+                    day, month = (second, first) if self.month_first else (first, second)
+                    # Fall back to the other order if the date is invalid in the language's one, e.g. 25/12/2026 in English
+                    is_upcoming = self._day(reference, day, month, year)
+                    yield is_upcoming if is_upcoming is not None else self._day(reference, month, day, year)
+                case "dotted":
+                    yield self._day(reference, group("dotted_day"), group("dotted_month"), group("dotted_year"))
+                case "day_month":
+                    month = self.months[group("day_month_month")]
+                    yield self._day(reference, group("day_month_day"), month, group("day_month_year"))
+                case "month_day":
+                    month = self.months[group("month_day_month")]
+                    yield self._day(reference, group("month_day_day"), month, group("month_day_year"))
+                case "month_year":
+                    month = self.months[group("month_year_month")]
+                    yield (int(group("month_year_year")), month) > (reference.year, reference.month)
+                case "year":
+                    yield reference.year < int(group("year")) <= reference.year + MAX_YEARS_AHEAD
+                case "upcoming":
+                    yield True
+                case _:
+                    # Weekdays and times are dates as well, but could just as well be in the past
+                    yield False
+        if self.lowercase_upcoming is not None:
+            for _ in self.lowercase_upcoming.finditer(text):
+                yield True
+
+    @staticmethod
+    def _day(reference: date, day: str, month: str | int, year: str | None) -> bool | None:
+        """Whether the day is after the reference date, or None if it is no valid date."""
+        try:
+            if year is None:
+                # Without a year, the date is the occurrence of the day closest to the reference date
+                candidate = date(reference.year, int(month), int(day))
+                if candidate < reference - timedelta(days=183):
+                    candidate = date(reference.year + 1, int(month), int(day))
+                elif candidate > reference + timedelta(days=183):
+                    candidate = date(reference.year - 1, int(month), int(day))
+            else:
+                candidate = date(int(year) + 2000 if len(year) == 2 else int(year), int(month), int(day))
+        except ValueError:
+            return None
+        return candidate > reference
+
+
+@cache
+def date_matcher(language_code: str | None) -> DateMatcher:
+    """The matcher for a source's language and English, or for all known languages if the language is unknown."""
+    code = (language_code or "").split("-")[0].lower()
+    if code in MONTHS:
+        return DateMatcher(tuple(dict.fromkeys([code, "en"])))
+    return DateMatcher(tuple(MONTHS))
+
+
+def select_date_passages(markdown: str, language_code: str | None, reference: datetime | date | None) -> DatePassages:
+    """The paragraphs of a page's markdown that mention dates, each with CONTEXT_PARAGRAPHS paragraphs around it. Runs
+    in the process pool.
+
+    The first paragraph, usually the page's title, is kept along with them. Dates are judged relative to the reference
+    date, e.g. the page's publish date: a page with no upcoming mentions is unlikely to announce an event.
+    """
+    reference = reference or datetime.now()
+    reference = reference.date() if isinstance(reference, datetime) else reference
+    matcher = date_matcher(language_code)
+
+    paragraphs = [paragraph for paragraph in PARAGRAPH_SEPARATOR_PATTERN.split(markdown) if paragraph.strip()]
+    keep, upcoming = set(), 0
+    for index, paragraph in enumerate(paragraphs):
+        paragraph_mentions, paragraph_upcoming = matcher.scan(paragraph, reference)
+        upcoming += paragraph_upcoming
+        if paragraph_mentions:
+            keep.update(range(max(index - CONTEXT_PARAGRAPHS, 0), index + CONTEXT_PARAGRAPHS + 1))
+    if keep:
+        keep.add(0)
+
+    kept, previous = [], -1
+    for index in sorted(index for index in keep if index < len(paragraphs)):
+        if index > previous + 1:
+            kept.append(OMISSION_MARKER)
+        kept.append(paragraphs[index])
+        previous = index
+    if kept and previous < len(paragraphs) - 1:
+        kept.append(OMISSION_MARKER)
+
+    return DatePassages(
+        markdown="\n\n".join(kept),
+        paragraphs=len(paragraphs),
+        kept=len([index for index in keep if index < len(paragraphs)]),
+        upcoming=upcoming,
+    )
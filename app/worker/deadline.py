@@ -0,0 +1,67 @@
+import asyncio
+import time
+from typing import Awaitable, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """The time budget of a scraping run is used up."""
+
+
+class Deadline:
+    """Time budget of a scraping run, passed down to every stage that fetches, parses or calls a model.
+
+    Stages check `should_shed()` before starting new work and await slow operations through `run()`, which caps
+    them at the remaining budget. Whether any work had to be shed is recorded in `shed`.
+    """
+
+    def __init__(self, seconds: float | None):
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+        self.shed = False
+
+    def reserve(self, seconds: float) -> "Deadline":
+        """A deadline that expires `seconds` earlier, leaving that much of the budget for later stages."""
+        deadline = Deadline(None)
+        if self.expires_at is not None:
+            deadline.expires_at = self.expires_at - seconds
+        return deadline
+
+    def remaining(self) -> float | None:
+        """Seconds left, or None if the budget is unlimited."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() == 0
+
+    def should_shed(self) -> bool:
+        """Whether remaining work should be skipped because the budget is used up."""
+        if self.expired:
+            self.shed = True
+            return True
+        return False
+
+    async def run(self, awaitable: Awaitable[T], timeout: float | None = None) -> T:
+        """Await with the given per-operation timeout, capped at the remaining budget.
+
+        Raises DeadlineExceeded if the budget runs out, and asyncio.TimeoutError if only the operation's own
+        timeout is hit.
+        """
+        remaining = self.remaining()
+        if remaining == 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()  # Avoid "coroutine was never awaited" warnings
+            self.shed = True
+            raise DeadlineExceeded("Scraping run budget exhausted")
+
+        limits = [limit for limit in (timeout, remaining) if limit is not None]
+        try:
+            return await asyncio.wait_for(awaitable, timeout=min(limits) if limits else None)
+        except asyncio.TimeoutError:
+            if self.expired:
+                self.shed = True
+                raise DeadlineExceeded("Scraping run budget exhausted") from None
+            raise
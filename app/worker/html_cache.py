@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import zstandard
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+TRACKING_PARAM_PREFIXES = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+EVICTION_TARGET_RATIO = 0.9  # Evict down to this share of the size limit, so not every write triggers an eviction
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL so that trivially different spellings of the same page share a cache entry."""
+    parsed = urlparse(url)
+    netloc = parsed.netloc.lower()
+    if (parsed.scheme == "http" and netloc.endswith(":80")) or (parsed.scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+            if not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+        )
+    )
+    return urlunparse((parsed.scheme.lower(), netloc, parsed.path or "/", parsed.params, query, ""))
+
+
+class CacheEntry(BaseModel):
+    """Index entry of a cached response. The body itself is stored as a separate, content-addressed blob."""
+
+    url: str  # Final URL, after redirects
+    headers: dict[str, str]
+    encoding: str
+    blob: str  # SHA-256 of the uncompressed body
+    stored_at: float
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self.headers.get("last-modified")
+
+    def is_fresh(self, ttl_seconds: int) -> bool:
+        return time.time() - self.stored_at < ttl_seconds
+
+
+class HtmlCache:
+    """Compressed on-disk cache of fetched pages with a TTL and size-bounded LRU eviction.
+
+    The index maps the hash of a canonical URL to a small JSON entry holding the response's validators, bodies are
+    stored zstd-compressed under the hash of their content, so identical pages reached via different URLs (or different
+    scraping sources) are only stored once. Recency is tracked via the mtime of index entries.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: int, max_bytes: int):
+        self.enabled = bool(directory)
+        self.directory = Path(directory)
+        self.index_dir = self.directory / "index"
+        self.blob_dir = self.directory / "blobs"
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._size: int | None = None  # Total size of all blobs, computed lazily
+        self._lock = asyncio.Lock()  # Serializes writes and evictions
+
+    def _index_path(self, url: str) -> Path:
+        return self.index_dir / f"{hashlib.sha256(canonical_url(url).encode()).hexdigest()}.json"
+
+    def _blob_path(self, blob: str) -> Path:
+        return self.blob_dir / blob[:2] / f"{blob}.zst"
+
+    async def get(self, url: str) -> CacheEntry | None:
+        """Return the cache entry for a URL, regardless of its age, or None."""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self._get, url)
+
+    def _get(self, url: str) -> CacheEntry | None:
+        index_path = self._index_path(url)
+        try:
+            entry = CacheEntry.model_validate_json(index_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not self._blob_path(entry.blob).exists():
+            return None
+        os.utime(index_path)  # Mark as recently used
+        return entry
+
+    async def read_body(self, entry: CacheEntry) -> bytes | None:
+        """Return the decompressed body of a cache entry, or None if it has been evicted in the meantime."""
+        return await asyncio.to_thread(self._read_body, entry)
+
+    def _read_body(self, entry: CacheEntry) -> bytes | None:
+        try:
+            return zstandard.ZstdDecompressor().decompress(self._blob_path(entry.blob).read_bytes())
+        except (OSError, zstandard.ZstdError):
+            return None
+
+    async def put(self, requested_url: str, url: str, headers: dict[str, str], encoding: str, body: bytes):
+        """Store a response under the URL it was requested with."""
+        if not self.enabled:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._put, requested_url, url, headers, encoding, body)
+
+    def _put(self, requested_url: str, url: str, headers: dict[str, str], encoding: str, body: bytes):
+        blob = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(blob)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            compressed = zstandard.ZstdCompressor(level=10).compress(body)
+            self._write_atomically(blob_path, compressed)
+            if self._size is None:
+                self._size = self._compute_size()
+            else:
+                self._size += len(compressed)
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        entry = CacheEntry(url=url, headers=headers, encoding=encoding, blob=blob, stored_at=time.time())
+        self._write_atomically(self._index_path(requested_url), entry.model_dump_json().encode())
+
+        if (self._size or 0) > self.max_bytes:
+            self._evict()
+
+    async def touch(self, url: str):
+        """Mark a cached response as freshly validated, e.g. after a 304 response."""
+        if not self.enabled:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._touch, url)
+
+    def _touch(self, url: str):
+        index_path = self._index_path(url)
+        try:
+            entry = CacheEntry.model_validate_json(index_path.read_bytes())
+        except (OSError, ValueError):
+            return
+        entry.stored_at = time.time()
+        self._write_atomically(index_path, entry.model_dump_json().encode())
+
+    @staticmethod
+    def _write_atomically(path: Path, data: bytes):
+        tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def _compute_size(self) -> int:
+        return sum(path.stat().st_size for path in self.blob_dir.glob("*/*.zst"))
+
+    def _evict(self):
+        """Drop the least recently used entries until the cache is below its size limit, then remove orphaned blobs."""
+        entries = []
+        for index_path in self.index_dir.glob("*.json"):
+            try:
+                entries.append((index_path.stat().st_mtime, index_path, json.loads(index_path.read_bytes())["blob"]))
+            except (OSError, ValueError, KeyError):
+                index_path.unlink(missing_ok=True)
+        entries.sort()
+
+        blob_sizes = {path.stem: path.stat().st_size for path in self.blob_dir.glob("*/*.zst")}
+        referenced = {}
+        for _, _, blob in entries:
+            referenced[blob] = referenced.get(blob, 0) + 1
+
+        size = sum(blob_sizes.values())
+        target = self.max_bytes * EVICTION_TARGET_RATIO
+        for _, index_path, blob in entries:
+            if size <= target:
+                break
+            index_path.unlink(missing_ok=True)
+            referenced[blob] -= 1
+            if referenced[blob] == 0 and blob in blob_sizes:
+                self._blob_path(blob).unlink(missing_ok=True)
+                size -= blob_sizes.pop(blob)
+
+        for blob in [blob for blob in blob_sizes if not referenced.get(blob)]:
+            self._blob_path(blob).unlink(missing_ok=True)
+            size -= blob_sizes.pop(blob)
+
+        self._size = size
+
+
+html_cache = HtmlCache(
+    directory=settings.SCRAPING_HTML_CACHE_DIR,
+    ttl_seconds=settings.SCRAPING_HTML_CACHE_TTL_SECONDS,
+    max_bytes=settings.SCRAPING_HTML_CACHE_MAX_BYTES,
+)
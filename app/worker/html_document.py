@@ -0,0 +1,45 @@
+import html
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from markdownify import MarkdownConverter
+
+
+class HtmlDocument:
+    """An HTML page parsed once, shared by all heuristics that inspect it and by markdown conversion.
+
+    The tree is built lazily with bs4's lxml builder, which is several times faster than html.parser. Heuristics that
+    clean up the page (e.g. `sanitize_html`) modify the tree in place, so a document should only be reused for
+    conversions after those.
+    """
+
+    def __init__(self, raw_html: str | None):
+        self.html = raw_html or ""
+        self._soup: BeautifulSoup | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.html.strip()
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, "lxml")
+        return self._soup
+
+
+def clean_text(node: Tag) -> Tag:
+    """Unescape leftover (double-escaped) entities like &amp;shy; and remove soft hyphens from all text in a node."""
+    for string in list(node.find_all(string=True)):
+        if type(string) is not NavigableString:
+            continue
+        cleaned = html.unescape(string).replace("\xad", "")
+        if cleaned != string:
+            string.replace_with(cleaned)
+    return node
+
+
+def html_to_markdown(node: Tag) -> str:
+    """Convert an already parsed document or element to markdown, without serializing and re-parsing it."""
+    markdown = MarkdownConverter().convert_soup(node)
+    # Block-level elements are surrounded by blank lines, which markdownify only trims at the document level
+    return markdown if isinstance(node, BeautifulSoup) else markdown.strip("\n")
@@ -0,0 +1,628 @@
+import hashlib
+import io
+from typing import TYPE_CHECKING, NamedTuple
+from urllib.parse import urljoin, urlparse
+
+import feedparser
+from bs4 import BeautifulSoup, Comment, Tag
+from lxml import etree
+from newspaper import Article
+
+from .date_mentions import date_matcher
+from .html_document import HtmlDocument, clean_text, html_to_markdown
+from .scraping_models import ContentPath, ParsedArticle, ParsedListing
+from .structured_events import extract_structured_events
+
+if TYPE_CHECKING:
+    from loguru import Logger
+
+
+MIN_ARTICLE_LENGTH = 1000
+MAX_ARTICLE_LENGTH = 30000
+MIN_LISTING_ARTICLE_LINKS = 5  # A page with fewer links that look like article links isn't a listing page
+
+# Blocks that are fingerprinted to learn which ones repeat across the pages of a domain
+BOILERPLATE_BLOCK_TAGS = [
+    "div",
+    "section",
+    "header",
+    "footer",
+    "nav",
+    "aside",
+    "form",
+    "ul",
+    "ol",
+    "li",
+    "p",
+    "table",
+    "figure",
+    "blockquote",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+]
+MIN_BLOCK_TEXT_LENGTH = 20
+MAX_BLOCK_TEXT_LENGTH = 2000  # Larger containers hold page-specific content anyway
+
+
+class CollectingLogger:
+    """Stands in for a loguru logger in worker processes. The caller replays the collected messages."""
+
+    def __init__(self):
+        self.messages: list[str] = []
+
+    def info(self, message: str, **kwargs):
+        self.messages.append(message.format(**kwargs) if kwargs else message)
+
+
+def parse_article_html(
+    url: str,
+    raw_html: str,
+    boilerplate: frozenset[str] = frozenset(),
+    content_path: ContentPath | None = None,
+) -> ParsedArticle:
+    """Parse an article with newspaper and convert its main content to markdown. Runs in the process pool.
+
+    Blocks whose fingerprints are in `boilerplate` (learned from other pages of the same domain) are dropped before
+    the main content is scored and before markdown conversion. The fingerprints of the page's own blocks are returned,
+    so the caller can learn from them. Likewise, `content_path` is where the main content container was found on an
+    earlier page of the domain, and the path of the container found on this page is returned.
+
+    Events embedded as schema.org structured data are returned as well, so they need not be extracted by the LLM.
+    """
+    logger = CollectingLogger()
+    article = Article(url, memoize_articles=False, disable_category_cache=True)
+    article.download(input_html=raw_html)
+    article.parse()
+
+    # Parse both the full page and newspaper's extract once, for the quality heuristics and markdown conversion
+    article_document, full_document = HtmlDocument(article.article_html), HtmlDocument(article.html)
+    # Before anything is removed from the page, as the structured data may be anywhere in it
+    structured_events = extract_structured_events(full_document.soup)
+    blocks = find_blocks(full_document.soup)
+    removed = remove_boilerplate(blocks, boilerplate)
+
+    input = choose_input_for_markdownify(article_document, full_document, logger, content_path)
+    if input is not None and input is article_document.soup and boilerplate:
+        removed += remove_boilerplate(find_blocks(input), boilerplate)
+    if removed:
+        logger.info("Removed {removed} boilerplate blocks known from other pages of the domain", removed=removed)
+    # The container's path is only worth remembering if it was found in the full page
+    found_path = element_path(input) if input is not None and input is not article_document.soup else None
+
+    return ParsedArticle(
+        url=article.url,
+        title=article.title,
+        publish_date=article.publish_date,
+        markdown=html_to_markdown(input) if input is not None else None,
+        block_fingerprints=sorted({fingerprint for fingerprint, _ in blocks}),
+        content_path=found_path or None,
+        structured_events=structured_events,
+        log_messages=logger.messages,
+    )
+
+
+def block_fingerprint(text: str) -> str:
+    """Hash of an element's normalised text, which stays the same for a header or footer across pages."""
+    return hashlib.blake2b(" ".join(text.lower().split()).encode(), digest_size=8).hexdigest()
+
+
+def find_blocks(root: Tag) -> list[tuple[str, Tag]]:
+    """Fingerprints of all block-level elements that hold a moderate amount of text, in document order.
+
+    Blocks that name a day are left out, so that teasers of upcoming events are never taken for boilerplate, however
+    many pages of the domain show them.
+    """
+    metrics = compute_subtree_metrics(root)
+    matcher = date_matcher(None)
+    blocks = []
+    for element in root.find_all(BOILERPLATE_BLOCK_TAGS):
+        if not MIN_BLOCK_TEXT_LENGTH <= metrics[id(element)].text_length <= MAX_BLOCK_TEXT_LENGTH:
+            continue
+        text = element.get_text(" ", strip=True)
+        if not matcher.mentions_day(text):
+            blocks.append((block_fingerprint(text), element))
+    return blocks
+
+
+def remove_boilerplate(blocks: list[tuple[str, Tag]], boilerplate: frozenset[str]) -> int:
+    """Remove the blocks that are known boilerplate, returning how many were removed."""
+    removed = 0
+    for fingerprint, element in blocks:
+        # Blocks nested in an already removed one are gone as well
+        if fingerprint in boilerplate and not element.decomposed:
+            element.decompose()
+            removed += 1
+    return removed
+
+
+def parse_listing_html(base_url: str, raw_html: str) -> ParsedListing:
+    """Parse a listing page as an article and extract its article links and markdown. Runs in the process pool."""
+    logger = CollectingLogger()
+    website = Article(base_url, memoize_articles=False, disable_category_cache=True)
+    website.download(input_html=raw_html)
+    website.parse()
+
+    # Choose Website as parsed by newspaper or raw html for source extraction. Only the chosen one is fully parsed
+    choice = choose_input_for_listing_page(
+        HtmlDocument(website.article_html), HtmlDocument(website.html), base_url, logger
+    )
+    if choice is None:
+        return ParsedListing(log_messages=logger.messages)
+    input, hrefs = choice
+    return ParsedListing(
+        links=listing_page_links(hrefs, base_url),
+        markdown=html_to_markdown(clean_text(input.soup)),
+        log_messages=logger.messages,
+    )
+
+
+def parse_feed(body: bytes, response_headers: dict[str, str]) -> feedparser.FeedParserDict:
+    """Parse an RSS or Atom feed. Runs in the process pool."""
+    return feedparser.parse(body, response_headers=response_headers)
+
+
+def html_fragments_to_markdown(fragments: list[str]) -> list[str]:
+    """Convert HTML fragments that are already just the content, e.g. from an API or feed, to markdown. Runs in the
+    process pool, so a whole batch is converted per task."""
+    return [html_to_markdown(clean_text(prefilter_html(HtmlDocument(fragment).soup))).strip() for fragment in fragments]
+
+
+def listing_page_links(hrefs: list[str], base_url: str) -> list[str]:
+    """Absolute URLs of the article links found on a listing page, without duplicates."""
+    return list(dict.fromkeys(urljoin(base_url, href) for href in hrefs))
+
+
+def choose_input_for_listing_page(
+    article_document: HtmlDocument, full_document: HtmlDocument, base_url: str, logger: "Logger"
+) -> tuple[HtmlDocument, list[str]] | None:
+    """Choose the best HTML input for a listing page that should contain article links.
+
+    Returns the chosen document together with the hrefs of its links that look like article links.
+    """
+
+    domain = urlparse(base_url).netloc
+
+    # Check if article_html contains meaningful article links
+    article_links = ArticleLinkScanner(article_document, domain)
+    if article_links.has_at_least(MIN_LISTING_ARTICLE_LINKS):
+        logger.info("✅ Article HTML contains sufficient article links, using it")
+        return article_document, article_links.all()
+
+    full_links = ArticleLinkScanner(full_document, domain)
+    if full_links.has_at_least(MIN_LISTING_ARTICLE_LINKS):
+        logger.info("❌ Article HTML does not contain sufficient article links, but full HTML does, using it")
+        # no return sanitize(full_html) here, as it is only suited for articles, not listing pages
+        return full_document, full_links.all()
+    else:
+        logger.info("❌ Neither HTML version contains sufficient article links")
+        return None
+
+
+class ArticleLinkScanner:
+    """Finds the links of a document that look like article links, streaming through its HTML only as far as needed.
+
+    Checking whether a page has enough article links usually stops after its first few links, without building a
+    tree. If the page is then used, the scan resumes where it stopped to collect the rest.
+    """
+
+    def __init__(self, document: HtmlDocument, domain: str):
+        self.domain = domain
+        self.links: dict[str, None] = {}  # Distinct hrefs, in document order
+        self._hrefs = iter(()) if document.is_empty else self._iter_hrefs(document.html)
+
+    @staticmethod
+    def _iter_hrefs(html: str):
+        try:
+            for _, link in etree.iterparse(
+                io.BytesIO(html.encode()), events=("start",), tag="a", html=True, recover=True, encoding="utf-8"
+            ):
+                href = (link.get("href") or "").strip()
+                if href:
+                    yield href
+        except etree.LxmlError:
+            return
+
+    def _scan(self, until: int | None = None):
+        for href in self._hrefs:
+            if href not in self.links and _is_likely_article_link(href, self.domain):
+                self.links[href] = None
+                if until is not None and len(self.links) >= until:
+                    return
+
+    def has_at_least(self, count: int) -> bool:
+        if len(self.links) < count:
+            self._scan(until=count)
+        return len(self.links) >= count
+
+    def all(self) -> list[str]:
+        self._scan()
+        return list(self.links)
+
+
+def _is_likely_article_link(href: str, domain: str) -> bool:
+    """Determine if a link is likely to be an article link."""
+    # TODO: This function is not very useful right now, as too many non-article-links will make it through
+
+    href_lower = href.lower()
+
+    skip_patterns = ["#", "mailto:", "tel:", "javascript:"]
+
+    for pattern in skip_patterns:
+        if href_lower.startswith(pattern):
+            return False
+
+    parsed_href = urlparse(href)
+
+    # Must be internal link (no netloc) or full URL to same domain
+    if not parsed_href.netloc:
+        return True
+    elif parsed_href.netloc == domain:
+        return True
+
+    return False
+
+
+def choose_input_for_markdownify(
+    article_document: HtmlDocument,
+    full_document: HtmlDocument,
+    logger: "Logger",
+    content_path: ContentPath | None = None,
+) -> Tag | None:
+    """Choose the input for markdownify based on the quality of the article HTML.
+
+    If the article HTML isn't good enough, the main content container is looked up at `content_path` first, and only
+    searched for in the whole page if it isn't found there.
+    """
+    if _is_article_html_good_quality(article_document):
+        logger.info("✅ Article HTML as parsed by newspaper is good quality, using it")
+        return article_document.soup
+    else:
+        if content_path:
+            main_content = extract_main_content_by_path(full_document, content_path)
+            if main_content is not None:
+                logger.info("✅ Found main content in the container known from other pages of the domain")
+                return clean_text(main_content)
+            logger.info("Container known from other pages of the domain not found or too small, searching whole page")
+
+        sanitized_html = sanitize_html(full_document)
+        if sanitized_html is None:
+            logger.info(
+                "❌ Could not sanitize HTML manually. Notice that this might be due to the article being behind a paywall, so MIN_ARTICLE_LENGTH might never be reached."
+            )
+            return None
+        else:
+            logger.info("✅ Successfully sanitized HTML manually")
+            return sanitized_html
+
+
+def extract_main_content_by_ratio(document: HtmlDocument) -> Tag | None:
+    """Extract main article content using recursive text-to-HTML ratio analysis. Modifies the document in place."""
+
+    try:
+        # Pre-filter HTML to remove guaranteed non-content elements
+        filtered_soup = prefilter_html(document.soup)
+
+        # Text and markup length of every element, computed once so that scoring containers is a lookup
+        metrics = compute_subtree_metrics(filtered_soup)
+
+        # Find leaf text elements (elements with text but no text-containing children)
+        leaf_text_elements = find_leaf_text_elements(filtered_soup, metrics)
+
+        if not leaf_text_elements:
+            return filtered_soup
+
+        # Find optimal container using bottom-up recursive analysis
+        memo = {}
+        best_element = None
+        best_score = 0
+
+        for leaf_element in leaf_text_elements:
+            optimal_element, score = find_optimal_higher_node(leaf_element, memo, metrics)
+            text_length = metrics[id(optimal_element)].text_length
+
+            if text_length >= MIN_ARTICLE_LENGTH and score > best_score:
+                best_score = score
+                best_element = optimal_element
+
+        if best_element is not None:
+            # Clean empty elements from the result before returning
+            return remove_empty_elements(best_element, metrics)
+        else:
+            return None
+
+    except Exception:
+        return None
+
+
+def extract_main_content_by_path(document: HtmlDocument, content_path: ContentPath) -> Tag | None:
+    """Extract main article content from the element at a known path, if it has a plausible amount of text.
+
+    Only the element's subtree is filtered, and only its text is measured, instead of scoring every container.
+    """
+    element = find_element_by_path(document.soup, content_path)
+    if element is None:
+        return None
+
+    prefilter_html(element)
+    metrics = compute_subtree_metrics(element, measure_markup=False)
+    if metrics[id(element)].text_length < MIN_ARTICLE_LENGTH:
+        return None
+    return remove_empty_elements(element, metrics)
+
+
+def element_path(element: Tag) -> ContentPath:
+    """Structural path of an element, from the document root down. Empty for the document itself."""
+    path = []
+    while element.parent is not None:
+        classes = element.get("class") or []
+        siblings = [
+            sibling
+            for sibling in element.parent.find_all(element.name, recursive=False)
+            if (sibling.get("class") or []) == classes
+        ]
+        index = next(i for i, sibling in enumerate(siblings) if sibling is element)
+        path.append((element.name, list(classes), index))
+        element = element.parent
+    return path[::-1]
+
+
+def find_element_by_path(soup: BeautifulSoup, path: ContentPath) -> Tag | None:
+    """Follow a path created by `element_path`, returning None if the page's structure doesn't have it."""
+    element = soup
+    for name, classes, index in path:
+        matches = [
+            child for child in element.find_all(name, recursive=False) if (child.get("class") or []) == list(classes)
+        ]
+        if index >= len(matches):
+            return None
+        element = matches[index]
+    return element
+
+
+def remove_empty_elements(element, metrics: dict[int, "SubtreeMetrics"]):
+    """Remove empty child elements from the given element."""
+    # Find all descendants that have no text content
+    empty_elements = []
+    for child in element.find_all():
+        # Skip if this element has text content
+        if metrics[id(child)].text_length:
+            continue
+
+        # Skip important structural elements even if empty
+        if child.name in ["br", "hr", "wbr"]:
+            continue
+
+        empty_elements.append(child)
+
+    # Remove empty elements
+    for empty_elem in empty_elements:
+        empty_elem.decompose()
+
+    return element
+
+
+class SubtreeMetrics(NamedTuple):
+    """Sizes of an element including all of its descendants."""
+
+    text_length: int  # len(element.get_text(strip=True))
+    html_length: int  # len(str(element))
+    text_in_descendants: bool  # Whether any descendant element has text of its own
+
+
+def compute_subtree_metrics(soup: BeautifulSoup, measure_markup: bool = True) -> dict[int, SubtreeMetrics]:
+    """Compute the SubtreeMetrics of the document and every element in it, keyed by id(), in a single bottom-up pass.
+
+    Keyed by id() rather than by the elements themselves, because hashing a bs4 Tag serializes its whole subtree.
+    Without `measure_markup`, html_length is left at 0, which skips serializing every node.
+    """
+    text_lengths = {}  # id(element) -> stripped text length, counting only NavigableString / CData
+    html_lengths = {}  # id(element) -> serialized length of its children
+    text_in_descendants = {}
+    metrics = {}
+
+    # Post-order: in reversed document order, every node comes after all of its descendants
+    for node in reversed(list(soup.descendants)):
+        parent_id = id(node.parent)
+        if isinstance(node, Tag):
+            node_id = id(node)
+            text_length = text_lengths.get(node_id, 0)
+            if node.interesting_string_types in (None, Tag.MAIN_CONTENT_STRING_TYPES):
+                own_text_length = text_length
+            else:
+                # Tags like <rt> only count their own kind of string, which never adds to their ancestors' text
+                own_text_length = len(node.get_text(strip=True))
+            html_length = 0
+            if measure_markup:
+                # The tag's own markup is what it serializes to without children (e.g. <p class="x"></p> or <br/>)
+                own_markup = node.copy_self()
+                if node.contents:
+                    own_markup.append("")  # Void elements that (invalidly) have children don't serialize as <input/>
+                html_length = len(str(own_markup)) + html_lengths.get(node_id, 0)
+            metrics[node_id] = SubtreeMetrics(own_text_length, html_length, text_in_descendants.get(node_id, False))
+
+            text_lengths[parent_id] = text_lengths.get(parent_id, 0) + text_length
+            html_lengths[parent_id] = html_lengths.get(parent_id, 0) + html_length
+            if own_text_length or metrics[node_id].text_in_descendants:
+                text_in_descendants[parent_id] = True
+        else:
+            if type(node) in Tag.MAIN_CONTENT_STRING_TYPES:
+                text_lengths[parent_id] = text_lengths.get(parent_id, 0) + len(node.strip())
+            if measure_markup:
+                html_lengths[parent_id] = html_lengths.get(parent_id, 0) + len(node.output_ready())
+
+    soup_id = id(soup)
+    metrics[soup_id] = SubtreeMetrics(
+        text_lengths.get(soup_id, 0), html_lengths.get(soup_id, 0), text_in_descendants.get(soup_id, False)
+    )
+    return metrics
+
+
+def find_leaf_text_elements(soup: BeautifulSoup, metrics: dict[int, SubtreeMetrics]) -> list:
+    """Find leaf text elements - elements that contain text but have no text-containing children."""
+    return [
+        element
+        for element in soup.find_all()
+        if metrics[id(element)].text_length and not metrics[id(element)].text_in_descendants
+    ]
+
+
+def prefilter_html(soup: BeautifulSoup) -> BeautifulSoup:
+    """Remove elements guaranteed not to contain article content."""
+    # Elements to remove completely
+    unwanted_tags = [
+        "script",
+        "style",
+        "noscript",
+        "img",
+        "svg",
+        "video",
+        "nav",
+        "footer",
+        "header",
+        "aside",
+        "iframe",
+        "canvas",
+        "audio",
+        "track",
+        "source",
+        "object",
+        "embed",
+        "map",
+        "area",
+        "form",
+        "button",
+        "input",
+        "select",
+        "textarea",
+        "progress",
+        "meter",
+        "menu",
+        "menuitem",
+        "dialog",
+        "template",
+    ]
+
+    # In a single pass over the tree. Elements nested in one that was already removed are gone as well
+    for element in soup.find_all(unwanted_tags):
+        if not element.decomposed:
+            element.decompose()
+
+    # Remove HTML comments
+    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+
+    return soup
+
+
+def calculate_container_score(element, metrics: dict[int, SubtreeMetrics]) -> float:
+    """Calculate score as text_length * text_to_html_ratio."""
+    if not element:
+        return 0.0
+
+    # Text and HTML markup length of current, including all children
+    text_length, html_length, _ = metrics[id(element)]
+
+    if text_length == 0:
+        return 0.0
+
+    markup_length = html_length - text_length
+
+    if markup_length < 0:
+        markup_length = 0
+
+    # Calculate text-to-HTML ratio
+    total_length = text_length + markup_length
+    if total_length == 0:
+        return 0.0
+
+    text_to_html_ratio = text_length / total_length
+
+    # Final score: text_length * ratio
+    return text_length * text_to_html_ratio
+
+
+def find_optimal_higher_node(element, memo: dict, metrics: dict[int, SubtreeMetrics]) -> tuple:
+    """Find the optimal higher node by evaluating all higher nodes up the tree."""
+    # Check memo to avoid recalculation
+    if id(element) in memo:
+        return memo[id(element)]
+
+    best_element = element
+    best_score = calculate_container_score(element, metrics)
+    traversed_elements = [element]  # Track all elements we evaluate
+
+    # Traverse all ancestors and find the one with the highest score
+    current = element
+    while current.parent and current.parent.name:  # Skip NavigableString parents
+        current = current.parent
+
+        # Check if parent is already memoized
+        if id(current) in memo:
+            parent_best_element, parent_best_score = memo[id(current)]
+            if parent_best_score > best_score:
+                best_element = parent_best_element
+                best_score = parent_best_score
+            break
+
+        # Track this element for memoization
+        traversed_elements.append(current)
+
+        # Calculate score for this ancestor
+        current_score = calculate_container_score(current, metrics)
+        if current_score > best_score:
+            best_element = current
+            best_score = current_score
+
+    # Memoize ALL elements in the traversal path with the optimal result
+    result = (best_element, best_score)
+    for traversed_element in traversed_elements:
+        memo[id(traversed_element)] = result
+
+    return result
+
+
+def sanitize_html(document: HtmlDocument) -> Tag | None:
+    """Sanitize raw HTML by extracting main content and fixing entities."""
+    if document.is_empty:
+        return document.soup
+
+    # Try to extract main content using ratio analysis
+    main_content = extract_main_content_by_ratio(document)
+
+    if main_content is None:
+        return None
+
+    # Unescape leftover HTML entities like &shy; and remove soft hyphens (\xad)
+    return clean_text(main_content)
+
+
+def _is_article_html_good_quality(article_document: HtmlDocument) -> bool:
+    """Detect if newspaper's article_html properly extracted main content."""
+    if article_document.is_empty:
+        return False
+
+    article_html = article_document.html
+    try:
+        text_content = article_document.soup.get_text(strip=True)
+
+        # Basic length checks
+        if len(text_content) < MIN_ARTICLE_LENGTH or len(text_content) > MAX_ARTICLE_LENGTH:
+            return False
+
+        # Check text-to-markup ratio
+        markup_length = len(article_html) - len(text_content)
+        if markup_length > 0:
+            text_ratio = len(text_content) / (len(text_content) + markup_length)
+            if text_ratio < 0.4:  # At least 40% actual text
+                return False
+
+        return True
+
+    except Exception:
+        # If BeautifulSoup parsing fails, fall back to basic checks
+        article_len = len(article_html.strip())
+        return MIN_ARTICLE_LENGTH <= article_len <= MAX_ARTICLE_LENGTH
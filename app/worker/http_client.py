@@ -0,0 +1,309 @@
+import asyncio
+import codecs
+import re
+from typing import AsyncIterator
+
+import aiohttp
+from aiohttp.compression_utils import HAS_BROTLI
+from newspaper import Config
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+from .html_cache import CacheEntry, canonical_url, html_cache
+from .politeness import BACKOFF_STATUSES, domain_health, domain_rate_limiter
+from .single_flight import SingleFlight
+
+# Only advertise brotli if aiohttp is able to decode it
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+DEFAULT_HEADERS = {
+    "User-Agent": Config().browser_user_agent,  # Same user agent newspaper used when downloading on its own
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+
+META_CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset=["']?([a-zA-Z0-9_-]+)""", re.IGNORECASE)
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+BINARY_SIGNATURES = (b"%PDF", b"PK\x03\x04", b"\x89PNG", b"\xff\xd8\xff", b"GIF8", b"\x1f\x8b")
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_session: aiohttp.ClientSession | None = None
+
+
+class FetchError(Exception):
+    """A URL was deliberately not downloaded, or not downloaded in full."""
+
+
+class ResponseTooLargeError(FetchError):
+    pass
+
+
+class UnsupportedContentTypeError(FetchError):
+    pass
+
+
+class DomainUnavailableError(FetchError):
+    """The URL's domain is backed off or its circuit breaker is open."""
+
+
+class FetchResult(BaseModel):
+    """The outcome of a single HTTP fetch."""
+
+    url: str  # Final URL, after redirects
+    status: int
+    headers: dict[str, str]  # Lower-cased header names
+    body: bytes
+    encoding: str = "utf-8"
+    from_cache: bool = False
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding, errors="replace")
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+fetch_flight: SingleFlight[FetchResult] = SingleFlight()
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the process-wide HTTP session, creating it on first use.
+
+    The session keeps a pooled connector, so connections (and TLS sessions) to the same host are reused across
+    articles and across scraping jobs.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=settings.SCRAPING_HTTP_MAX_CONNECTIONS,
+            limit_per_host=settings.SCRAPING_HTTP_MAX_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(
+                total=settings.SCRAPING_HTTP_TIMEOUT_SECONDS,
+                sock_connect=settings.SCRAPING_HTTP_CONNECT_TIMEOUT_SECONDS,
+            ),
+            auto_decompress=True,
+        )
+    return _session
+
+
+async def close_http_session():
+    """Close the process-wide HTTP session, e.g. on application shutdown."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def fetch(
+    url: str,
+    headers: dict[str, str] | None = None,
+    max_bytes: int | None = None,
+    content_types: tuple[str, ...] | None = None,
+    revalidate: bool = False,
+    cache: bool = True,
+) -> FetchResult:
+    """Fetch a URL through the shared session, respecting the per-domain rate limit.
+
+    Responses are served from the on-disk cache while fresh, and revalidated with their stored validators once stale.
+    With `revalidate`, e.g. for feeds and listing pages whose changes a scraping run must not miss, the origin is asked
+    even while the cache entry is fresh. Conditional requests carrying the caller's own validators always reach the
+    origin, so a 304 means the server itself confirmed the document unchanged. Without `cache`, e.g. for responses
+    that depend on request headers like an API's authorization, the cache is neither read nor written.
+
+    Concurrent fetches of the same URL with the same headers, e.g. from scraping jobs of different topics tracking the
+    same outlet, share a single request. Raises for HTTP error statuses. A 304 response to a conditional request is
+    returned with an empty body.
+
+    The body is streamed and the download aborted with ResponseTooLargeError once it exceeds `max_bytes` (by default
+    SCRAPING_MAX_DOWNLOAD_BYTES). If `content_types` is given, responses of other types, or whose first chunk looks
+    binary, are aborted with UnsupportedContentTypeError. Requests to domains that are backed off for longer than
+    SCRAPING_DOMAIN_BACKOFF_MAX_WAIT_SECONDS, or whose circuit breaker is open, fail with DomainUnavailableError.
+    """
+    max_bytes = max_bytes or settings.SCRAPING_MAX_DOWNLOAD_BYTES
+    key = (canonical_url(url), tuple(sorted((headers or {}).items())), max_bytes, content_types, revalidate, cache)
+    return await fetch_flight.do(key, lambda: _fetch(url, headers, max_bytes, content_types, revalidate, cache))
+
+
+async def _fetch(
+    url: str,
+    headers: dict[str, str] | None,
+    max_bytes: int,
+    content_types: tuple[str, ...] | None,
+    revalidate: bool,
+    cache: bool,
+) -> FetchResult:
+    headers = dict(headers or {})
+    caller_etag, caller_last_modified = headers.get("If-None-Match"), headers.get("If-Modified-Since")
+    is_conditional = bool(caller_etag or caller_last_modified)
+
+    entry = await html_cache.get(url) if cache else None
+    cache_matches_caller = entry is not None and (
+        (caller_etag and caller_etag == entry.etag)
+        or (caller_last_modified and caller_last_modified == entry.last_modified)
+    )
+    serve_fresh = not (revalidate or is_conditional) and entry is not None and entry.is_fresh(html_cache.ttl_seconds)
+    if entry is not None and (settings.SCRAPING_HTML_CACHE_OFFLINE or serve_fresh):
+        if cache_matches_caller:
+            return FetchResult(url=entry.url, status=304, headers=entry.headers, body=b"", from_cache=True)
+        if (cached := await _result_from_cache(entry)) is not None:
+            check_content_type(cached.headers.get("content-type"), cached.body, content_types)
+            if len(cached.body) > max_bytes:
+                raise ResponseTooLargeError(f"Response from {url} exceeds {max_bytes} bytes")
+            return cached
+
+    # Revalidate the cache entry, unless the caller wants to know whether the page changed since its own validators
+    if entry is not None and not is_conditional:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+    await wait_for_domain(url)
+    await domain_rate_limiter.acquire(url)
+    session = get_http_session()
+    try:
+        async with session.get(url, headers=headers, allow_redirects=True) as response:
+            # Any answer other than a throttling or overload status means the domain is healthy, even if it's an error
+            if response.status in BACKOFF_STATUSES:
+                domain_health.record_failure(url, response.status, response.headers.get("Retry-After"))
+            else:
+                domain_health.record_success(url)
+            response.raise_for_status()
+            body = await read_limited(response, max_bytes, content_types)
+            result = FetchResult(
+                url=str(response.url),
+                status=response.status,
+                headers={key.lower(): value for key, value in response.headers.items()},
+                body=body,
+                encoding=detect_encoding(response.charset, body),
+            )
+    except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+        domain_health.record_failure(url)
+        raise
+
+    if result.not_modified:
+        if entry is not None and (cache_matches_caller or not is_conditional):
+            await html_cache.touch(url)
+        if entry is not None and not is_conditional and (cached := await _result_from_cache(entry)) is not None:
+            return cached
+        return result
+
+    if result.status == 200 and cache:
+        await html_cache.put(url, result.url, result.headers, result.encoding, result.body)
+    return result
+
+
+async def stream(url: str, headers: dict[str, str] | None = None, max_bytes: int | None = None) -> AsyncIterator[bytes]:
+    """Yield a URL's body chunk by chunk as it downloads, for documents too large to hold in memory as a whole.
+
+    Respects the per-domain rate limit and backoff like `fetch`, but bypasses the cache, as that stores whole bodies.
+    Raises for HTTP error statuses, and with ResponseTooLargeError once the body exceeds `max_bytes` (by default
+    SCRAPING_MAX_DOWNLOAD_BYTES).
+    """
+    max_bytes = max_bytes or settings.SCRAPING_MAX_DOWNLOAD_BYTES
+    await wait_for_domain(url)
+    await domain_rate_limiter.acquire(url)
+    session = get_http_session()
+    try:
+        async with session.get(url, headers=headers, allow_redirects=True) as response:
+            if response.status in BACKOFF_STATUSES:
+                domain_health.record_failure(url, response.status, response.headers.get("Retry-After"))
+            else:
+                domain_health.record_success(url)
+            response.raise_for_status()
+            if response.content_length is not None and response.content_length > max_bytes:
+                raise ResponseTooLargeError(f"Response from {response.url} announces {response.content_length} bytes")
+
+            size = 0
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ResponseTooLargeError(f"Response from {response.url} exceeds {max_bytes} bytes")
+                yield chunk
+    except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+        domain_health.record_failure(url)
+        raise
+
+
+async def wait_for_domain(url: str):
+    """Wait out a short backoff of the URL's domain, or raise DomainUnavailableError if it is long or the circuit open."""
+    wait_seconds, circuit_open = domain_health.unavailable_for(url)
+    if circuit_open:
+        raise DomainUnavailableError(f"Circuit breaker for {url} is open for another {wait_seconds:.0f} seconds")
+    if wait_seconds > settings.SCRAPING_DOMAIN_BACKOFF_MAX_WAIT_SECONDS:
+        raise DomainUnavailableError(f"Domain of {url} is backed off for another {wait_seconds:.0f} seconds")
+    if wait_seconds > 0:
+        await asyncio.sleep(wait_seconds)
+
+
+async def read_limited(
+    response: aiohttp.ClientResponse, max_bytes: int, content_types: tuple[str, ...] | None
+) -> bytes:
+    """Stream a response body, aborting as soon as it turns out to be too large or of an unwanted type."""
+    if response.status == 304:
+        return b""
+    if response.content_length is not None and response.content_length > max_bytes:
+        raise ResponseTooLargeError(f"Response from {response.url} announces {response.content_length} bytes")
+
+    chunks, size = [], 0
+    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+        if not chunks:
+            check_content_type(response.headers.get("Content-Type"), chunk, content_types)
+        size += len(chunk)
+        if size > max_bytes:
+            raise ResponseTooLargeError(f"Response from {response.url} exceeds {max_bytes} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def check_content_type(content_type: str | None, first_chunk: bytes, content_types: tuple[str, ...] | None):
+    """Raise UnsupportedContentTypeError if a response is not of one of the wanted content types."""
+    if content_types is None:
+        return
+    mime_type = (content_type or "").split(";")[0].strip().lower()
+    if mime_type and mime_type not in content_types:
+        raise UnsupportedContentTypeError(f"Unsupported content type {mime_type}")
+    # Servers often label PDFs and other downloads wrongly (or not at all), so also look at the bytes themselves
+    if first_chunk.startswith(BINARY_SIGNATURES) or b"\x00" in first_chunk[:1024]:
+        raise UnsupportedContentTypeError("Response body is binary")
+
+
+async def _result_from_cache(entry: CacheEntry) -> FetchResult | None:
+    body = await html_cache.read_body(entry)
+    if body is None:
+        return None
+    return FetchResult(
+        url=entry.url, status=200, headers=entry.headers, body=body, encoding=entry.encoding, from_cache=True
+    )
+
+
+def detect_encoding(header_charset: str | None, body: bytes) -> str:
+    """Determine the encoding of a response body from its Content-Type header, falling back to a <meta> tag."""
+    candidates = [header_charset]
+    if match := META_CHARSET_PATTERN.search(body[:4096]):
+        candidates.append(match.group(1).decode("ascii"))
+
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+async def fetch_html(url: str, revalidate: bool = False) -> tuple[str, str]:
+    """Fetch a URL and return its final URL and decoded body."""
+    result = await fetch(url, revalidate=revalidate)
+    return result.url, result.text
@@ -0,0 +1,130 @@
+import re
+from functools import lru_cache
+
+import tiktoken
+from loguru import logger
+
+from .date_mentions import MONTHS, WEEKDAYS
+
+TOKEN_ENCODING = "o200k_base"  # Encoding of the gpt-4o / gpt-4.1 family of models
+CHARS_PER_TOKEN_ESTIMATE = 4  # Used if the encoding can't be loaded, e.g. without network access on first use
+
+IMAGE_PATTERN = re.compile(r"!\[([^\]]*)\]\((?:[^()\s]|\([^()\s]*\))*(?:\s+\"[^\"]*\")?\)")
+LINK_PATTERN = re.compile(r"\[([^\]]*)\]\((?:[^()\s]|\([^()\s]*\))*(?:\s+\"[^\"]*\")?\)")
+AUTOLINK_PATTERN = re.compile(r"<https?://[^>\s]+>")
+REFERENCE_DEFINITION_PATTERN = re.compile(r"^\s*\[[^\]]+\]:\s+\S+.*$", re.MULTILINE)
+LINK_ONLY_LINE_PATTERN = re.compile(r"^\s*(?:[*+-]|\d+\.)?\s*\[([^\]]*)\]\([^)]*\)\s*$")
+# Full month names and weekdays of all languages dates are looked for in
+DATE_WORD_PATTERN = re.compile(
+    r"\b(?:{})\b".format(
+        "|".join([month.split("|")[0] for months in MONTHS.values() for month in months] + list(WEEKDAYS.values()))
+    ),
+    re.IGNORECASE,
+)
+INLINE_WHITESPACE_PATTERN = re.compile(r"(?<=\S)[ \t\xa0]{2,}")
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+
+MIN_LINK_RUN_TO_DROP = 3  # Runs of this many lines consisting only of a link are navigation or teaser lists
+MAX_NAVIGATION_LINK_LENGTH = 40  # Longer link texts are headlines or list entries rather than menu items
+MAX_REPEATED_LINE_LENGTH = 40  # Short lines repeated this many times are boilerplate like "Share" or "Advertisement"
+MIN_REPEATS_TO_DROP = 3
+
+
+@lru_cache(maxsize=1)
+def _get_encoding() -> tiktoken.Encoding | None:
+    try:
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception as e:
+        logger.warning("Could not load tiktoken encoding, estimating token counts instead: <red>{e}</red>", e=e)
+        return None
+
+
+def count_tokens(text: str | None) -> int:
+    """Number of tokens the text takes up in a prompt."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN_ESTIMATE
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _is_navigation_link(text: str) -> bool:
+    """Whether a link text looks like a menu item rather than content, such as an entry of a list of hearings."""
+    text = text.strip()
+    return (
+        len(text) <= MAX_NAVIGATION_LINK_LENGTH
+        and not any(char.isdigit() for char in text)
+        and not DATE_WORD_PATTERN.search(text)
+    )
+
+
+def _drop_link_runs(lines: list[str]) -> list[str]:
+    """Drop the menu items from runs of consecutive lines that consist of nothing but a link, ignoring blank lines in
+    between. Links with long texts, digits or dates are kept, as on pages whose content is a list of links."""
+    kept, run, links_in_run = [], [], 0
+
+    def end_run():
+        if links_in_run < MIN_LINK_RUN_TO_DROP:
+            kept.extend(run)
+            return
+        for line in run:
+            match = LINK_ONLY_LINE_PATTERN.match(line)
+            if match is None or not _is_navigation_link(match.group(1)):
+                kept.append(line)
+
+    for line in lines:
+        if LINK_ONLY_LINE_PATTERN.match(line):
+            run.append(line)
+            links_in_run += 1
+        elif not line.strip() and run:
+            run.append(line)
+        else:
+            end_run()
+            run, links_in_run = [], 0
+            kept.append(line)
+    end_run()
+    return kept
+
+
+def _drop_repeated_lines(lines: list[str]) -> list[str]:
+    """Keep only the first occurrence of short lines that are repeated throughout the page."""
+    counts = {}
+    for line in lines:
+        stripped = line.strip()
+        # Lines without any letters or digits are markup, like the underlines of headings
+        if len(stripped) <= MAX_REPEATED_LINE_LENGTH and any(char.isalnum() for char in stripped):
+            counts[stripped] = counts.get(stripped, 0) + 1
+
+    kept, seen = [], set()
+    for line in lines:
+        stripped = line.strip()
+        if counts.get(stripped, 0) >= MIN_REPEATS_TO_DROP:
+            if stripped in seen:
+                continue
+            seen.add(stripped)
+        kept.append(line)
+    return kept
+
+
+def compact_markdown(markdown: str, keep_links: bool) -> str:
+    """Remove content from converted markdown that only costs tokens.
+
+    Images, reference definitions and redundant whitespace are always removed. Unless `keep_links` is set, which
+    source extraction needs to follow links, link targets are dropped (keeping the link text), as are the menu items of
+    lists made up only of links, and short lines repeated across the page.
+    """
+    if not markdown:
+        return markdown
+
+    markdown = IMAGE_PATTERN.sub("", markdown)
+    markdown = REFERENCE_DEFINITION_PATTERN.sub("", markdown)
+    lines = markdown.splitlines()
+
+    if not keep_links:
+        lines = _drop_link_runs(lines)
+        lines = _drop_repeated_lines(lines)
+        lines = [AUTOLINK_PATTERN.sub("", LINK_PATTERN.sub(r"\1", line)) for line in lines]
+
+    lines = [INLINE_WHITESPACE_PATTERN.sub(" ", line).rstrip() for line in lines]
+    return BLANK_LINES_PATTERN.sub("\n\n", "\n".join(lines)).strip()
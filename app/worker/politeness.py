@@ -0,0 +1,234 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urlparse
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+BACKOFF_STATUSES = (429, 502, 503, 504)
+MAX_RETRY_AFTER_SECONDS = 24 * 60 * 60  # Don't let a misconfigured server lock us out for longer than this
+
+
+def domain_of(url: str) -> str:
+    """Return the lower-cased host of a URL, which is what rate limits are keyed on."""
+    return urlparse(url).netloc.lower()
+
+
+class TokenBucket:
+    """Token bucket allowing `burst` immediate requests, refilled at `rate` requests per second."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()  # Makes waiters queue up in order
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(float(self.burst), self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class DomainRateLimiter:
+    """Process-wide politeness scheduler: one token bucket per domain.
+
+    Requests to the same domain are spaced out according to that domain's rate and burst size, while requests to
+    different domains never wait on each other.
+    """
+
+    def __init__(self, default_rate: float, default_burst: int):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def configure(self, domain: str, rate: float | None = None, burst: int | None = None):
+        """Override the rate and / or burst size for a domain."""
+        rate = rate or self.default_rate
+        burst = burst or self.default_burst
+        bucket = self.buckets.get(domain)
+        if bucket is None:
+            self.buckets[domain] = TokenBucket(rate, burst)
+        else:
+            bucket.rate = rate
+            bucket.burst = burst
+
+    def configure_from_scraping_config(self, base_url: str, scraping_config: dict[str, Any] | None):
+        """Apply rate limit overrides from a ScrapingSource's scraping_config.
+
+        `requests_per_second` and `burst` apply to the domain of the scraping source itself, `domain_rate_limits` maps
+        other domains to their own `requests_per_second` / `burst` values.
+        """
+        if not scraping_config:
+            return
+
+        if "requests_per_second" in scraping_config or "burst" in scraping_config:
+            self.configure(
+                domain_of(base_url),
+                rate=scraping_config.get("requests_per_second"),
+                burst=scraping_config.get("burst"),
+            )
+
+        for domain, limits in (scraping_config.get("domain_rate_limits") or {}).items():
+            self.configure(domain.lower(), rate=limits.get("requests_per_second"), burst=limits.get("burst"))
+
+    async def acquire(self, url: str):
+        """Wait until a request to the URL's domain is allowed."""
+        domain = domain_of(url)
+        if domain not in self.buckets:
+            self.buckets[domain] = TokenBucket(self.default_rate, self.default_burst)
+        await self.buckets[domain].acquire()
+
+
+domain_rate_limiter = DomainRateLimiter(
+    default_rate=settings.SCRAPING_DOMAIN_REQUESTS_PER_SECOND,
+    default_burst=settings.SCRAPING_DOMAIN_BURST,
+)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header, given either in seconds or as an HTTP date, into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+class DomainHealth(BaseModel):
+    """Backoff and circuit breaker state of a single domain."""
+
+    domain: str
+    consecutive_failures: int = 0
+    last_failure_status: int | None = None  # None for timeouts and connection errors
+    backoff_until: datetime | None = None
+    circuit_open_until: datetime | None = None
+    updated_at: datetime | None = None
+
+    @property
+    def is_healthy(self) -> bool:
+        return self.consecutive_failures == 0
+
+
+class DomainHealthTracker:
+    """Process-wide backoff and circuit breaker per domain.
+
+    Every 429/5xx-overload response or timeout backs the domain off exponentially (or for as long as its
+    Retry-After header asks), and once a domain failed `failure_threshold` times in a row, its circuit opens and
+    requests to it are refused for `cooldown_seconds`. After the cooldown a single probe request is let through,
+    which either closes the circuit or reopens it. States are persisted between runs, so the next scheduled job skips
+    known-bad domains right away.
+    """
+
+    def __init__(
+        self,
+        base_seconds: float,
+        max_seconds: float,
+        failure_threshold: int,
+        cooldown_seconds: float,
+        probe_timeout_seconds: float,
+    ):
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.states: dict[str, DomainHealth] = {}
+        self.dirty: set[str] = set()  # Domains whose state changed since it was last persisted
+        self._probes: dict[str, float] = {}  # Domain -> start of the probe request let through a half-open circuit
+
+    def unavailable_for(self, url: str) -> tuple[float, bool]:
+        """Seconds until a request to the URL's domain is allowed, and whether that is because its circuit is open."""
+        domain = domain_of(url)
+        state = self.states.get(domain)
+        if state is None or state.is_healthy:
+            return 0.0, False
+
+        now = datetime.now(timezone.utc)
+        if state.consecutive_failures >= self.failure_threshold:
+            if state.circuit_open_until is not None and state.circuit_open_until > now:
+                return (state.circuit_open_until - now).total_seconds(), True
+            # Half-open: let a single request through to see whether the domain recovered. If the probe never reports
+            # back, e.g. because it was cancelled, another one is allowed after the probe timeout
+            probe_started_at = self._probes.get(domain)
+            if probe_started_at is not None and time.monotonic() - probe_started_at < self.probe_timeout_seconds:
+                return self.probe_timeout_seconds, True
+            self._probes[domain] = time.monotonic()
+            return 0.0, False
+
+        if state.backoff_until is not None and state.backoff_until > now:
+            return (state.backoff_until - now).total_seconds(), False
+        return 0.0, False
+
+    def record_success(self, url: str):
+        domain = domain_of(url)
+        self._probes.pop(domain, None)
+        state = self.states.get(domain)
+        if state is not None and not state.is_healthy:
+            self.states[domain] = DomainHealth(domain=domain, updated_at=datetime.now(timezone.utc))
+            self.dirty.add(domain)
+
+    def record_failure(self, url: str, status: int | None = None, retry_after: str | None = None):
+        """Back a domain off after a throttling response or a timeout, opening its circuit after repeated failures."""
+        domain = domain_of(url)
+        self._probes.pop(domain, None)
+        now = datetime.now(timezone.utc)
+        state = self.states.get(domain) or DomainHealth(domain=domain)
+        state.consecutive_failures += 1
+        state.last_failure_status = status
+        state.updated_at = now
+
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = min(self.max_seconds, self.base_seconds * 2 ** (state.consecutive_failures - 1))
+        state.backoff_until = now + timedelta(seconds=delay)
+        if state.consecutive_failures >= self.failure_threshold:
+            state.circuit_open_until = now + timedelta(seconds=max(delay, self.cooldown_seconds))
+
+        self.states[domain] = state
+        self.dirty.add(domain)
+
+    def load(self, states: list[DomainHealth]):
+        """Merge persisted states, e.g. written by an earlier run or another worker, keeping whichever is newer."""
+        for state in states:
+            current = self.states.get(state.domain)
+            if current is None or (current.updated_at or datetime.min.replace(tzinfo=timezone.utc)) < (
+                state.updated_at or datetime.min.replace(tzinfo=timezone.utc)
+            ):
+                self.states[state.domain] = state
+
+    def pop_dirty(self) -> list[DomainHealth]:
+        """Return the states that changed since the last call, for persisting them."""
+        states = [self.states[domain] for domain in self.dirty if domain in self.states]
+        self.dirty.clear()
+        return states
+
+
+domain_health = DomainHealthTracker(
+    base_seconds=settings.SCRAPING_DOMAIN_BACKOFF_BASE_SECONDS,
+    max_seconds=settings.SCRAPING_DOMAIN_BACKOFF_MAX_SECONDS,
+    failure_threshold=settings.SCRAPING_DOMAIN_CIRCUIT_FAILURE_THRESHOLD,
+    cooldown_seconds=settings.SCRAPING_DOMAIN_CIRCUIT_COOLDOWN_SECONDS,
+    probe_timeout_seconds=settings.SCRAPING_HTTP_TIMEOUT_SECONDS,
+)
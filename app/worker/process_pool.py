@@ -0,0 +1,74 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, TypeVar
+
+from loguru import logger
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _warm_up_worker():
+    """Import the parsing stack when a worker starts, so its first task doesn't pay for it."""
+    import app.worker.html_parsing  # noqa: F401
+
+
+def _noop():
+    pass
+
+
+def get_process_pool() -> ProcessPoolExecutor | None:
+    """Return the process-wide pool for CPU-heavy parsing, creating it on first use, or None if it is disabled.
+
+    Workers are spawned rather than forked, as forking a process that runs an event loop and threads is unsafe, and
+    are replaced after SCRAPING_PROCESS_POOL_MAX_TASKS_PER_CHILD tasks so leaks in parsing libraries don't accumulate.
+    """
+    global _pool
+    if settings.SCRAPING_PROCESS_POOL_WORKERS <= 0:
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.SCRAPING_PROCESS_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_up_worker,
+            max_tasks_per_child=settings.SCRAPING_PROCESS_POOL_MAX_TASKS_PER_CHILD or None,
+        )
+    return _pool
+
+
+def warm_up_process_pool():
+    """Start all workers right away, e.g. on application startup, instead of on the first parse."""
+    pool = get_process_pool()
+    if pool is not None:
+        for _ in range(settings.SCRAPING_PROCESS_POOL_WORKERS):
+            pool.submit(_noop)
+
+
+def shutdown_process_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+
+
+async def run_in_process(func: Callable[..., T], *args) -> T:
+    """Run a picklable, module-level function in the process pool, or in a thread if the pool is disabled.
+
+    Keeps CPU-heavy parsing from competing for the GIL with the event loop and the API's request handlers.
+    """
+    pool = get_process_pool()
+    if pool is None:
+        return await asyncio.to_thread(func, *args)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for using too much memory). Start a fresh pool for the next task
+        logger.error("❌ Process pool is broken, restarting it")
+        if _pool is pool:
+            shutdown_process_pool()
+        raise
@@ -1,13 +1,16 @@
 import operator
 from datetime import date as dt_date
 from datetime import datetime, timedelta
-from typing import Annotated
+from typing import Annotated, Any
 
 from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
-from app.core.enums import ScrapingSourceEnum
+from app.core.enums import EventProvenanceEnum, ScrapingSourceEnum
 from app.schemas.topic import TopicBase
 
+# Location of an element as (tag name, classes, index among siblings with the same tag and classes) from the root down
+ContentPath = list[tuple[str, list[str], int]]
+
 
 class TopicWorkflow(BaseModel):
     """Topic model for use in workflow state - contains only fields needed for scraping"""
@@ -29,10 +32,12 @@ class ScrapingSourceWorkflow(BaseModel):
     topic_id: int
     base_url: str  # TODO: rename to url
     source_type: ScrapingSourceEnum
-    language: str | None = None
+    language: str | None = None  # Name, e.g. "German"
+    language_code: str | None = None  # ISO 639-1, e.g. "de"
     country_code: str | None = None
     last_scraped_at: datetime | None = None
     degrees_of_separation: int = Field(default=0, ge=0)
+    scraping_config: dict[str, Any] | None = None
     topic: TopicWorkflow
     _visited: bool = PrivateAttr(default=False)  # Whether the source has been visited for source extraction
 
@@ -91,6 +96,9 @@ class WebSourceWithMarkdown(WebSourceWithMetadata):
     """A web source (article, press release, etc.) containing content and metadata."""
 
     markdown: str = Field(description="The full source's content, converted to markdown format for processing")
+    structured_events: list["ExtractedEventBase"] = Field(
+        default_factory=list, description="Events embedded in the source as schema.org structured data"
+    )
 
 
 class ExtractedWebSources(BaseModel):
@@ -99,6 +107,51 @@ class ExtractedWebSources(BaseModel):
     sources: list[WebSourceBase] = Field(description="A list of web sources extracted from the web source")
 
 
+class ListingDiscovery(BaseModel):
+    """State for incremental discovery of articles on a listing page across scraping runs."""
+
+    previous_links_hash: str | None = None  # Hash of the listing's links as of the last completed run
+    links_hash: str | None = None  # Hash of the listing's links found during this run
+    listed_urls: list[str] = Field(default_factory=list)  # All article URLs found on the listing during this run
+    # Article URLs that were not found on the listing in earlier runs, and were processed or rejected during this one
+    new_urls: list[str] = Field(default_factory=list)
+
+    def record_attempts(self, urls: list[str], retry_later: set[str]):
+        """Count the articles as discovered unless they are to be retried. If any are, the listing's links are not
+        remembered either, so the next run doesn't skip the unchanged listing before retrying them."""
+        self.new_urls = [url for url in urls if url not in retry_later]
+        if retry_later:
+            self.links_hash = None
+
+
+class ApiCursor(BaseModel):
+    """State for incremental reading of an API across scraping runs."""
+
+    previous: str | None = None  # Cursor as of the last completed run, the API is asked for records after it
+    latest: str | None = None  # Highest cursor of the records read during this run
+
+
+class ParsedArticle(BaseModel):
+    """An article as parsed from its HTML, independent of which scraping source requested it."""
+
+    url: str
+    title: str | None = None
+    publish_date: datetime | None = None  # As determined by newspaper
+    markdown: str | None = None  # None if no suitable input for markdownify could be determined
+    block_fingerprints: list[str] = []  # Of the page's text blocks, to learn the domain's boilerplate from
+    content_path: ContentPath | None = None  # Of the main content container, if it was searched for in the full page
+    structured_events: list["ExtractedEventBase"] = []  # Embedded in the page as schema.org JSON-LD or microdata
+    log_messages: list[str] = []  # Logged while parsing in a worker process, replayed by the caller
+
+
+class ParsedListing(BaseModel):
+    """A listing page as parsed from its HTML, for LLM-assisted source extraction."""
+
+    links: list[str] = []  # Absolute URLs of links that look like article links
+    markdown: str | None = None  # None if the page has too few article links
+    log_messages: list[str] = []
+
+
 class ExtractedEventBase(BaseModel):
     """An event extracted from a web source that is relevant to a specific topic of interest."""
 
@@ -156,10 +209,22 @@ class ExtractedEventBase(BaseModel):
     )
 
 
+class CalendarEvent(BaseModel):
+    """An upcoming event read from an iCalendar feed."""
+
+    uid: str
+    url: str | None = None  # The event's own page, if the feed links one
+    revision: datetime  # When the event was last changed, or for recurring events, when this occurrence starts
+    event: ExtractedEventBase
+
+
 class ExtractedEvent(ExtractedEventBase):
     """An event extracted from a web source that is relevant to a specific topic of interest, with the source from which it was extracted."""
 
     source: WebSourceWithMetadata = Field(description="The web source from which the event was extracted")
+    provenance: EventProvenanceEnum = Field(
+        default=EventProvenanceEnum.LLM, description="How the event was extracted from the source"
+    )
 
 
 class ExtractedBaseEvents(BaseModel):
@@ -1,29 +1,257 @@
 import asyncio
-import html
-from datetime import datetime, timezone
-from typing import TYPE_CHECKING
-from urllib.parse import urlparse
-
-import feedparser
+import hashlib
+import re
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, TypeVar
+from urllib.parse import urljoin, urlparse
+
+import aiohttp
 import newspaper
-from bs4 import BeautifulSoup, Comment
+from dateutil import parser as date_parser
 from langchain_core.messages import HumanMessage
-from markdownify import markdownify
-from newspaper import Article, Config
+from lxml import etree
+from newspaper import Config
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
 
+from app.core.config import settings
 from app.core.enums import ScrapingSourceEnum
-from app.models.scraping_source import ScrapingSourceDB
-
+from app.database import get_db_session
+from app.models.discovered_url import DiscoveredUrlDB
+from app.models.domain_boilerplate import DomainBoilerplateDB
+from app.models.domain_health import DomainHealthDB
+from app.models.websource import WebSourceDB
+
+from .api_source import ApiSourceConfig, cursor_key, iter_api_pages, map_record
+from .boilerplate import DomainBoilerplate, boilerplate_store
+from .calendar_feed import parse_calendar
+from .deadline import Deadline, DeadlineExceeded
+from .html_cache import canonical_url
+from .html_parsing import (
+    MAX_ARTICLE_LENGTH,
+    MIN_ARTICLE_LENGTH,
+    html_fragments_to_markdown,
+    parse_article_html,
+    parse_feed,
+    parse_listing_html,
+)
+from .http_client import (
+    HTML_CONTENT_TYPES,
+    DomainUnavailableError,
+    FetchError,
+    FetchResult,
+    ResponseTooLargeError,
+    fetch,
+    fetch_html,
+    stream,
+)
 from .llm_service import LlmService
-from .scraping_models import ExtractedWebSources, ScrapingSourceWorkflow, WebSourceBase, WebSourceWithMarkdown
+from .markdown_compaction import compact_markdown, count_tokens
+from .politeness import BACKOFF_STATUSES, DomainHealth, domain_health, domain_of, domain_rate_limiter
+from .process_pool import run_in_process
+from .scraping_models import (
+    ApiCursor,
+    ExtractedWebSources,
+    ListingDiscovery,
+    ParsedArticle,
+    ScrapingSourceWorkflow,
+    WebSourceBase,
+    WebSourceWithMarkdown,
+)
+from .single_flight import SingleFlight
+from .structured_events import json_ld_articles
 
 if TYPE_CHECKING:
     from loguru import Logger
 
 
 MIN_ENTRIES_TO_CONSIDER_VALID_LISTING = 8
-MIN_ARTICLE_LENGTH = 1000
-MAX_ARTICLE_LENGTH = 30000
+MAX_ARTICLE_DOWNLOAD_BYTES = MAX_ARTICLE_LENGTH * settings.SCRAPING_HTML_BYTES_PER_ARTICLE_CHAR
+DISCOVERED_URL_RETENTION_DAYS = 90  # Forget discovered URLs that have not been on the listing page for this long
+
+# Cheap publish date signals, checked before an article is parsed in full
+DATE_TAG_PATTERN = re.compile(r"<(?:meta|time)\b[^>]*>", re.IGNORECASE)
+TAG_ATTRIBUTE_PATTERN = re.compile(r"([\w:.-]+)\s*=\s*[\"']([^\"']*)[\"']")
+PUBLISH_DATE_TAG_NAMES = {
+    "article:published_time",
+    "og:published_time",
+    "datepublished",
+    "pubdate",
+    "publishdate",
+    "publish-date",
+    "dc.date.issued",
+    "sailthru.date",
+    "parsely-pub-date",
+}
+URL_DAY_PATTERN = re.compile(r"/(20\d{2})[/-](0[1-9]|1[0-2])[/-](0[1-9]|[12]\d|3[01])(?=[/._-]|$)")
+URL_MONTH_PATTERN = re.compile(r"/(20\d{2})/(0[1-9]|1[0-2])/")
+
+MAX_CALENDAR_EVENTS = 500  # Per run, soonest first. Overridable via scraping_config["max_calendar_events"]
+MAX_SITEMAP_URLS = 200  # Per run, newest first. Overridable via scraping_config["max_sitemap_urls"]
+MAX_SITEMAPS_PER_RUN = 50
+MAX_NESTED_SITEMAP_DEPTH = 3
+SITEMAP_PARSE_CHUNK_SIZE = 64 * 1024
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Caps the number of articles being downloaded and parsed at the same time across all scraping jobs
+download_slots = asyncio.Semaphore(settings.SCRAPING_MAX_CONCURRENT_DOWNLOADS)
+parse_flight: SingleFlight[ParsedArticle] = SingleFlight()  # Shares parses of the same article between jobs
+
+
+def source_concurrency(scraping_source: ScrapingSourceWorkflow) -> int:
+    """How many articles of a single scraping source may be processed at the same time."""
+    config = scraping_source.scraping_config or {}
+    return max(1, int(config.get("max_concurrency", settings.SCRAPING_SOURCE_CONCURRENCY)))
+
+
+async def map_bounded(func: Callable[[T], Awaitable[R]], items: Iterable[T], limit: int) -> list[R | BaseException]:
+    """Await func for every item with at most `limit` calls in flight, returning results in the order of `items`.
+
+    Exceptions are returned in place of the corresponding result, like asyncio.gather(..., return_exceptions=True).
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+
+def hash_links(urls: Iterable[str]) -> str:
+    """Order-independent hash of a set of links, used to detect unchanged listing pages."""
+    return hashlib.sha256("\n".join(sorted(set(urls))).encode()).hexdigest()
+
+
+async def load_discovered_urls(scraping_source_id: int, urls: list[str]) -> set[str]:
+    """Return those of the given URLs that were already discovered on the scraping source's listing page."""
+    if not urls:
+        return set()
+    async with get_db_session() as db:
+        return set(
+            (
+                await db.execute(
+                    select(DiscoveredUrlDB.url)
+                    .where(DiscoveredUrlDB.scraping_source_id == scraping_source_id)
+                    .where(DiscoveredUrlDB.url.in_(urls))
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+
+async def record_listing_discovery(scraping_source_id: int, discovery: ListingDiscovery):
+    """Persist the URLs discovered during a completed run, and forget URLs that dropped off the listing long ago."""
+    now = datetime.now(timezone.utc)
+    async with get_db_session() as db:
+        if discovery.new_urls:
+            await db.execute(
+                insert(DiscoveredUrlDB)
+                .values([{"scraping_source_id": scraping_source_id, "url": url} for url in discovery.new_urls])
+                .on_conflict_do_nothing(index_elements=["scraping_source_id", "url"])
+            )
+        if discovery.listed_urls:
+            await db.execute(
+                update(DiscoveredUrlDB)
+                .where(DiscoveredUrlDB.scraping_source_id == scraping_source_id)
+                .where(DiscoveredUrlDB.url.in_(discovery.listed_urls))
+                .values(last_seen_at=now)
+            )
+        await db.execute(
+            delete(DiscoveredUrlDB)
+            .where(DiscoveredUrlDB.scraping_source_id == scraping_source_id)
+            .where(DiscoveredUrlDB.last_seen_at < now - timedelta(days=DISCOVERED_URL_RETENTION_DAYS))
+        )
+        await db.commit()
+
+
+async def load_known_source_urls(scraping_source_id: int, urls: list[str]) -> set[str]:
+    """Return those of the given URLs that were stored as sources of the scraping source during earlier runs."""
+    if not urls:
+        return set()
+    async with get_db_session() as db:
+        return set(
+            (
+                await db.execute(
+                    select(WebSourceDB.url)
+                    .where(WebSourceDB.scraping_source_id == scraping_source_id)
+                    .where(WebSourceDB.url.in_(urls))
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+
+async def load_domain_health():
+    """Load the backoff and circuit breaker states of unhealthy domains persisted by earlier runs or other workers."""
+    async with get_db_session() as db:
+        rows = (await db.execute(select(DomainHealthDB))).scalars().all()
+    domain_health.load([DomainHealth.model_validate(row, from_attributes=True) for row in rows])
+
+
+async def persist_domain_health():
+    """Store the states of domains that changed during this run. Domains that recovered are forgotten."""
+    states = domain_health.pop_dirty()
+    if not states:
+        return
+    async with get_db_session() as db:
+        recovered = [state.domain for state in states if state.is_healthy]
+        if recovered:
+            await db.execute(delete(DomainHealthDB).where(DomainHealthDB.domain.in_(recovered)))
+        unhealthy = [state.model_dump() for state in states if not state.is_healthy]
+        if unhealthy:
+            statement = insert(DomainHealthDB).values(unhealthy)
+            await db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["domain"],
+                    set_={
+                        column: statement.excluded[column]
+                        for column in (
+                            "consecutive_failures",
+                            "last_failure_status",
+                            "backoff_until",
+                            "circuit_open_until",
+                            "updated_at",
+                        )
+                    },
+                )
+            )
+        await db.commit()
+
+
+async def load_domain_boilerplate(domain: str):
+    """Load what earlier runs learned about a domain's boilerplate, once per domain and process."""
+    if boilerplate_store.get(domain) is not None:
+        return
+    async with get_db_session() as db:
+        row = (
+            await db.execute(select(DomainBoilerplateDB).where(DomainBoilerplateDB.domain == domain))
+        ).scalar_one_or_none()
+    boilerplate_store.load(domain, DomainBoilerplate.model_validate(row, from_attributes=True) if row else None)
+
+
+async def persist_domain_boilerplate():
+    """Store the block counts of domains that had pages parsed during this run."""
+    changed = [boilerplate.model_dump() for boilerplate in boilerplate_store.pop_dirty()]
+    if not changed:
+        return
+    async with get_db_session() as db:
+        statement = insert(DomainBoilerplateDB).values(changed)
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["domain"],
+                set_={
+                    column: statement.excluded[column]
+                    for column in ("pages_seen", "block_counts", "recent_pages", "content_path", "updated_at")
+                },
+            )
+        )
+        await db.commit()
 
 
 def struct_time_to_datetime(struct_time_obj) -> datetime | None:
@@ -38,10 +266,49 @@ def struct_time_to_datetime(struct_time_obj) -> datetime | None:
         return None
 
 
+async def fetch_scraping_source_document(
+    scraping_source: ScrapingSourceWorkflow, etag: str | None, last_modified: str | None
+) -> FetchResult | None:
+    """Conditionally fetch the document a scraping source points to (feed, sitemap, listing page or article).
+
+    Returns None for source types that are not backed by a single document. The result has `not_modified` set if the
+    server confirmed via the given validators that the document did not change since the last completed run.
+    """
+    if scraping_source.source_type not in (
+        ScrapingSourceEnum.WEBPAGE,
+        ScrapingSourceEnum.RSS,
+        ScrapingSourceEnum.SITEMAP,
+        ScrapingSourceEnum.CALENDAR,
+    ):
+        return None
+
+    domain_rate_limiter.configure_from_scraping_config(scraping_source.base_url, scraping_source.scraping_config)
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return await fetch(scraping_source.base_url, headers=headers, revalidate=True)
+
+
 async def web_sources_from_scraping_source(
-    scraping_source: ScrapingSourceWorkflow, logger: "Logger", llm_service: LlmService
+    scraping_source: ScrapingSourceWorkflow,
+    logger: "Logger",
+    llm_service: LlmService,
+    source_document: FetchResult | None = None,
+    listing_discovery: ListingDiscovery | None = None,
+    deadline: Deadline | None = None,
+    api_cursor: ApiCursor | None = None,
 ) -> list[WebSourceWithMarkdown]:
+    """Get the web sources of a scraping source.
+
+    Reuses the already fetched source_document if available. For listing pages, listing_discovery is used to only
+    process articles that have not been discovered in earlier runs, and is updated with this run's findings. Likewise,
+    APIs are only asked for records after api_cursor. Once the deadline has passed, no further articles are downloaded
+    and the sources found so far are returned.
+    """
     scraping_source._visited = True
+    domain_rate_limiter.configure_from_scraping_config(scraping_source.base_url, scraping_source.scraping_config)
     match scraping_source.source_type:
         case ScrapingSourceEnum.WEBPAGE:
             if scraping_source.degrees_of_separation == 0:
@@ -51,41 +318,82 @@ async def web_sources_from_scraping_source(
                         date_according_to_calling_func=datetime.now(),
                         prefer_own_publish_date=True,
                         logger=logger,
+                        prefetched=source_document,
+                        deadline=deadline,
                     )
                 ]
             else:
-                return await extract_sources_from_web(scraping_source, logger, llm_service)
+                return await extract_sources_from_web(
+                    scraping_source, logger, llm_service, source_document, listing_discovery, deadline
+                )
         case ScrapingSourceEnum.RSS:
-            return await extract_sources_from_rss(scraping_source, logger)
+            return await extract_sources_from_rss(scraping_source, logger, source_document, deadline)
+        case ScrapingSourceEnum.SITEMAP:
+            return await extract_sources_from_sitemap(scraping_source, logger, source_document, deadline)
+        case ScrapingSourceEnum.CALENDAR:
+            return await extract_sources_from_calendar(scraping_source, logger, source_document, deadline)
+        case ScrapingSourceEnum.API:
+            return await extract_sources_from_api(scraping_source, logger, api_cursor, deadline)
         case _:
             raise ValueError(f"Unsupported source type: {scraping_source.source_type}")
 
 
 async def extract_sources_from_web(
-    scraping_source: ScrapingSourceWorkflow, logger: "Logger", llm_service: LlmService
+    scraping_source: ScrapingSourceWorkflow,
+    logger: "Logger",
+    llm_service: LlmService,
+    source_document: FetchResult | None = None,
+    listing_discovery: ListingDiscovery | None = None,
+    deadline: Deadline | None = None,
 ) -> list[WebSourceWithMarkdown]:
     """Extract sources from a website, using newspaper if possible, LLM-assisted if not."""
     sources = []
+    listing_discovery = listing_discovery or ListingDiscovery()
+    retry_later: set[str] = set()  # Articles that failed for now, and are not to be counted as discovered
+    deadline = deadline or Deadline(None)
 
     config = Config()
     config.memorize_articles = False
     config.disable_category_cache = True
     config.thread_timeout_seconds = 120
 
+    # Download the listing page through the shared HTTP client; newspaper still fetches category pages and feeds itself
+    listing_html = source_document.text if source_document is not None else None
+    if listing_html is None:
+        try:
+            _, listing_html = await deadline.run(fetch_html(scraping_source.base_url, revalidate=True), timeout=60)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.warning(
+                "❌ Could not download listing page {url}: <red>{e}</red>", url=scraping_source.base_url, e=e
+            )
+
     try:
-        website = await asyncio.to_thread(newspaper.build, scraping_source.base_url, only_in_path=True, config=config)
+        website = await deadline.run(
+            asyncio.to_thread(
+                newspaper.build, scraping_source.base_url, only_in_path=True, input_html=listing_html, config=config
+            )
+        )
+    except DeadlineExceeded:
+        raise
     except:
         website = None
 
     if website is None or len(website.articles) < MIN_ENTRIES_TO_CONSIDER_VALID_LISTING:
         # Parse the page AS an Article instead
         log = f"❌ Newspaper failed to retrieve scraping source <cyan>{scraping_source.id}</cyan> ({scraping_source.base_url}) as Website, falling back to LLM-assisted parsing."
-        website = Article(scraping_source.base_url, memoize_articles=False, disable_category_cache=True)
 
         try:
-            await asyncio.wait_for(asyncio.to_thread(website.download), timeout=60)  # 1 minute timeout
-            await asyncio.wait_for(asyncio.to_thread(website.parse), timeout=30)  # 30 second timeout
+            if listing_html is None:
+                _, listing_html = await deadline.run(fetch_html(scraping_source.base_url, revalidate=True), timeout=60)
+            listing = await deadline.run(
+                run_in_process(parse_listing_html, scraping_source.base_url, listing_html),
+                timeout=30,  # 30 second timeout
+            )
             logger.info("✅ Article download and parse completed for LLM processing")
+        except DeadlineExceeded:
+            raise
         except asyncio.TimeoutError:
             logger.error("❌ TIMEOUT: Article download/parse took too long for {url}", url=scraping_source.base_url)
             raise Exception(f"Article processing timed out for {scraping_source.base_url}")
@@ -93,56 +401,110 @@ async def extract_sources_from_web(
             logger.error("❌ ERROR in article download/parse: <red>{e}</red>", e=e)
             raise
 
-        # Choose Website as parsed by newspaper or raw html for source extraction
-        input = choose_input_for_listing_page(website.article_html, website.html, scraping_source.base_url, logger)
-        if input is None:
+        for message in listing.log_messages:
+            logger.info(message)
+        if listing.markdown is None:
             log += "❌ Could not determine input for markdownify. Skipping."
             logger.warning(log)
             return []
-        markdown = markdownify(input)
+
+        # Skip the LLM call entirely if the listing page links to exactly the same articles as during the last run
+        listing_discovery.links_hash = hash_links(listing.links)
+        if listing_discovery.links_hash == listing_discovery.previous_links_hash:
+            # The articles discovered earlier are still listed, so they must not be forgotten
+            listing_discovery.listed_urls = list(dict.fromkeys(listing.links))
+            logger.info(log + " ✅ Listing page links have not changed since the last run, skipping.")
+            return []
+
+        markdown = compact_markdown(listing.markdown, keep_links=True)
+        log += f" Listing page markdown compacted from <yellow>{count_tokens(listing.markdown)}</yellow> to <yellow>{count_tokens(markdown)}</yellow> tokens."
 
         # Let LLM extract sources from the page
         messages = [
             await llm_service.get_source_extraction_system_message(scraping_source.topic, scraping_source.base_url),
             HumanMessage(f"Extract sources from the following webpage: {markdown}"),
         ]
-        response = await asyncio.wait_for(
+        response = await deadline.run(
             llm_service.source_extracting_llm.ainvoke(messages),
             timeout=180,  # 3 minute timeout
         )
         extracted_sources: list[WebSourceBase] = response["parsed"].sources
         log += f" LLM extracted <cyan>{len(extracted_sources)}</cyan> sources from scraping source with id:<cyan>{scraping_source.id}</cyan> ({scraping_source.base_url})."
-        logger.info(log)
 
-        for extracted_source in extracted_sources:
-            # Below check avoids parsing unnecessary articles. Commented out for now because LLM-determined date from listings page might not be reliable enough
-            # if extracted_source.date and extracted_source.date < scraping_source.last_scraped_at:
-            #     continue
+        # Only process articles that have not been discovered on the listing page during earlier runs
+        listing_discovery.listed_urls = list(dict.fromkeys(source.url for source in extracted_sources))
+        discovered_urls = await load_discovered_urls(scraping_source.id, listing_discovery.listed_urls)
+        extracted_sources = list(
+            {source.url: source for source in extracted_sources if source.url not in discovered_urls}.values()
+        )
+        log += f" <cyan>{len(extracted_sources)}</cyan> of them have not been discovered before."
+        logger.info(log)
 
-            source = await download_and_parse_article(
+        # Below check would avoid parsing unnecessary articles. Not done for now because LLM-determined date from listings page might not be reliable enough
+        # extracted_sources = [s for s in extracted_sources if not s.date or s.date >= scraping_source.last_scraped_at]
+        results = await map_bounded(
+            lambda extracted_source: download_and_parse_article(
                 extracted_source.url,
                 date_according_to_calling_func=extracted_source.date,
                 prefer_own_publish_date=True,  # LLM-determined publish-date probably less reliable than newspaper-determined publish date of the actual article
                 degrees_of_separation=1,
                 logger=logger,
-            )
-            await asyncio.sleep(0.1)
+                not_before=scraping_source.last_scraped_at,
+                deadline=deadline,
+                retry_later=retry_later,
+            ),
+            extracted_sources,
+            source_concurrency(scraping_source),
+        )
+        listing_discovery.record_attempts([source.url for source in extracted_sources], retry_later)
 
+        for source in results:
             # At this point, the source must have a recent date, either from the llm, or from newspaper
-            if source and source.date >= scraping_source.last_scraped_at:
+            if isinstance(source, WebSourceWithMarkdown) and source.date >= scraping_source.last_scraped_at:
                 sources.append(source)
 
     else:
         # If newspaper was able to retrieve the articles listed on the page, parse them one by one, no need for LLM to get involved.
+        articles = list({article.url: article for article in website.articles}.values())
+        listing_discovery.listed_urls = [article.url for article in articles]
+        listing_discovery.links_hash = hash_links(listing_discovery.listed_urls)
+        if listing_discovery.links_hash == listing_discovery.previous_links_hash:
+            logger.info(
+                "✅ Listing page of scraping source <cyan>{id}</cyan> ({base_url}) links to the same <yellow>{count}</yellow> articles as during the last run, skipping.",
+                id=scraping_source.id,
+                base_url=scraping_source.base_url,
+                count=len(articles),
+            )
+            return []
+
+        # Only process articles that have not been discovered on the listing page during earlier runs
+        discovered_urls = await load_discovered_urls(scraping_source.id, listing_discovery.listed_urls)
+        articles = [article for article in articles if article.url not in discovered_urls]
+
         logger.info(
-            "✅ Newspaper successfully parsed scraping source <cyan>{id}</cyan> ({base_url}) as Website, now processing <yellow>{count}</yellow> articles",
+            "✅ Newspaper successfully parsed scraping source <cyan>{id}</cyan> ({base_url}) as Website, now processing <yellow>{count}</yellow> new articles (<yellow>{discovered}</yellow> discovered during earlier runs)",
             id=scraping_source.id,
             base_url=scraping_source.base_url,
-            count=len(website.articles),
+            count=len(articles),
+            discovered=len(discovered_urls),
         )
-        for article in website.articles:
-            source = await download_and_parse_article(article.url, degrees_of_separation=1, logger=logger)
-            if source is not None and source.date >= scraping_source.last_scraped_at:
+        results = await map_bounded(
+            lambda article: download_and_parse_article(
+                article.url,
+                degrees_of_separation=1,
+                logger=logger,
+                not_before=scraping_source.last_scraped_at,
+                deadline=deadline,
+                retry_later=retry_later,
+            ),
+            articles,
+            source_concurrency(scraping_source),
+        )
+        listing_discovery.record_attempts([article.url for article in articles], retry_later)
+        for article, source in zip(articles, results):
+            if isinstance(source, BaseException):
+                logger.error("Error processing article {url}: <red>{e}</red>", url=article.url, e=source)
+            elif source is not None and source.date >= scraping_source.last_scraped_at:
                 sources.append(source)
             elif source is not None:
                 logger.info(
@@ -153,352 +515,25 @@ async def extract_sources_from_web(
                 )
             else:
                 logger.info("❌ Article <cyan>{url}</cyan> is None. Skipping.", url=article.url)
-            await asyncio.sleep(0.1)
 
     return sources
 
 
-def choose_input_for_listing_page(article_html: str, full_html: str, base_url: str, logger: "Logger") -> str | None:
-    """Choose the best HTML input for a listing page that should contain article links."""
-
-    domain = urlparse(base_url).netloc
-
-    # Check if article_html contains meaningful article links
-    if _has_sufficient_article_links(article_html, domain):
-        logger.info("✅ Article HTML contains sufficient article links, using it")
-        return html.unescape(article_html).replace("\xad", "")
-    elif _has_sufficient_article_links(full_html, domain):
-        logger.info("❌ Article HTML does not contain sufficient article links, but full HTML does, using it")
-        # no return sanitize(full_html) here, as it is only suited for articles, not listing pages
-        return html.unescape(full_html).replace("\xad", "")
-    else:
-        logger.info("❌ Neither HTML version contains sufficient article links")
-        return None
-
-
-def _has_sufficient_article_links(html_content: str, domain: str, min_links: int = 5) -> bool:
-    """Check if HTML contains at least min_links that look like article links."""
-    if not html_content or not html_content.strip():
-        return False
-
-    try:
-        soup = BeautifulSoup(html_content, "html.parser")
-        article_links = set()
-
-        # Find all links
-        for link in soup.find_all("a", href=True):
-            href = link.get("href", "").strip()
-            if not href:
-                continue
-
-            # Skip obvious non-article links
-            if _is_likely_article_link(href, domain):
-                article_links.add(href)
-
-            if len(article_links) >= min_links:
-                return True
-
-        return False
-
-    except Exception:
-        return False
-
-
-def _is_likely_article_link(href: str, domain: str) -> bool:
-    """Determine if a link is likely to be an article link."""
-    # TODO: This function is not very useful right now, as too many non-article-links will make it through
-
-    href_lower = href.lower()
-
-    skip_patterns = ["#", "mailto:", "tel:", "javascript:"]
-
-    for pattern in skip_patterns:
-        if href_lower.startswith(pattern):
-            return False
-
-    parsed_href = urlparse(href)
-
-    # Must be internal link (no netloc) or full URL to same domain
-    if not parsed_href.netloc:
-        return True
-    elif parsed_href.netloc == domain:
-        return True
-
-    return False
-
-
-def choose_input_for_markdownify(article_html: str, full_html: str, logger: "Logger") -> str | None:
-    """Choose the input for markdownify based on the quality of the article HTML."""
-    if _is_article_html_good_quality(article_html):
-        logger.info("✅ Article HTML as parsed by newspaper is good quality, using it")
-        return article_html
-    else:
-        sanitized_html = sanitize_html(full_html)
-        if sanitized_html is None:
-            logger.info(
-                "❌ Could not sanitize HTML manually. Notice that this might be due to the article being behind a paywall, so MIN_ARTICLE_LENGTH might never be reached."
-            )
-            return None
-        else:
-            logger.info("✅ Successfully sanitized HTML manually")
-            return sanitized_html
-
-
-def extract_main_content_by_ratio(raw_html: str) -> str | None:
-    """Extract main article content using recursive text-to-HTML ratio analysis."""
-
-    try:
-        soup = BeautifulSoup(raw_html, "html.parser")
-
-        # Pre-filter HTML to remove guaranteed non-content elements
-        filtered_soup = prefilter_html(soup)
-
-        # Find leaf text elements (elements with text but no text-containing children)
-        leaf_text_elements = find_leaf_text_elements(filtered_soup)
-
-        if not leaf_text_elements:
-            return raw_html
-
-        # Find optimal container using bottom-up recursive analysis
-        memo = {}
-        best_element = None
-        best_score = 0
-
-        for leaf_element in leaf_text_elements:
-            optimal_element, score = find_optimal_higher_node(leaf_element, memo)
-            text_length = len(optimal_element.get_text(strip=True))
-
-            if text_length >= MIN_ARTICLE_LENGTH and score > best_score:
-                best_score = score
-                best_element = optimal_element
-
-        if best_element is not None:
-            # Clean empty elements from the result before returning
-            cleaned_element = remove_empty_elements(best_element)
-            return str(cleaned_element)
-        else:
-            return None
-
-    except Exception:
-        return None
-
-
-def remove_empty_elements(element):
-    """Remove empty child elements from the given element."""
-    # Find all descendants that have no text content
-    empty_elements = []
-    for child in element.find_all():
-        # Skip if this element has text content
-        if child.get_text(strip=True):
-            continue
-
-        # Skip important structural elements even if empty
-        if child.name in ["br", "hr", "wbr"]:
-            continue
-
-        empty_elements.append(child)
-
-    # Remove empty elements
-    for empty_elem in empty_elements:
-        empty_elem.decompose()
-
-    return element
-
-
-def find_leaf_text_elements(soup: BeautifulSoup) -> list:
-    """Find leaf text elements - elements that contain text but have no text-containing children."""
-    leaf_elements = []
-
-    # Get all elements that contain text
-    text_containing_elements = []
-    for element in soup.find_all():
-        if element.get_text(strip=True):
-            text_containing_elements.append(element)
-
-    # Filter to only leaf elements (no text-containing descendants)
-    for element in text_containing_elements:
-        has_text_containing_children = False
-
-        # Check if any descendants contain text
-        for descendant in element.find_all():
-            if descendant != element and descendant.get_text(strip=True):
-                has_text_containing_children = True
-                break
-
-        if not has_text_containing_children:
-            leaf_elements.append(element)
-
-    return leaf_elements
-
-
-def prefilter_html(soup: BeautifulSoup) -> BeautifulSoup:
-    """Remove elements guaranteed not to contain article content."""
-    # Elements to remove completely
-    unwanted_tags = [
-        "script",
-        "style",
-        "noscript",
-        "img",
-        "svg",
-        "video",
-        "nav",
-        "footer",
-        "header",
-        "aside",
-        "iframe",
-        "canvas",
-        "audio",
-        "track",
-        "source",
-        "object",
-        "embed",
-        "map",
-        "area",
-        "form",
-        "button",
-        "input",
-        "select",
-        "textarea",
-        "progress",
-        "meter",
-        "menu",
-        "menuitem",
-        "dialog",
-        "template",
-    ]
-
-    for tag_name in unwanted_tags:
-        for element in soup.find_all(tag_name):
-            element.decompose()
-
-    # Remove HTML comments
-    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-        comment.extract()
-
-    return soup
-
-
-def calculate_container_score(element) -> float:
-    """Calculate score as text_length * text_to_html_ratio."""
-    if not element:
-        return 0.0
-
-    # Get text content of current + all children
-    text_content = element.get_text(strip=True)
-    text_length = len(text_content)
-
-    if text_length == 0:
-        return 0.0
-
-    # Get HTML markup length of current, including all children
-    html_content = str(element)
-    markup_length = len(html_content) - text_length
-
-    if markup_length < 0:
-        markup_length = 0
-
-    # Calculate text-to-HTML ratio
-    total_length = text_length + markup_length
-    if total_length == 0:
-        return 0.0
-
-    text_to_html_ratio = text_length / total_length
-
-    # Final score: text_length * ratio
-    return text_length * text_to_html_ratio
-
-
-def find_optimal_higher_node(element, memo: dict) -> tuple:
-    """Find the optimal higher node by evaluating all higher nodes up the tree."""
-    # Check memo to avoid recalculation
-    if element in memo:
-        return memo[element]
-
-    best_element = element
-    best_score = calculate_container_score(element)
-    traversed_elements = [element]  # Track all elements we evaluate
-
-    # Traverse all ancestors and find the one with the highest score
-    current = element
-    while current.parent and current.parent.name:  # Skip NavigableString parents
-        current = current.parent
-
-        # Check if parent is already memoized
-        if current in memo:
-            parent_best_element, parent_best_score = memo[current]
-            if parent_best_score > best_score:
-                best_element = parent_best_element
-                best_score = parent_best_score
-            break
-
-        # Track this element for memoization
-        traversed_elements.append(current)
-
-        # Calculate score for this ancestor
-        current_score = calculate_container_score(current)
-        if current_score > best_score:
-            best_element = current
-            best_score = current_score
-
-    # Memoize ALL elements in the traversal path with the optimal result
-    result = (best_element, best_score)
-    for traversed_element in traversed_elements:
-        memo[traversed_element] = result
-
-    return result
-
-
-def sanitize_html(raw_html: str) -> str | None:
-    """Sanitize raw HTML by extracting main content and fixing entities."""
-    if not raw_html or not raw_html.strip():
-        return raw_html
-
-    # Try to extract main content using ratio analysis
-    main_content = extract_main_content_by_ratio(raw_html)
-
-    if main_content is None:
-        return None
-
-    # Unescape HTML entities like &shy;, &nbsp;, etc.
-    unescaped_html = html.unescape(main_content)
-
-    # Remove soft hyphens (\xad) which appear after unescaping &shy;
-    cleaned_html = unescaped_html.replace("\xad", "")
-
-    return cleaned_html
-
-
-def _is_article_html_good_quality(article_html: str) -> bool:
-    """Detect if newspaper's article_html properly extracted main content."""
-    if not article_html or not article_html.strip():
-        return False
-
-    try:
-        soup = BeautifulSoup(article_html, "html.parser")
-        text_content = soup.get_text(strip=True)
-
-        # Basic length checks
-        if len(text_content) < MIN_ARTICLE_LENGTH or len(text_content) > MAX_ARTICLE_LENGTH:
-            return False
-
-        # Check text-to-markup ratio
-        markup_length = len(article_html) - len(text_content)
-        if markup_length > 0:
-            text_ratio = len(text_content) / (len(text_content) + markup_length)
-            if text_ratio < 0.4:  # At least 40% actual text
-                return False
-
-        return True
-
-    except Exception:
-        # If BeautifulSoup parsing fails, fall back to basic checks
-        article_len = len(article_html.strip())
-        return MIN_ARTICLE_LENGTH <= article_len <= MAX_ARTICLE_LENGTH
-
+async def extract_sources_from_rss(
+    scraping_source: ScrapingSourceWorkflow,
+    logger: "Logger",
+    source_document: FetchResult | None = None,
+    deadline: Deadline | None = None,
+) -> list[WebSourceWithMarkdown]:
+    """Extract sources from an RSS feed.
 
-async def extract_sources_from_rss(scraping_source: ScrapingSourceDB, logger: "Logger") -> list[WebSourceWithMarkdown]:
-    """Extract sources from an RSS feed."""
-    feed = await asyncio.to_thread(feedparser.parse, scraping_source.base_url)
+    Entries whose full content is embedded in the feed (in content:encoded or a long summary) are used as they are,
+    unless scraping_config["use_feed_content"] is false. Only the other entries are downloaded and parsed.
+    """
+    deadline = deadline or Deadline(None)
+    use_feed_content = (scraping_source.scraping_config or {}).get("use_feed_content", True)
+    response = source_document or await deadline.run(fetch(scraping_source.base_url, revalidate=True))
+    feed = await run_in_process(parse_feed, response.body, {**response.headers, "content-location": response.url})
     sources = []
 
     logger.info(
@@ -508,6 +543,8 @@ async def extract_sources_from_rss(scraping_source: ScrapingSourceDB, logger: "L
         entries=len(feed.entries),
     )
 
+    # Filter entries by their feed dates first, then download the remaining ones concurrently
+    entries_to_download = []
     for entry in feed.entries:
         if not entry.link:
             logger.info("❌ Entry <cyan>{entry_id}</cyan> has no link, skipping.", entry_id=entry.id)
@@ -538,16 +575,51 @@ async def extract_sources_from_rss(scraping_source: ScrapingSourceDB, logger: "L
             )
             continue
 
+        entries_to_download.append((entry, date))
+
+    # Full-text feeds make downloading the articles unnecessary. The embedded contents are converted in a single task
+    if use_feed_content and entries_to_download:
+        contents = await run_in_process(
+            html_fragments_to_markdown, [feed_entry_content(entry) for entry, _ in entries_to_download]
+        )
+        remaining = []
+        for (entry, date), markdown in zip(entries_to_download, contents):
+            # Measured like article text, without link targets
+            if len(compact_markdown(markdown, keep_links=False)) < MIN_ARTICLE_LENGTH:
+                remaining.append((entry, date))
+                continue
+            sources.append(
+                WebSourceWithMarkdown(
+                    url=entry.link,
+                    date=date,
+                    title=entry.get("title"),
+                    markdown=markdown[:MAX_ARTICLE_LENGTH],
+                    degrees_of_separation=1,
+                )
+            )
+            logger.info(
+                "✅ Entry <cyan>{entry_id}</cyan> has its full content in the feed, added to sources without downloading.",
+                entry_id=entry.id,
+            )
+        entries_to_download = remaining
+
+    results = await map_bounded(
         # Use the RSS feed date instead of letting the function parse the article date
-        source = await download_and_parse_article(
-            entry.link,
-            date_according_to_calling_func=date,
+        lambda entry_and_date: download_and_parse_article(
+            entry_and_date[0].link,
+            date_according_to_calling_func=entry_and_date[1],
             prefer_own_publish_date=False,
             degrees_of_separation=1,
             logger=logger,
-        )
+            not_before=scraping_source.last_scraped_at,
+            deadline=deadline,
+        ),
+        entries_to_download,
+        source_concurrency(scraping_source),
+    )
 
-        if source and source.date >= scraping_source.last_scraped_at:
+    for (entry, _), source in zip(entries_to_download, results):
+        if isinstance(source, WebSourceWithMarkdown) and source.date >= scraping_source.last_scraped_at:
             sources.append(source)
             logger.info(
                 "✅ Entry <cyan>{entry_id}</cyan> successfully downloaded, parsed and added to sources.",
@@ -558,11 +630,345 @@ async def extract_sources_from_rss(scraping_source: ScrapingSourceDB, logger: "L
                 "❌ Entry <cyan>{entry_id}</cyan> could not be downloaded and parsed. Skipping.", entry_id=entry.id
             )
 
-        await asyncio.sleep(0.1)
+    return sources
+
 
+def feed_entry_content(entry) -> str:
+    """The longest content embedded in a feed entry, e.g. the full article in content:encoded, or its summary."""
+    contents = [content.get("value") or "" for content in entry.get("content") or []]
+    return max([*contents, entry.get("summary") or ""], key=len)
+
+
+async def extract_sources_from_calendar(
+    scraping_source: ScrapingSourceWorkflow,
+    logger: "Logger",
+    source_document: FetchResult | None = None,
+    deadline: Deadline | None = None,
+) -> list[WebSourceWithMarkdown]:
+    """Turn the upcoming events of an iCalendar feed into sources that carry their event as structured data.
+
+    Nothing is downloaded per event and no LLM is involved: event extraction only checks the events' relevance to
+    the topic. Events can be pre-filtered by scraping_config["keywords"]. Events that haven't changed since the last
+    run are skipped.
+    """
+    deadline = deadline or Deadline(None)
+    config = scraping_source.scraping_config or {}
+    response = source_document or await deadline.run(fetch(scraping_source.base_url, revalidate=True))
+    calendar_events = await run_in_process(
+        parse_calendar,
+        response.body,
+        datetime.now(timezone.utc),
+        list(config.get("keywords") or []),
+        int(config.get("max_calendar_events", MAX_CALENDAR_EVENTS)),
+    )
+    logger.info(
+        "Calendar <cyan>{id}</cyan> ({base_url}) fetched. Found <yellow>{events}</yellow> upcoming events.",
+        id=scraping_source.id,
+        base_url=scraping_source.base_url,
+        events=len(calendar_events),
+    )
+
+    last_scraped_at = uniform_publish_date(scraping_source.last_scraped_at)
+    sources = []
+    urls = set()
+    for calendar_event in calendar_events:
+        if last_scraped_at and calendar_event.revision < last_scraped_at:
+            continue
+        # Several events may link the same page, e.g. a court's hearing schedule
+        url = calendar_event.url
+        if not url or url in urls:
+            url = f"{response.url}#{calendar_event.uid}"
+        urls.add(url)
+        sources.append(
+            WebSourceWithMarkdown(
+                url=url,
+                date=calendar_event.revision,
+                title=calendar_event.event.title,
+                markdown="",
+                degrees_of_separation=1,
+                structured_events=[calendar_event.event],
+            )
+        )
+
+    logger.info(
+        "✅ <yellow>{new}</yellow> of the calendar's events are new or changed since the last run.", new=len(sources)
+    )
+    return sources
+
+
+async def extract_sources_from_api(
+    scraping_source: ScrapingSourceWorkflow,
+    logger: "Logger",
+    api_cursor: ApiCursor | None = None,
+    deadline: Deadline | None = None,
+) -> list[WebSourceWithMarkdown]:
+    """Extract sources from the records of a JSON API, as configured in scraping_config["api"].
+
+    Pages are requested one at a time and processed before the next one is. Records that carry their content become
+    sources directly, records mapped to events carry them as structured data, and the URLs of all other records are
+    downloaded like feed entries. Records at or before the cursor of the last completed run are skipped, as are
+    undated records with content that became sources during earlier runs. The cursor only advances past records that
+    were processed, not past those whose download is to be retried.
+    """
+    deadline = deadline or Deadline(None)
+    api_cursor = api_cursor or ApiCursor()
+    config = ApiSourceConfig.model_validate((scraping_source.scraping_config or {}).get("api") or {})
+    last_scraped_at = uniform_publish_date(scraping_source.last_scraped_at)
+    previous_cursor = cursor_key(api_cursor.previous) if api_cursor.previous is not None else None
+
+    sources, urls = [], set()
+    records_read, pages_read, skipped = 0, 0, 0
+    retry_later: set[str] = set()
+    cursors: list[tuple[str, Any]] = []  # URL and cursor of every record read past the previous cursor
+    async for records in iter_api_pages(config, scraping_source.base_url, api_cursor.previous, deadline):
+        pages_read += 1
+        records = records[: config.max_records - records_read]
+        records_read += len(records)
+
+        with_content, to_download = [], []
+        for record in (map_record(record, config, scraping_source.base_url) for record in records):
+            if record is None or record.url is None or record.url in urls:
+                skipped += 1
+                continue
+            if record.cursor is not None:
+                if previous_cursor is not None and cursor_key(record.cursor) <= previous_cursor:
+                    skipped += 1
+                    continue
+                cursors.append((record.url, record.cursor))
+            if record.event is None and record.date and last_scraped_at and record.date < last_scraped_at:
+                skipped += 1
+                continue
+            urls.add(record.url)
+            if record.content or record.event:
+                with_content.append(record)
+            else:
+                to_download.append(record)
+
+        # Without a date, only the record's URL (or the one made up from its id) tells whether it is new
+        known_urls = await load_known_source_urls(
+            scraping_source.id, [record.url for record in with_content if record.date is None]
+        )
+        skipped += len(known_urls)
+        with_content = [record for record in with_content if record.url not in known_urls]
+
+        # Convert the page's HTML contents in a single task
+        contents = [record.content or "" for record in with_content]
+        if config.fields.content_format == "html" and any(contents):
+            contents = await run_in_process(html_fragments_to_markdown, contents)
+        for record, markdown in zip(with_content, contents):
+            sources.append(
+                WebSourceWithMarkdown(
+                    url=record.url,
+                    date=record.date or datetime.now(timezone.utc),  # When an undated record was first seen
+                    title=record.title or (record.event.title if record.event else None),
+                    markdown=markdown[:MAX_ARTICLE_LENGTH],
+                    degrees_of_separation=1,
+                    structured_events=[record.event] if record.event else [],
+                )
+            )
+
+        results = await map_bounded(
+            lambda record: download_and_parse_article(
+                record.url,
+                date_according_to_calling_func=record.date,
+                prefer_own_publish_date=record.date is None,
+                degrees_of_separation=1,
+                logger=logger,
+                not_before=last_scraped_at,
+                deadline=deadline,
+                retry_later=retry_later,
+            ),
+            to_download,
+            source_concurrency(scraping_source),
+        )
+        sources += [
+            source
+            for source in results
+            if isinstance(source, WebSourceWithMarkdown) and (not last_scraped_at or source.date >= last_scraped_at)
+        ]
+
+        if records_read >= config.max_records:
+            break
+
+    # The next run asks for records after the cursor, so it must not pass any record that is to be retried
+    retry_keys = [cursor_key(cursor) for url, cursor in cursors if url in retry_later]
+    processed = [cursor for url, cursor in cursors if url not in retry_later]
+    if retry_keys:
+        processed = [cursor for cursor in processed if cursor_key(cursor) < min(retry_keys)]
+    if processed:
+        api_cursor.latest = str(max(processed, key=cursor_key))
+
+    logger.info(
+        "API <cyan>{id}</cyan> ({base_url}) read. Got <yellow>{records}</yellow> records from <yellow>{pages}</yellow> page(s), skipped <yellow>{skipped}</yellow>, left <yellow>{retry}</yellow> to retry and found <yellow>{sources}</yellow> sources.",
+        id=scraping_source.id,
+        base_url=scraping_source.base_url,
+        records=records_read,
+        pages=pages_read,
+        skipped=skipped,
+        retry=len(retry_later),
+        sources=len(sources),
+    )
     return sources
 
 
+class SitemapParser:
+    """Incremental parser for a (possibly gzipped) sitemap or sitemap index, fed chunk by chunk as it downloads.
+
+    Collects the page URLs of a <urlset> in `pages` and the nested sitemap URLs of a <sitemapindex> in `sitemaps`,
+    each with their <lastmod> (or Google News <news:publication_date>) if present. Elements are discarded as soon as
+    they have been read, so memory use does not grow with the size of the document. Gzipped sitemaps are decompressed
+    on the fly, and ResponseTooLargeError is raised once they inflate beyond SCRAPING_MAX_DOWNLOAD_BYTES.
+    """
+
+    def __init__(self):
+        self.pages: list[tuple[str, datetime | None]] = []
+        self.sitemaps: list[tuple[str, datetime | None]] = []
+        self._parser = etree.XMLPullParser(events=("end",), recover=True, resolve_entities=False, no_network=True)
+        self._head = b""  # Held back until it is known whether the document is gzipped
+        self._decompressor = None
+        self._remaining = settings.SCRAPING_MAX_DOWNLOAD_BYTES
+
+    def feed(self, chunk: bytes):
+        if self._head is not None:
+            self._head += chunk
+            if len(self._head) < 2:
+                return
+            chunk, self._head = self._head, None
+            if chunk.startswith(b"\x1f\x8b"):
+                self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        if self._decompressor is not None:
+            chunk = self._decompressor.decompress(chunk, self._remaining)
+            self._remaining -= len(chunk)
+            if self._decompressor.unconsumed_tail:
+                raise ResponseTooLargeError(f"Sitemap exceeds {settings.SCRAPING_MAX_DOWNLOAD_BYTES} bytes unpacked")
+        self._parser.feed(chunk)
+        self._read_events()
+
+    def close(self):
+        if self._head:
+            self._parser.feed(self._head)
+        self._parser.close()
+        self._read_events()
+
+    def _read_events(self):
+        for _, element in self._parser.read_events():
+            if not isinstance(element.tag, str) or etree.QName(element).localname not in ("url", "sitemap"):
+                continue
+            loc, date = None, None
+            for child in element.iter():
+                if not isinstance(child.tag, str) or not child.text:
+                    continue
+                name = etree.QName(child).localname
+                if name == "loc":
+                    loc = child.text.strip()
+                elif name in ("lastmod", "publication_date"):
+                    date = max(filter(None, [date, _parse_date_upper_bound(child.text)]), default=None)
+            if loc:
+                (self.pages if etree.QName(element).localname == "url" else self.sitemaps).append((loc, date))
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+
+def parse_sitemap(body: bytes) -> tuple[list[tuple[str, datetime | None]], list[tuple[str, datetime | None]]]:
+    """Parse an already downloaded sitemap or sitemap index into its page URLs and nested sitemap URLs."""
+    parser = SitemapParser()
+    for offset in range(0, len(body), SITEMAP_PARSE_CHUNK_SIZE):
+        parser.feed(body[offset : offset + SITEMAP_PARSE_CHUNK_SIZE])
+    parser.close()
+    return parser.pages, parser.sitemaps
+
+
+async def stream_sitemap(url: str) -> tuple[list[tuple[str, datetime | None]], list[tuple[str, datetime | None]]]:
+    """Download and parse a sitemap or sitemap index at the same time, without holding its body in memory.
+
+    Parsing runs in this process rather than the process pool, as the parser's state has to live on between chunks.
+    Each chunk only takes lxml a moment, and the event loop gets to run while waiting for the next one.
+    """
+    parser = SitemapParser()
+    async for chunk in stream(url):
+        parser.feed(chunk)
+    parser.close()
+    return parser.pages, parser.sitemaps
+
+
+async def extract_sources_from_sitemap(
+    scraping_source: ScrapingSourceWorkflow,
+    logger: "Logger",
+    source_document: FetchResult | None = None,
+    deadline: Deadline | None = None,
+) -> list[WebSourceWithMarkdown]:
+    """Extract sources from a sitemap or sitemap index, only considering URLs modified since the last scrape.
+
+    The sitemap the scraping source points to has usually been fetched already, to learn whether it changed at all,
+    and is parsed in the process pool. Nested sitemaps are streamed and parsed while they download.
+    """
+    deadline = deadline or Deadline(None)
+    last_scraped_at = uniform_publish_date(scraping_source.last_scraped_at)
+    max_urls = int((scraping_source.scraping_config or {}).get("max_sitemap_urls", MAX_SITEMAP_URLS))
+
+    def is_changed(date: datetime | None) -> bool:
+        return last_scraped_at is None or date >= last_scraped_at
+
+    pending: list[tuple[str, FetchResult | None, int]] = [(scraping_source.base_url, source_document, 0)]
+    changed_urls: dict[str, datetime] = {}
+    sitemaps_read, undated = 0, 0
+    while pending and sitemaps_read < MAX_SITEMAPS_PER_RUN and not deadline.should_shed():
+        sitemap_url, document, depth = pending.pop(0)
+        sitemaps_read += 1
+        try:
+            if document is not None:
+                pages, sitemaps = await deadline.run(run_in_process(parse_sitemap, document.body))
+            else:
+                pages, sitemaps = await deadline.run(stream_sitemap(sitemap_url))
+        except DeadlineExceeded:
+            break
+        except Exception as e:
+            logger.warning("❌ Could not read sitemap {url}: <red>{e}</red>", url=sitemap_url, e=e)
+            continue
+
+        for url, date in pages:
+            if date is None:
+                undated += 1
+            elif is_changed(date):
+                changed_urls[url] = max(date, changed_urls.get(url, date))
+
+        # Only descend into nested sitemaps that may contain changed URLs, most recently modified ones first
+        nested = [(url, date) for url, date in sitemaps if date is None or is_changed(date)]
+        if depth < MAX_NESTED_SITEMAP_DEPTH:
+            nested.sort(key=lambda entry: entry[1] or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
+            pending.extend((url, None, depth + 1) for url, _ in nested)
+
+    entries = sorted(changed_urls.items(), key=lambda entry: entry[1], reverse=True)[:max_urls]
+    logger.info(
+        "Sitemap <cyan>{id}</cyan> ({base_url}) read from <yellow>{sitemaps}</yellow> sitemap(s). Found <yellow>{changed}</yellow> URLs modified since <yellow>{last_scraped_at}</yellow>, processing <yellow>{count}</yellow> of them. Ignored <yellow>{undated}</yellow> URLs without date.",
+        id=scraping_source.id,
+        base_url=scraping_source.base_url,
+        sitemaps=sitemaps_read,
+        changed=len(changed_urls),
+        last_scraped_at=last_scraped_at,
+        count=len(entries),
+        undated=undated,
+    )
+
+    results = await map_bounded(
+        # lastmod is when the page changed, not necessarily when it was published, so prefer the article's own date
+        lambda entry: download_and_parse_article(
+            entry[0],
+            date_according_to_calling_func=entry[1],
+            prefer_own_publish_date=True,
+            degrees_of_separation=1,
+            logger=logger,
+            not_before=last_scraped_at,
+            deadline=deadline,
+        ),
+        entries,
+        source_concurrency(scraping_source),
+    )
+
+    return [source for source in results if isinstance(source, WebSourceWithMarkdown) and is_changed(source.date)]
+
+
 def uniform_publish_date(publish_date: datetime | None) -> datetime | None:
     """Uniform the publish date to UTC."""
     if publish_date is None:
@@ -572,12 +978,120 @@ def uniform_publish_date(publish_date: datetime | None) -> datetime | None:
     return publish_date.astimezone(timezone.utc)
 
 
+def _parse_date_upper_bound(value: str) -> datetime | None:
+    """Parse a date string, moving date-only values to the end of their day. Returns None for values without a day,
+    like "2025" or "March 2025", which the parser would otherwise complete with today's day and month."""
+    value = value.strip()
+    try:
+        # Parts missing from the value are taken from the default, so those that differ between two defaults are missing
+        parsed = date_parser.parse(value, default=datetime(2000, 1, 1))
+        control = date_parser.parse(value, default=datetime(2001, 2, 2, 1, 1))
+    except (ValueError, OverflowError):
+        return None
+    if parsed.date() != control.date():
+        return None
+    if parsed.time() != control.time():  # Date only, e.g. 2025-03-14
+        parsed += timedelta(days=1)
+    return uniform_publish_date(parsed)
+
+
+def _own_json_ld_date_published(url: str, html_content: str) -> str | None:
+    """The datePublished of the page's own article in its JSON-LD, rather than of an article it links to.
+
+    That is the article whose URL or @id is the page's, or else the only article on the page. Returns None if there is
+    no such article, or if it isn't clear which one it is.
+    """
+    articles = json_ld_articles(html_content)
+    page_url = canonical_url(url)
+
+    def is_own(article: dict) -> bool:
+        main_entity = article.get("mainEntityOfPage")
+        references = [article.get("url"), article.get("@id"), main_entity]
+        if isinstance(main_entity, dict):
+            references += [main_entity.get("@id"), main_entity.get("url")]
+        # @ids are often the page's URL with a fragment, like "https://example.com/article#article"
+        return any(isinstance(ref, str) and canonical_url(urljoin(url, ref)) == page_url for ref in references)
+
+    own = [article for article in articles if is_own(article)] or (articles if len(articles) == 1 else [])
+    dates = {article["datePublished"] for article in own if isinstance(article.get("datePublished"), str)}
+    return dates.pop() if len(dates) == 1 else None
+
+
+def estimate_publish_date(url: str, html_content: str, headers: dict[str, str] | None = None) -> datetime | None:
+    """Cheaply estimate the latest time at which an article can have been published, without parsing its HTML.
+
+    Checks, in order: the `datePublished` of the page's own JSON-LD article, publish date <meta> / <time> tags, a date
+    in the URL path and the Last-Modified header. Returns None if none of them yields a full date.
+    """
+    if (value := _own_json_ld_date_published(url, html_content)) and (date := _parse_date_upper_bound(value)):
+        return date
+
+    head_end = html_content.find("</head>")
+    for tag in DATE_TAG_PATTERN.findall(html_content if head_end == -1 else html_content[:head_end]):
+        attributes = {key.lower(): value for key, value in TAG_ATTRIBUTE_PATTERN.findall(tag)}
+        name = (attributes.get("property") or attributes.get("name") or attributes.get("itemprop") or "").lower()
+        value = attributes.get("content") or attributes.get("datetime")
+        if name in PUBLISH_DATE_TAG_NAMES and value and (date := _parse_date_upper_bound(value)):
+            return date
+
+    path = urlparse(url).path
+    if match := URL_DAY_PATTERN.search(path):
+        year, month, day = map(int, match.groups())
+        try:
+            return datetime(year, month, day, tzinfo=timezone.utc) + timedelta(days=1)
+        except ValueError:
+            pass
+    if match := URL_MONTH_PATTERN.search(path):
+        year, month = map(int, match.groups())
+        return datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+
+    # A page that has not been modified since some point in time cannot have been published after it
+    if headers and (last_modified := headers.get("last-modified")):
+        try:
+            return uniform_publish_date(date_parser.parse(last_modified))
+        except (ValueError, OverflowError):
+            pass
+
+    return None
+
+
+async def parse_article(response: FetchResult, logger: "Logger") -> ParsedArticle:
+    """Parse a downloaded article with newspaper and convert its main content to markdown.
+
+    Blocks that were seen on enough other pages of the domain are removed as boilerplate, and the blocks of this page
+    are counted towards what is learned about the domain. The main content container is looked up where it was on the
+    domain's previous pages before searching the whole page for it.
+    """
+    domain = domain_of(response.url)
+    try:
+        await load_domain_boilerplate(domain)
+    except Exception as e:
+        logger.warning("Failed to load boilerplate of {domain}: <red>{e}</red>", domain=domain, e=e)
+        boilerplate_store.load(domain, None)
+
+    boilerplate = boilerplate_store.get(domain)
+    async with download_slots:
+        parsed = await run_in_process(
+            parse_article_html, response.url, response.text, boilerplate.fingerprints(), boilerplate.content_path
+        )
+    for message in parsed.log_messages:
+        logger.info(message)
+    boilerplate_store.record_page(domain, response.url, parsed.block_fingerprints)
+    if parsed.content_path:
+        boilerplate_store.record_content_path(domain, parsed.content_path)
+    return parsed
+
+
 async def download_and_parse_article(
     url: str,
     date_according_to_calling_func: datetime = None,
     prefer_own_publish_date: bool = True,
     degrees_of_separation: int = 0,
     logger: "Logger" = None,
+    prefetched: FetchResult | None = None,
+    not_before: datetime | None = None,
+    deadline: Deadline | None = None,
+    retry_later: set[str] | None = None,
 ) -> WebSourceWithMarkdown | None:
     """Download and parse an article from a URL, returning a WebSource object.
 
@@ -586,15 +1100,57 @@ async def download_and_parse_article(
         publish_date: The publish date if known, otherwise will use article's date
         prefer_own_publish_date: Whether to prefer the article's publish date over the provided date
         degrees_of_separation: How many degrees away from original source
+        prefetched: The already downloaded response for the URL, if any
+        not_before: If given, articles that are cheaply recognizable as older than this are skipped before parsing
+        deadline: The budget of the scraping run. Once it is used up, the article is skipped
+        retry_later: If given, the URL is added to it if the article was skipped for a reason that may pass, like a
+            timeout, a server error, an unavailable domain or the run budget
 
     Returns:
         WebSource object or None if parsing failed
     """
-    await asyncio.sleep(1)
+    not_before = uniform_publish_date(not_before)
+    deadline = deadline or Deadline(None)
     try:
-        article = Article(url, memoize_articles=False, disable_category_cache=True)
-        await asyncio.to_thread(article.download)
-        await asyncio.to_thread(article.parse)
+        if deadline.should_shed():
+            logger.info("⏱️ Scraping run budget exhausted, not downloading article {url}.", url=url)
+            if retry_later is not None:
+                retry_later.add(url)
+            return None
+
+        # If the calling function's date is the one that will be used, outdated articles need not even be downloaded
+        if not_before and date_according_to_calling_func and not prefer_own_publish_date:
+            if uniform_publish_date(date_according_to_calling_func) < not_before:
+                logger.info(
+                    "❌ Article {url} has date <yellow>{date}</yellow> according to calling function, which is older than <yellow>{not_before}</yellow>. Skipping.",
+                    url=url,
+                    date=date_according_to_calling_func,
+                    not_before=not_before,
+                )
+                return None
+
+        if prefetched is not None:
+            response = prefetched
+        else:
+            async with download_slots:
+                response = await deadline.run(
+                    fetch(url, max_bytes=MAX_ARTICLE_DOWNLOAD_BYTES, content_types=HTML_CONTENT_TYPES)
+                )
+
+        # Most articles linked from listing pages are old, so reject them before the expensive parsing if possible
+        if not_before and (prefer_own_publish_date or not date_according_to_calling_func):
+            estimated_date = estimate_publish_date(response.url, response.text, response.headers)
+            if estimated_date and estimated_date < not_before:
+                logger.info(
+                    "❌ Article {url} was published before <yellow>{estimated_date}</yellow>, which is older than <yellow>{not_before}</yellow>. Skipping without parsing.",
+                    url=url,
+                    estimated_date=estimated_date,
+                    not_before=not_before,
+                )
+                return None
+
+        # Concurrent scraping jobs requesting the same article share a single parse
+        article = await deadline.run(parse_flight.do(response.url, lambda: parse_article(response, logger)))
 
         date_according_to_article = uniform_publish_date(article.publish_date)
         date_according_to_calling_func = uniform_publish_date(date_according_to_calling_func)
@@ -610,21 +1166,42 @@ async def download_and_parse_article(
             logger.info("❌ Could not determine date for article {url}. Skipping.", url=url)
             return None
 
-        input = choose_input_for_markdownify(article.article_html, article.html, logger)
-        if input is None:
+        # Event pages with structured data are often too short to pass as articles, but need no markdown anyway
+        if article.markdown is None and not article.structured_events:
             logger.info("❌ Could not determine input for markdownify. Skipping.", url=url)
             return None
 
-        markdown = markdownify(input)
+        if article.structured_events:
+            log += f" Found <yellow>{len(article.structured_events)}</yellow> events in structured data."
         logger.info(log)
 
         return WebSourceWithMarkdown(
             url=article.url,
             date=date_to_use,
             title=article.title,
-            markdown=markdown,
+            markdown=article.markdown or "",
             degrees_of_separation=degrees_of_separation,
+            structured_events=article.structured_events,
         )
+    except DeadlineExceeded:
+        logger.info("⏱️ Scraping run budget exhausted while processing article {url}. Skipping.", url=url)
+        if retry_later is not None:
+            retry_later.add(url)
+        return None
+    except FetchError as e:
+        logger.info("❌ Not downloading article {url}: <yellow>{e}</yellow>. Skipping.", url=url, e=e)
+        if retry_later is not None and is_transient_failure(e):
+            retry_later.add(url)
+        return None
     except Exception as e:
         logger.error("Error downloading or parsing article {url}: <red>{e}</red>", url=url, e=e)
+        if retry_later is not None and is_transient_failure(e):
+            retry_later.add(url)
         return None
+
+
+def is_transient_failure(error: BaseException) -> bool:
+    """Whether an article that failed to download may well succeed during a later run."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status in BACKOFF_STATUSES
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientError, DomainUnavailableError))
@@ -3,10 +3,9 @@ import ctypes
 import datetime
 import gc
 import json
-from collections import defaultdict
+import math
 from datetime import timedelta, timezone
 from pprint import pprint
-from urllib.parse import urlparse
 
 from langchain_core.messages import HumanMessage
 from langchain_openai import OpenAIEmbeddings
@@ -24,7 +23,7 @@ from sqlalchemy.orm import QueryableAttribute, defer, joinedload, selectinload
 
 from app.api.v1.sse import sse_broadcaster
 from app.core.config import settings
-from app.core.enums import ScrapingSourceEnum
+from app.core.enums import EventProvenanceEnum, ScrapeOutcomeEnum, ScrapingSourceEnum
 from app.database import get_db_session
 from app.models import ScrapingSourceDB, TopicDB, UserDB
 from app.models.event import EventDB
@@ -35,20 +34,34 @@ from app.schemas.event import EventResponse
 from app.schemas.scraping_source import ScrapingSourceResponse
 from app.schemas.topic import TopicBase
 
+from .date_mentions import select_date_passages
+from .deadline import Deadline, DeadlineExceeded
 from .llm_service import LlmService
+from .markdown_compaction import compact_markdown, count_tokens
+from .process_pool import run_in_process
 from .scraping_config import EVENT_MERGE_SYSTEM_TEMPLATE
 from .scraping_models import (
+    ApiCursor,
     EventMergeResponse,
     ExtractedEvent,
     ExtractedEventBase,
+    ListingDiscovery,
     ScrapingSourceWorkflow,
     ScrapingState,
+    TopicWorkflow,
     WebSourceBase,
     WebSourceWithMarkdown,
     WebSourceWithMetadata,
 )
 from .scraping_utils import (
     download_and_parse_article,
+    fetch_scraping_source_document,
+    load_domain_health,
+    map_bounded,
+    persist_domain_boilerplate,
+    persist_domain_health,
+    record_listing_discovery,
+    source_concurrency,
     web_sources_from_scraping_source,
 )
 
@@ -57,16 +70,71 @@ POSSIBLY_SAME_EVENT_THRESHOLD = 0.55
 CONSIDER_NEW_DATE_TRUE_THRESHOLD = 3
 CONSIDER_NEW_DURATION_TRUE_THRESHOLD = 3
 CONSIDER_NEW_LOCATION_TRUE_THRESHOLD = 3
+LLM_TIMEOUT_SECONDS = 180
+EMBEDDING_TIMEOUT_SECONDS = 60
 
 
 class Scraper:
-    # Class-level domain semaphores for rate limiting
-    domain_semaphores = defaultdict(lambda: asyncio.Semaphore(2))  # 2 concurrent requests per domain
-
     def __init__(self, source_id):
         self.sources = []
         self.scraping_source_id = source_id
         self.logger = logger.bind(source_id=source_id)
+        self.source_document = None  # Conditionally fetched feed / listing page / article behind the scraping source
+        self.listing_discovery = ListingDiscovery()
+        self.api_cursor = ApiCursor()
+        # Budget for the whole run. Extraction stops early enough to leave time for committing what was found
+        self.deadline = Deadline(settings.SCRAPING_RUN_BUDGET_SECONDS)
+        self.extraction_deadline = self.deadline.reserve(settings.SCRAPING_COMMIT_RESERVE_SECONDS)
+        # Prompt tokens of page markdown per extraction stage, of the full pages and as sent after compaction
+        self.markdown_tokens: dict[str, list[int]] = {"source_extraction": [0, 0], "event_extraction": [0, 0]}
+        self.topic_vector: list[float] | None = None  # Embedding of the topic, to check structured events against
+
+    def compact_for_prompt(self, stage: str, markdown: str | None, keep_links: bool) -> str | None:
+        """Compact page markdown before it goes into an LLM prompt, counting the tokens of both versions per stage."""
+        compacted = compact_markdown(markdown, keep_links=keep_links)
+        self.markdown_tokens[stage][0] += count_tokens(markdown)
+        self.markdown_tokens[stage][1] += count_tokens(compacted)
+        return compacted
+
+    async def markdown_for_event_extraction(
+        self, source: WebSourceWithMarkdown, language_code: str | None, current: int, total: int
+    ) -> str | None:
+        """The source's markdown as it goes into the event extraction prompt, or None if it need not be sent at all.
+
+        Unless SCRAPING_DATE_PREFILTER is off, only the paragraphs that mention dates are sent, and pages that mention
+        no date after their publish date are skipped, as they are unlikely to announce an upcoming event.
+        """
+        if not settings.SCRAPING_DATE_PREFILTER:
+            return self.compact_for_prompt("event_extraction", source.markdown, keep_links=False)
+
+        passages = await self.extraction_deadline.run(
+            run_in_process(select_date_passages, source.markdown, language_code, source.date)
+        )
+        compacted = compact_markdown(passages.markdown, keep_links=False) if passages.upcoming else None
+        markdown_tokens, compacted_tokens = count_tokens(source.markdown), count_tokens(compacted)
+        self.markdown_tokens["event_extraction"][0] += markdown_tokens
+        self.markdown_tokens["event_extraction"][1] += compacted_tokens
+
+        if compacted is None:
+            self.logger.info(
+                "❌ No upcoming dates mentioned in source <yellow>{current}</yellow>/<cyan>{total}</cyan>, skipping LLM and <yellow>{tokens}</yellow> tokens: {url}",
+                current=current,
+                total=total,
+                tokens=markdown_tokens,
+                url=source.url,
+            )
+        else:
+            self.logger.info(
+                "Sending <yellow>{kept}</yellow> of <yellow>{paragraphs}</yellow> paragraphs of source <yellow>{current}</yellow>/<cyan>{total}</cyan> around date mentions, <yellow>{compacted}</yellow> of <yellow>{tokens}</yellow> tokens: {url}",
+                kept=passages.kept,
+                paragraphs=passages.paragraphs,
+                current=current,
+                total=total,
+                compacted=compacted_tokens,
+                tokens=markdown_tokens,
+                url=source.url,
+            )
+        return compacted
 
     async def calculate_evidence_score(self, evidence_list: list[ExtractedEventDB]) -> float:
         """Calculate weighted score for a list of evidence based on recency."""
@@ -234,7 +302,9 @@ class Scraper:
             title_2=extracted_event_db.title,
             description_2=extracted_event_db.description,
         )
-        response = await self.llm_service.event_merging_llm.ainvoke([merge_message])
+        response = await self.deadline.run(
+            self.llm_service.event_merging_llm.ainvoke([merge_message]), timeout=LLM_TIMEOUT_SECONDS
+        )
         parsed_response: EventMergeResponse = response["parsed"]
 
         return parsed_response
@@ -304,7 +374,9 @@ class Scraper:
                 await db.flush()
 
                 semantic_content = f"{extracted_event.title}\n{extracted_event.description or ''}".strip()
-                semantic_vector = await self.embeddings.aembed_query(semantic_content)
+                semantic_vector = await self.deadline.run(
+                    self.embeddings.aembed_query(semantic_content), timeout=EMBEDDING_TIMEOUT_SECONDS
+                )
 
                 extracted_event_db.semantic_vector = semantic_vector
 
@@ -443,12 +515,6 @@ class Scraper:
                     ),
                 )
 
-    async def domain_limited_download(self, url, *args, **kwargs):
-        """Download article with domain-based rate limiting."""
-        domain = urlparse(url).netloc
-        async with self.domain_semaphores[domain]:
-            return await download_and_parse_article(url, *args, **kwargs)
-
     async def extract_sources_from_single_source(
         self, data: dict[str, WebSourceWithMarkdown | ScrapingState | int | int]
     ) -> dict[str, list[WebSourceWithMarkdown] | list]:
@@ -462,6 +528,14 @@ class Scraper:
             total: int = data["total"]
 
             source._visited = True
+            if self.extraction_deadline.should_shed():
+                self.logger.info(
+                    "⏱️ Scraping run budget exhausted, not expanding source <yellow>{current}</yellow>/<cyan>{total}</cyan>: {url}",
+                    current=current,
+                    total=total,
+                    url=source.url,
+                )
+                return {"sources": []}
 
             source_extraction_system_message = await self.llm_service.get_source_extraction_system_message(
                 topic=state.scraping_source.topic,
@@ -470,9 +544,14 @@ class Scraper:
 
             messages = [
                 source_extraction_system_message,
-                HumanMessage(f"Extract sources from the following webpage: {source.markdown}"),
+                HumanMessage(
+                    "Extract sources from the following webpage: "
+                    + self.compact_for_prompt("source_extraction", source.markdown, keep_links=True)
+                ),
             ]
-            response = await self.llm_service.source_extracting_llm.ainvoke(messages)
+            response = await self.extraction_deadline.run(
+                self.llm_service.source_extracting_llm.ainvoke(messages), timeout=LLM_TIMEOUT_SECONDS
+            )
             extracted_sources: list[WebSourceBase] = response["parsed"].sources
             self.logger.info(
                 f"Found {len(extracted_sources)} URLs to scrape from source {current}/{total}: {source.url}. Scraping them now."
@@ -488,19 +567,20 @@ class Scraper:
             #     )
             #     if new_source and new_source.date >= state.scraping_source.last_scraped_at:
             #         sources.append(new_source)
-            tasks = []
-            for extracted_source in extracted_sources:
-                task = self.domain_limited_download(
+            # Download in parallel, politeness towards each domain is enforced by the shared rate limiter
+            results = await map_bounded(
+                lambda extracted_source: download_and_parse_article(
                     extracted_source.url,
                     date_according_to_calling_func=extracted_source.date,
                     prefer_own_publish_date=True,
                     degrees_of_separation=source.degrees_of_separation + 1,
                     logger=self.logger,
-                )
-                tasks.append(task)
-
-            # Execute all downloads in parallel
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+                    not_before=state.scraping_source.last_scraped_at,
+                    deadline=self.extraction_deadline,
+                ),
+                extracted_sources,
+                source_concurrency(state.scraping_source),
+            )
 
             sources = []
             exceptions, outdated = 0, 0
@@ -526,6 +606,14 @@ class Scraper:
             sources = await self.deduplicate_sources(sources, state.scraping_source)
             return {"sources": sources}
 
+        except DeadlineExceeded:
+            self.logger.info(
+                "⏱️ Scraping run budget exhausted while expanding source <yellow>{current}</yellow>/<cyan>{total}</cyan>: {url}",
+                current=current,
+                total=total,
+                url=source.url,
+            )
+            return {"sources": []}
         except Exception as e:
             self.logger.error(
                 "❌ ERROR in extract_sources_from_single_source for source <yellow>{current}</yellow>/<cyan>{total}</cyan>: {url}: <red>{e}</red>",
@@ -546,17 +634,22 @@ class Scraper:
             )
 
             try:
-                sources = await asyncio.wait_for(
-                    web_sources_from_scraping_source(state.scraping_source, self.logger, self.llm_service),
-                    timeout=600,  # 10 minute timeout
+                sources = await web_sources_from_scraping_source(
+                    state.scraping_source,
+                    self.logger,
+                    self.llm_service,
+                    self.source_document,
+                    self.listing_discovery,
+                    self.extraction_deadline,
+                    self.api_cursor,
                 )
 
                 sources = await self.deduplicate_sources(sources, state.scraping_source)
 
                 return {"sources": sources}
-            except asyncio.TimeoutError:
-                self.logger.error("❌ TIMEOUT: web_sources_from_scraping_source took longer than 5 minutes")
-                raise Exception("Source extraction timed out after 5 minutes")
+            except DeadlineExceeded:
+                self.logger.warning("⏱️ Scraping run budget exhausted during source extraction")
+                return {"sources": []}
             except Exception as e:
                 self.logger.error("❌ ERROR in source extraction: <red>{e}</red>", e=e)
                 raise
@@ -642,7 +735,10 @@ class Scraper:
         eligible_sources = [
             source
             for source in state.sources
-            if source.degrees_of_separation < state.scraping_source.degrees_of_separation and not source._visited
+            # Sources without content, like calendar events, have no links to follow
+            if source.degrees_of_separation < state.scraping_source.degrees_of_separation
+            and not source._visited
+            and source.markdown
         ]
         self.logger.info(
             "State has <yellow>{count}</yellow> sources, of which <yellow>{eligible}</yellow> are eligible for expansion (degrees of separation < {degrees_of_separation})",
@@ -667,6 +763,34 @@ class Scraper:
             self.logger.info("No eligible sources for source extraction, proceeding to event extraction")
             return "prepare_event_extraction"
 
+    async def relevant_structured_events(
+        self, source: WebSourceWithMarkdown, topic: TopicWorkflow
+    ) -> list[ExtractedEventBase]:
+        """The events a source embeds as structured data that are similar enough to the topic to skip the LLM.
+
+        The LLM would decide which events are relevant to the topic, structured data doesn't, so the events are
+        compared to the topic by their embeddings instead. All of them are embedded in a single request, along with
+        the topic the first time.
+        """
+        texts = [f"{event.title}\n{event.description or ''}".strip() for event in source.structured_events]
+        embed_topic = self.topic_vector is None
+        if embed_topic:
+            texts.insert(0, f"{topic.name}\n{topic.description}")
+        event_vectors = await self.extraction_deadline.run(
+            self.embeddings.aembed_documents(texts), timeout=EMBEDDING_TIMEOUT_SECONDS
+        )
+        if embed_topic:
+            self.topic_vector, event_vectors = event_vectors[0], event_vectors[1:]
+        topic_vector = self.topic_vector
+        relevant = []
+        for event, event_vector in zip(source.structured_events, event_vectors):
+            similarity = sum(a * b for a, b in zip(topic_vector, event_vector)) / (
+                math.hypot(*topic_vector) * math.hypot(*event_vector) or 1
+            )
+            if similarity >= settings.SCRAPING_STRUCTURED_EVENT_MIN_TOPIC_SIMILARITY:
+                relevant.append(event)
+        return relevant
+
     async def extract_events_from_single_source(
         self, data: dict[str, WebSourceWithMarkdown | ScrapingState | int | int]
     ):
@@ -676,26 +800,69 @@ class Scraper:
         current: int = data["current"]
         total: int = data["total"]
 
-        event_extraction_message = await self.llm_service.get_event_extraction_system_message(
-            topic=state.scraping_source.topic,
-            language=state.scraping_source.language,
-            publish_date=source.date,
-        )
-
-        messages = [
-            event_extraction_message,
-            HumanMessage(f"Extract events from the following webpage: \n{source.markdown}"),
-        ]
-        try:
-            response = await self.llm_service.event_extracting_llm.ainvoke(messages)
-            events: list[ExtractedEventBase] = response["parsed"].events
+        if self.extraction_deadline.should_shed():
             self.logger.info(
-                "✅ Extracted <yellow>{num}</yellow> events from source <yellow>{current}</yellow>/<cyan>{total}</cyan>: {url}",
-                num=len(events),
+                "⏱️ Scraping run budget exhausted, not extracting events from source <yellow>{current}</yellow>/<cyan>{total}</cyan>: {url}",
                 current=current,
                 total=total,
                 url=source.url,
             )
+            return {"events": []}
+
+        try:
+            # Events embedded as structured data have exact dates and cost no tokens. Only if none of them are
+            # relevant to the topic, the page's text is left to the LLM
+            events: list[ExtractedEventBase] = []
+            if source.structured_events:
+                events = await self.relevant_structured_events(source, state.scraping_source.topic)
+            if events:
+                provenance = EventProvenanceEnum.STRUCTURED_DATA
+                self.logger.info(
+                    "✅ Using <yellow>{num}</yellow> of <yellow>{found}</yellow> events from structured data of source <yellow>{current}</yellow>/<cyan>{total}</cyan>, skipping LLM: {url}",
+                    num=len(events),
+                    found=len(source.structured_events),
+                    current=current,
+                    total=total,
+                    url=source.url,
+                )
+            elif not source.markdown:
+                self.logger.info(
+                    "❌ No relevant events in structured data and no content in source <yellow>{current}</yellow>/<cyan>{total}</cyan>: {url}",
+                    current=current,
+                    total=total,
+                    url=source.url,
+                )
+                return {"events": []}
+            elif (
+                prompt_markdown := await self.markdown_for_event_extraction(
+                    source, state.scraping_source.language_code, current, total
+                )
+            ) is None:
+                # Still recorded as a processed source below, so the page isn't considered again
+                provenance = EventProvenanceEnum.LLM
+            else:
+                provenance = EventProvenanceEnum.LLM
+                event_extraction_message = await self.llm_service.get_event_extraction_system_message(
+                    topic=state.scraping_source.topic,
+                    language=state.scraping_source.language,
+                    publish_date=source.date,
+                )
+
+                messages = [
+                    event_extraction_message,
+                    HumanMessage("Extract events from the following webpage: \n" + prompt_markdown),
+                ]
+                response = await self.extraction_deadline.run(
+                    self.llm_service.event_extracting_llm.ainvoke(messages), timeout=LLM_TIMEOUT_SECONDS
+                )
+                events = response["parsed"].events
+                self.logger.info(
+                    "✅ Extracted <yellow>{num}</yellow> events from source <yellow>{current}</yellow>/<cyan>{total}</cyan>: {url}",
+                    num=len(events),
+                    current=current,
+                    total=total,
+                    url=source.url,
+                )
 
             async with get_db_session() as db:
                 source_db = WebSourceDB(
@@ -708,6 +875,14 @@ class Scraper:
                 await db.flush()
                 await db.commit()
 
+        except DeadlineExceeded:
+            self.logger.info(
+                "⏱️ Scraping run budget exhausted while extracting events from source <yellow>{current}</yellow>/<cyan>{total}</cyan>: {url}",
+                current=current,
+                total=total,
+                url=source.url,
+            )
+            return {"events": []}
         except Exception as e:
             self.logger.error(
                 "❌ ERROR in extract_events_from_single_source for source <yellow>{current}</yellow>/<cyan>{total}</cyan>: {url}: <red>{e}</red>",
@@ -719,7 +894,10 @@ class Scraper:
             return {"events": []}
 
         source_without_markdown = WebSourceWithMetadata.from_web_source_with_markdown(source)
-        events_with_source = [ExtractedEvent(**event.model_dump(), source=source_without_markdown) for event in events]
+        events_with_source = [
+            ExtractedEvent(**event.model_dump(), source=source_without_markdown, provenance=provenance)
+            for event in events
+        ]
         return {"events": events_with_source}
 
     async def prepare_event_extraction(self, state: ScrapingState):
@@ -800,7 +978,43 @@ class Scraper:
 
     async def scrape(self):
         await self._prepare_scraper()
-        await self.graph.ainvoke(self.scraping_state)
+
+        if self.source_document is not None and self.source_document.not_modified:
+            self.logger.info(
+                "✅ Scraping Source <cyan>{id}</cyan> has not changed since the last run (HTTP 304), skipping it",
+                id=self.scraping_source_id,
+            )
+            outcome = ScrapeOutcomeEnum.NOT_MODIFIED
+        else:
+            try:
+                await self.deadline.run(self.graph.ainvoke(self.scraping_state))
+                interrupted = False
+            except DeadlineExceeded:
+                # E.g. while committing events. Those committed until then are kept, the rest is up to the next run
+                interrupted = True
+            for stage, (markdown_tokens, compacted_tokens) in self.markdown_tokens.items():
+                if markdown_tokens:
+                    self.logger.info(
+                        "Page markdown for {stage}: <yellow>{compacted}</yellow> tokens sent, <yellow>{markdown}</yellow> in the full pages",
+                        stage=stage.replace("_", " "),
+                        compacted=compacted_tokens,
+                        markdown=markdown_tokens,
+                    )
+            if interrupted:
+                self.logger.warning(
+                    "⏱️ Scraping run budget of <yellow>{budget}</yellow> seconds exceeded, run interrupted with partial results",
+                    budget=settings.SCRAPING_RUN_BUDGET_SECONDS,
+                )
+                outcome = ScrapeOutcomeEnum.PARTIAL
+            elif self.extraction_deadline.shed:
+                self.logger.warning(
+                    "⏱️ Scraping run budget of <yellow>{budget}</yellow> seconds exhausted, committed partial results",
+                    budget=settings.SCRAPING_RUN_BUDGET_SECONDS,
+                )
+                outcome = ScrapeOutcomeEnum.PARTIAL
+            else:
+                await record_listing_discovery(self.scraping_source_id, self.listing_discovery)
+                outcome = ScrapeOutcomeEnum.COMPLETED
 
         async with get_db_session() as db:
             scraping_source: ScrapingSourceDB = (
@@ -815,8 +1029,19 @@ class Scraper:
                 .one_or_none()
             )
 
-            scraping_source.last_scraped_at = datetime.datetime.now(timezone.utc)
+            # A partial run skipped items published since the last run, so the next run has to look back as far again
+            if outcome != ScrapeOutcomeEnum.PARTIAL:
+                scraping_source.last_scraped_at = datetime.datetime.now(timezone.utc)
             scraping_source.currently_scraping = False
+            scraping_source.last_scrape_outcome = outcome
+            # Only remember the validators once the document has been fully processed, so failed runs get retried
+            if outcome == ScrapeOutcomeEnum.COMPLETED and self.source_document is not None:
+                scraping_source.http_etag = self.source_document.headers.get("etag")
+                scraping_source.http_last_modified = self.source_document.headers.get("last-modified")
+            if outcome == ScrapeOutcomeEnum.COMPLETED and self.listing_discovery.links_hash is not None:
+                scraping_source.listing_links_hash = self.listing_discovery.links_hash
+            if outcome == ScrapeOutcomeEnum.COMPLETED and self.api_cursor.latest is not None:
+                scraping_source.api_cursor = self.api_cursor.latest
             db.add(scraping_source)
             await db.commit()
             await db.refresh(scraping_source)
@@ -892,6 +1117,20 @@ class Scraper:
             self.user_id = current_user.id
 
         scraping_source_workflow = ScrapingSourceWorkflow.model_validate(scraping_source, from_attributes=True)
+        self.listing_discovery = ListingDiscovery(previous_links_hash=scraping_source.listing_links_hash)
+        self.api_cursor = ApiCursor(previous=scraping_source.api_cursor)
+
+        # Pick up domains that earlier runs (or other workers) found to be throttling us
+        await load_domain_health()
+
+        # Short-circuit before building the workflow if the source document has not changed since the last run
+        self.source_document = await self.extraction_deadline.run(
+            fetch_scraping_source_document(
+                scraping_source_workflow, scraping_source.http_etag, scraping_source.http_last_modified
+            )
+        )
+        if self.source_document is not None and self.source_document.not_modified:
+            return
 
         # Initialize LLM service
         self.llm_service = LlmService(is_demo_user=is_demo_user)
@@ -988,6 +1227,7 @@ class Scraper:
                 scraping_source.last_scraped_at = datetime.datetime.now(timezone.utc)
                 scraping_source.currently_scraping = False
                 scraping_source.last_error = str(e)
+                scraping_source.last_scrape_outcome = ScrapeOutcomeEnum.FAILED
                 db.add(scraping_source)
                 await db.commit()
                 await db.refresh(scraping_source)
@@ -1010,6 +1250,15 @@ class Scraper:
             raise  # so apscheduler logs the failure
 
         finally:
+            try:
+                await persist_domain_health()
+            except Exception as e:
+                logger.warning("Failed to persist domain health: <red>{e}</red>", e=e)
+            try:
+                await persist_domain_boilerplate()
+            except Exception as e:
+                logger.warning("Failed to persist domain boilerplate: <red>{e}</red>", e=e)
+
             # Testing gc.collect / malloc_trim here to see if it helps with memory not being freed after scraping jobs.
             gc.collect()
             try:
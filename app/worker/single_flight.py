@@ -0,0 +1,29 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent calls with the same key into a single in-flight call whose result all callers share.
+
+    Nothing is cached once the call has completed, later calls with the same key start a new one. The shared call runs
+    as its own task, so a caller being cancelled (e.g. by a timeout) does not cancel it for the other callers.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Task[T]] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[T]):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # Mark the exception as retrieved even if all callers are gone
@@ -0,0 +1,296 @@
+import html
+import json
+import re
+from datetime import date, datetime, time, timedelta, timezone
+
+from bs4 import BeautifulSoup, Tag
+from pydantic import TypeAdapter, ValidationError
+
+from .scraping_models import ExtractedEventBase
+
+# schema.org/Event and its subtypes
+EVENT_TYPES = frozenset(
+    {
+        "Event",
+        "BusinessEvent",
+        "ChildrensEvent",
+        "ComedyEvent",
+        "CourseInstance",
+        "DanceEvent",
+        "DeliveryEvent",
+        "EducationEvent",
+        "EventSeries",
+        "ExhibitionEvent",
+        "Festival",
+        "FoodEvent",
+        "Hackathon",
+        "LiteraryEvent",
+        "MusicEvent",
+        "PublicationEvent",
+        "BroadcastEvent",
+        "OnDemandEvent",
+        "SaleEvent",
+        "ScreeningEvent",
+        "SocialEvent",
+        "SportsEvent",
+        "TheaterEvent",
+        "VisualArtsEvent",
+    }
+)
+# schema.org/Article and the subtypes news sites use for their articles
+ARTICLE_TYPES = frozenset(
+    {
+        "Article",
+        "NewsArticle",
+        "AnalysisNewsArticle",
+        "BackgroundNewsArticle",
+        "OpinionNewsArticle",
+        "ReportageNewsArticle",
+        "ReviewNewsArticle",
+        "BlogPosting",
+        "LiveBlogPosting",
+        "Report",
+    }
+)
+MICRODATA_TYPE_PATTERN = re.compile(r"schema\.org/(\w+)")
+JSON_LD_SCRIPT_PATTERN = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']application/ld\+json[\"'][^>]*>(.*?)</script>", re.IGNORECASE | re.DOTALL
+)
+
+# Structured data says nothing about an event's importance, which the LLM would otherwise judge
+STRUCTURED_EVENT_SIGNIFICANCE = 0.5
+MAX_DESCRIPTION_WORDS = 200
+MAX_TITLE_LENGTH = 500
+MAX_LOCATION_LENGTH = 300
+
+duration_adapter = TypeAdapter(timedelta)
+
+
+def extract_structured_events(soup: BeautifulSoup) -> list[ExtractedEventBase]:
+    """Events embedded in a page as schema.org JSON-LD or microdata, which have exact dates and need no LLM.
+
+    Only events with a name and a valid start date are returned. Cancelled events are left out.
+    """
+    events = {}
+    for item in [*_json_ld_items(soup), *_microdata_items(soup)]:
+        event = event_from_item(item)
+        # Pages often carry the same event both as JSON-LD and as microdata
+        if event is not None:
+            events.setdefault((event.title, event.date), event)
+    return list(events.values())
+
+
+def truncate_description(description: str) -> str:
+    """Cut a description down to the length the LLM is asked to write."""
+    words = description.split()
+    if len(words) > MAX_DESCRIPTION_WORDS:
+        return " ".join(words[:MAX_DESCRIPTION_WORDS]) + " …"
+    return description
+
+
+def json_ld_articles(html_content: str) -> list[dict]:
+    """The article objects of a page's JSON-LD, found without parsing the page's HTML."""
+    articles = []
+    for script in JSON_LD_SCRIPT_PATTERN.findall(html_content):
+        try:
+            data = json.loads(script, strict=False)
+        except ValueError:
+            continue
+        articles.extend(_walk_json_ld(data, ARTICLE_TYPES))
+    return articles
+
+
+def _schema_types(item: dict) -> list[str]:
+    """The item's schema.org types without prefix, e.g. "schema:MusicEvent" -> "MusicEvent"."""
+    types = item.get("@type")
+    types = [types] if isinstance(types, str) else types if isinstance(types, list) else []
+    return [re.split(r"[/:#]", t)[-1] for t in types if isinstance(t, str)]
+
+
+def _schema_type(item: dict) -> str | None:
+    """The item's schema.org type, preferring event types."""
+    names = _schema_types(item)
+    return next((name for name in names if name in EVENT_TYPES), names[0] if names else None)
+
+
+def _json_ld_items(soup: BeautifulSoup):
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.get_text(), strict=False)
+        except ValueError:
+            continue
+        yield from _walk_json_ld(data, EVENT_TYPES)
+
+
+def _walk_json_ld(data, types: frozenset[str]):
+    """All objects of the given types in a JSON-LD document, including those nested in @graph, other objects or
+    sub-events."""
+    if isinstance(data, list):
+        for value in data:
+            yield from _walk_json_ld(value, types)
+    elif isinstance(data, dict):
+        if not types.isdisjoint(_schema_types(data)):
+            yield data
+        for value in data.values():
+            if isinstance(value, (list, dict)):
+                yield from _walk_json_ld(value, types)
+
+
+def _microdata_items(soup: BeautifulSoup):
+    for element in soup.find_all(itemscope=True, itemtype=MICRODATA_TYPE_PATTERN):
+        match = MICRODATA_TYPE_PATTERN.search(element["itemtype"])
+        if match.group(1) in EVENT_TYPES:
+            yield _microdata_item(element)
+
+
+def _microdata_item(element: Tag) -> dict:
+    """The properties of a microdata item as a JSON-LD-like dict."""
+    match = MICRODATA_TYPE_PATTERN.search(element.get("itemtype", ""))
+    item = {"@type": match.group(1) if match else None}
+    for prop in element.find_all(itemprop=True):
+        # Properties of nested items belong to those
+        if prop.find_parent(itemscope=True) is not element:
+            continue
+        value = _microdata_item(prop) if prop.has_attr("itemscope") else _microdata_value(prop)
+        for name in prop["itemprop"].split():
+            item.setdefault(name, value)
+    return item
+
+
+def _microdata_value(prop: Tag) -> str:
+    if prop.has_attr("content"):
+        return prop["content"]
+    if prop.name == "time" and prop.has_attr("datetime"):
+        return prop["datetime"]
+    if prop.name in ("a", "link") and prop.has_attr("href"):
+        return prop["href"]
+    if prop.name in ("data", "meter") and prop.has_attr("value"):
+        return prop["value"]
+    return prop.get_text(" ", strip=True)
+
+
+def _text(value) -> str | None:
+    """Plain text of a property, which may be a string, a list of values or an object with a name."""
+    if isinstance(value, list):
+        return next((text for text in map(_text, value) if text), None)
+    if isinstance(value, dict):
+        return _text(value.get("name") or value.get("@value"))
+    if not isinstance(value, str):
+        return None
+    text = html.unescape(value)
+    if "<" in text:
+        text = BeautifulSoup(text, "html.parser").get_text(" ")
+    return " ".join(text.split()) or None
+
+
+def _parse_date(value) -> datetime | date | None:
+    text = _text(value)
+    if not text:
+        return None
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    # A date without a time stays a date, like the LLM is asked to return it
+    return parsed.date() if "T" not in text and " " not in text else parsed
+
+
+def _parse_duration(value, start: datetime | date, end: datetime | date | None) -> timedelta | None:
+    text = _text(value)
+    if text:
+        try:
+            return duration_adapter.validate_python(text) or None
+        except ValidationError:
+            pass
+    if end is None:
+        return None
+    # If only one of them is a date, it covers its whole day, so an event ending on the 3rd ends at midnight after it
+    if isinstance(start, datetime) and not isinstance(end, datetime):
+        end = datetime.combine(end + timedelta(days=1), time.min, start.tzinfo)
+    elif isinstance(end, datetime) and not isinstance(start, datetime):
+        start = datetime.combine(start, time.min, end.tzinfo)
+    if isinstance(start, datetime):
+        if (start.tzinfo is None) != (end.tzinfo is None):
+            return None
+        return end - start if end > start else None
+    # Dates are inclusive, so an event from the 1st to the 3rd lasts three days
+    return end - start + timedelta(days=1) if end >= start else None
+
+
+def _is_over(start: datetime | date, duration: timedelta | None, now: datetime) -> bool:
+    if isinstance(start, datetime):
+        start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+        return start + (duration or timedelta(0)) < now
+    # An event on a date lasts until the end of that day
+    return start + (duration or timedelta(days=1)) <= now.date()
+
+
+def _location(value) -> tuple[str | None, str | None]:
+    """Human-readable location and ISO country code of a schema.org Place, PostalAddress or VirtualLocation."""
+    if isinstance(value, list):
+        locations = [_location(v) for v in value]
+        return next((location for location in locations if location[0]), (None, None))
+    if isinstance(value, str):
+        return _text(value), None
+    if not isinstance(value, dict):
+        return None, None
+    if _schema_type(value) == "VirtualLocation":
+        return "Online", None
+
+    address = value.get("address", value)
+    country = None
+    parts = [_text(value.get("name"))]
+    if isinstance(address, dict):
+        country = _text(address.get("addressCountry"))
+        parts += [
+            _text(address.get(key)) for key in ("streetAddress", "postalCode", "addressLocality", "addressRegion")
+        ]
+    else:
+        parts.append(_text(address))
+    parts = list(dict.fromkeys(part for part in parts if part))
+    country_code = country.upper() if country and len(country) == 2 and country.isalpha() else None
+    return (", ".join(parts)[:MAX_LOCATION_LENGTH] or None), country_code
+
+
+def event_from_item(item: dict) -> ExtractedEventBase | None:
+    """An event from a dict of schema.org Event properties, or None if it has no name or valid start date, is
+    cancelled or already over."""
+    title = _text(item.get("name"))
+    start = _parse_date(item.get("startDate"))
+    if not title or start is None:
+        return None
+
+    status = _text(item.get("eventStatus")) or ""
+    if status.endswith("EventCancelled"):
+        return None
+
+    duration = _parse_duration(item.get("duration"), start, _parse_date(item.get("endDate")))
+    if _is_over(start, duration, datetime.now(timezone.utc)):
+        return None
+
+    location, country_code = _location(item.get("location"))
+    attendance_mode = _text(item.get("eventAttendanceMode")) or ""
+    if location is None and attendance_mode.endswith("OnlineEventAttendanceMode"):
+        location = "Online"
+
+    description = truncate_description(_text(item.get("description")) or title)
+
+    additional_infos = {
+        "Status": status.rsplit("/", 1)[-1] if status and not status.endswith("EventScheduled") else None,
+        "Organizer": _text(item.get("organizer")),
+        "Event page": _text(item.get("url")),
+        "Tickets": _text(item.get("offers", {}).get("url")) if isinstance(item.get("offers"), dict) else None,
+    }
+    additional_infos = {key: value for key, value in additional_infos.items() if value}
+
+    return ExtractedEventBase(
+        title=title[:MAX_TITLE_LENGTH],
+        description=description,
+        date=start,
+        snippet=title[:MAX_TITLE_LENGTH],  # The event's name is the part of it most likely to be visible on the page
+        country_code=country_code,
+        location=location,
+        significance=STRUCTURED_EVENT_SIGNIFICANCE,
+        duration=duration,
+        additional_infos=additional_infos or None,
+    )
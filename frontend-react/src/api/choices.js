@@ -36,7 +36,9 @@ export function fetchSourceTypeOptions() {
   return [
     { value: "Webpage", label: "Webpage", disabled: false },
     { value: "Rss", label: "Rss", disabled: false },
-    { value: "Api", label: "Api (Coming Soon)", disabled: true },
+    { value: "Sitemap", label: "Sitemap", disabled: false },
+    { value: "Calendar", label: "Calendar (iCal)", disabled: false },
+    { value: "Api", label: "Api (JSON)", disabled: false },
   ];
 }
 
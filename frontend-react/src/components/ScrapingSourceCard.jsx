@@ -8,6 +8,8 @@ import {
 } from "@mui/material";
 import PublicIcon from "@mui/icons-material/Public";
 import RssFeedIcon from "@mui/icons-material/RssFeed";
+import AccountTreeIcon from "@mui/icons-material/AccountTree";
+import EventIcon from "@mui/icons-material/Event";
 import ApiIcon from "@mui/icons-material/Api";
 import LinkIcon from "@mui/icons-material/Link";
 import EditIcon from "@mui/icons-material/Edit";
@@ -35,6 +37,10 @@ export default function ScrapingSourceCard({ source, onEdit, onDelete }) {
       <PublicIcon fontSize="small" />
     ) : source.source_type === "Rss" ? (
       <RssFeedIcon fontSize="small" />
+    ) : source.source_type === "Sitemap" ? (
+      <AccountTreeIcon fontSize="small" />
+    ) : source.source_type === "Calendar" ? (
+      <EventIcon fontSize="small" />
     ) : source.source_type === "Api" ? (
       <ApiIcon fontSize="small" />
     ) : (
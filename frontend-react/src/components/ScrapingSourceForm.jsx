@@ -38,9 +38,9 @@ import FieldWithTooltip from "./FieldWithTooltip";
 const tooltips = {
   name: "Source name, e.g. 'Presseschau der LTO', 'Politikressort der F.A.Z.', 'Pressemitteilungen des Bundesgerichtshofs'",
   base_url:
-    "Webpage or RSS feed URL that will contain the news, e.g. https://www.bundesgerichtshof.de/DE/Presse/Pressemitteilungen/pressemitteilungen_node.html, https://www.lto.de/presseschau-rss/rss/feed.xml",
+    "Webpage, RSS feed, sitemap, iCalendar (.ics) or JSON Api URL that will contain the news, e.g. https://www.bundesgerichtshof.de/DE/Presse/Pressemitteilungen/pressemitteilungen_node.html, https://www.lto.de/presseschau-rss/rss/feed.xml",
   source_type:
-    "Whether the base url you provided points to a web page like https://www.lto.de/recht/presseschau or a Rss feed like https://www.lto.de/presseschau-rss/rss/feed.xml or a REST Api (coming soon)",
+    "Whether the base url you provided points to a web page like https://www.lto.de/recht/presseschau or a Rss feed like https://www.lto.de/presseschau-rss/rss/feed.xml or a sitemap like https://www.lto.de/sitemap.xml or a calendar feed (.ics) of hearings or sessions or the endpoint of a JSON Api, whose pagination and field mapping are set in the source's scraping config",
   country:
     'The country where this feed resides, e.g. "United States" for the New York Times, or "Germany" for the F.A.Z.',
   language:
@@ -0,0 +1,71 @@
+"""Compare compute_subtree_metrics with the per-node computation it replaced, for correctness and speed.
+
+Usage: python -m tests.benchmark_subtree_metrics [--repeat N] [--rounds N] [page.html ...]
+
+Runs on the test fixtures unless pages are given. With --repeat, each page's body is repeated N times, to show how
+both computations scale with the size of the DOM. Times are the best of --rounds runs.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from app.worker.html_document import HtmlDocument
+from app.worker.html_parsing import compute_subtree_metrics, find_leaf_text_elements
+
+from .per_node_metrics import fixture_paths, per_node_leaf_text_elements, per_node_subtree_metrics
+
+
+def load_page(path: Path, repeat: int) -> str:
+    html = path.read_text(errors="replace")
+    if repeat > 1 and (start := html.find("<body")) >= 0 and (end := html.rfind("</body>")) > start:
+        start = html.index(">", start) + 1
+        html = html[:start] + html[start:end] * repeat + html[end:]
+    return html
+
+
+def timed(func, soup, rounds: int):
+    seconds = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = func(soup)
+        seconds.append(time.perf_counter() - started)
+    return result, min(seconds)
+
+
+def bottom_up(soup):
+    metrics = compute_subtree_metrics(soup)
+    return metrics, find_leaf_text_elements(soup, metrics)
+
+
+def per_node(soup):
+    return per_node_subtree_metrics(soup), per_node_leaf_text_elements(soup)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", type=Path, help="HTML files, the test fixtures by default")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeat each page's body this many times")
+    parser.add_argument("--rounds", type=int, default=3, help="Time each computation this many times")
+    args = parser.parse_args()
+
+    totals = [0.0, 0.0]
+    print(f"{'page':<32} {'elements':>9} {'per-node':>10} {'bottom-up':>10} {'speedup':>8}")
+    for path in args.pages or fixture_paths():
+        soup = HtmlDocument(load_page(path, args.repeat)).soup
+        (expected_metrics, expected_leaves), per_node_seconds = timed(per_node, soup, args.rounds)
+        (metrics, leaves), bottom_up_seconds = timed(bottom_up, soup, args.rounds)
+        if metrics != expected_metrics or leaves != expected_leaves:
+            raise SystemExit(f"{path}: compute_subtree_metrics differs from the per-node computation")
+
+        totals[0] += per_node_seconds
+        totals[1] += bottom_up_seconds
+        print(
+            f"{path.name[:32]:<32} {len(metrics):>9} {per_node_seconds:>9.3f}s {bottom_up_seconds:>9.3f}s "
+            f"{per_node_seconds / bottom_up_seconds:>7.1f}x"
+        )
+    print(f"{'total':<32} {'':>9} {totals[0]:>9.3f}s {totals[1]:>9.3f}s {totals[0] / totals[1]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""The per-node computations that compute_subtree_metrics replaced, as a reference for its results."""
+
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.worker.html_parsing import SubtreeMetrics
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "html"
+
+
+def fixture_paths() -> list[Path]:
+    return sorted(FIXTURE_DIR.glob("*.html"))
+
+
+def per_node_subtree_metrics(soup: BeautifulSoup, measure_markup: bool = True) -> dict[int, SubtreeMetrics]:
+    """Call get_text and str() on every element, which walks its whole subtree again each time."""
+    metrics = {}
+    for element in [soup, *soup.find_all()]:
+        metrics[id(element)] = SubtreeMetrics(
+            len(element.get_text(strip=True)),
+            len(str(element)) if measure_markup else 0,
+            any(descendant.get_text(strip=True) for descendant in element.find_all()),
+        )
+    return metrics
+
+
+def per_node_leaf_text_elements(soup: BeautifulSoup) -> list:
+    """Elements with text whose descendants have none, checking every descendant of every element with text."""
+    leaf_elements = []
+    for element in soup.find_all():
+        if not element.get_text(strip=True):
+            continue
+        if not any(descendant.get_text(strip=True) for descendant in element.find_all()):
+            leaf_elements.append(element)
+    return leaf_elements
@@ -0,0 +1,59 @@
+import asyncio
+
+from aiohttp import web
+from loguru import logger
+
+from app.core.enums import ScrapingSourceEnum
+from app.worker.http_client import close_http_session
+from app.worker.scraping_models import ApiCursor, ScrapingSourceWorkflow, TopicWorkflow
+from app.worker.scraping_utils import extract_sources_from_api
+
+ARTICLE = "<html><head><title>Artikel</title></head><body><article>{}</article></body></html>".format(
+    "<p>Der Stadtrat hat heute über den Haushalt beraten und einen Beschluss gefasst.</p>" * 30
+)
+
+
+async def read_api(host: str, failing: set[str]) -> ApiCursor:
+    async def api(request):
+        return web.json_response(
+            [{"id": number, "link": f"http://{host}:{port}/articles/{number}"} for number in (1, 2, 3)]
+        )
+
+    async def article(request):
+        if request.match_info["number"] in failing:
+            return web.Response(status=503)
+        return web.Response(text=ARTICLE, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/api", api)
+    app.router.add_get("/articles/{number}", article)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        scraping_source = ScrapingSourceWorkflow(
+            id=1,
+            topic_id=1,
+            base_url=f"http://{host}:{port}/api",
+            source_type=ScrapingSourceEnum.API,
+            scraping_config={"api": {"fields": {"url": "link", "date": None}, "cursor_field": "id"}},
+            topic=TopicWorkflow(id=1, name="Stadtrat", description="Sitzungen des Stadtrats"),
+        )
+        api_cursor = ApiCursor()
+        await extract_sources_from_api(scraping_source, logger, api_cursor)
+        return api_cursor
+    finally:
+        # The shared session belongs to this test's event loop
+        await close_http_session()
+        await runner.cleanup()
+
+
+def test_cursor_advances_past_all_processed_records():
+    assert asyncio.run(read_api("localhost", failing=set())).latest == "3"
+
+
+def test_cursor_stops_before_records_to_retry():
+    # Record 3 may be processed or fail as well once the server errors back off the domain, but never counts
+    assert asyncio.run(read_api("127.0.0.1", failing={"2"})).latest == "1"
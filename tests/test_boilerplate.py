@@ -0,0 +1,49 @@
+from app.worker.boilerplate import MIN_PAGES_FOR_BOILERPLATE, DomainBoilerplate
+from app.worker.html_parsing import parse_article_html
+
+NAVIGATION = "<nav><a href='/'>Startseite</a> <a href='/presse'>Presse und Aktuelles aus dem Rathaus</a></nav>"
+# A teaser that every article of the domain carries, and that is what the pipeline is looking for
+NEXT_MEETING = "<div><p>Nächste Sitzung des Stadtrats am 12.03.2026, 18 Uhr, im großen Saal</p></div>"
+
+
+def page(number: int) -> str:
+    paragraphs = "".join(
+        f"<p>Bericht {number}, Absatz {paragraph}: Der Ausschuss hat sich mit dem Haushalt, der Sanierung der "
+        f"Schulen und dem Ausbau der Radwege befasst. Die Beratung wird in der nächsten Sitzung fortgesetzt.</p>"
+        for paragraph in range(8)
+    )
+    return (
+        f"<html><head><title>Bericht {number}</title></head><body>{NAVIGATION}"
+        f"<article><h1>Bericht {number} aus dem Ausschuss</h1>{paragraphs}{NEXT_MEETING}</article></body></html>"
+    )
+
+
+def learn(pages: int) -> DomainBoilerplate:
+    boilerplate = DomainBoilerplate(domain="stadt.example")
+    for number in range(pages):
+        url = f"https://stadt.example/presse/{number}"
+        boilerplate.record_page(url, parse_article_html(url, page(number)).block_fingerprints)
+    return boilerplate
+
+
+def test_repeated_block_naming_a_day_survives():
+    boilerplate = learn(MIN_PAGES_FOR_BOILERPLATE + 1)
+    assert boilerplate.fingerprints()
+
+    parsed = parse_article_html("https://stadt.example/presse/new", page(99), boilerplate.fingerprints())
+    assert "12.03.2026" in parsed.markdown
+    assert "Presse und Aktuelles aus dem Rathaus" not in parsed.markdown
+
+
+def test_threshold_grows_with_pages_seen():
+    boilerplate = DomainBoilerplate(domain="stadt.example")
+    for number in range(20):
+        boilerplate.record_page(f"https://stadt.example/{number}", ["header"] + (["venue"] if number < 4 else []))
+    assert boilerplate.fingerprints() == frozenset({"header"})
+
+
+def test_tracking_variants_count_as_one_page():
+    boilerplate = DomainBoilerplate(domain="stadt.example")
+    assert boilerplate.record_page("https://stadt.example/a?utm_source=feed", ["header"])
+    assert not boilerplate.record_page("https://stadt.example/a#comments", ["header"])
+    assert boilerplate.pages_seen == 1
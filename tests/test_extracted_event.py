@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+
+import app.models  # noqa: F401  Registers all models, so the relationships resolve
+from app.core.enums import EventProvenanceEnum, ScrapingSourceEnum
+from app.models.extracted_event import ExtractedEventDB
+from app.worker.scraping_models import ExtractedEvent, ScrapingSourceWorkflow, TopicWorkflow, WebSourceWithMetadata
+
+SCRAPING_SOURCE = ScrapingSourceWorkflow(
+    id=1,
+    topic_id=1,
+    base_url="https://example.com/termine",
+    source_type=ScrapingSourceEnum.WEBPAGE,
+    country_code="DE",
+    topic=TopicWorkflow(id=1, name="Stadtrat", description="Sitzungen des Stadtrats"),
+)
+
+
+def stored_date(date: datetime, provenance: EventProvenanceEnum) -> datetime:
+    event = ExtractedEvent(
+        title="Sitzung des Stadtrats",
+        description="Öffentliche Sitzung",
+        date=date,
+        snippet="am 15. Januar um 14:30 Uhr",
+        country_code="DE",
+        significance=0.5,
+        source=WebSourceWithMetadata(url="https://example.com/termine/1", date=datetime(2026, 1, 2)),
+        provenance=provenance,
+    )
+    return ExtractedEventDB.from_extracted_event(event, SCRAPING_SOURCE).date
+
+
+def test_llm_times_are_taken_as_local_time():
+    for date in (datetime(2026, 1, 15, 14, 30), datetime(2026, 1, 15, 14, 30, tzinfo=timezone.utc)):
+        stored = stored_date(date, EventProvenanceEnum.LLM)
+        assert stored.replace(tzinfo=None) == datetime(2026, 1, 15, 14, 30)
+        assert stored.tzinfo.zone == "Europe/Berlin"
+
+
+def test_structured_data_times_keep_their_instant():
+    stored = stored_date(datetime(2026, 1, 15, 13, 30, tzinfo=timezone.utc), EventProvenanceEnum.STRUCTURED_DATA)
+    assert stored.replace(tzinfo=None) == datetime(2026, 1, 15, 14, 30)
+    assert stored == datetime(2026, 1, 15, 13, 30, tzinfo=timezone.utc)
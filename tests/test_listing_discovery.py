@@ -0,0 +1,31 @@
+import asyncio
+
+import aiohttp
+
+from app.worker.http_client import DomainUnavailableError, UnsupportedContentTypeError
+from app.worker.scraping_models import ListingDiscovery
+from app.worker.scraping_utils import is_transient_failure
+
+
+def test_articles_to_retry_are_not_discovered():
+    discovery = ListingDiscovery(previous_links_hash="old", links_hash="new")
+    discovery.record_attempts(["https://example.com/a", "https://example.com/b"], {"https://example.com/b"})
+    assert discovery.new_urls == ["https://example.com/a"]
+    # Otherwise the next run would skip the unchanged listing without retrying
+    assert discovery.links_hash is None
+
+
+def test_all_articles_attempted_are_discovered():
+    discovery = ListingDiscovery(links_hash="new")
+    discovery.record_attempts(["https://example.com/a"], set())
+    assert discovery.new_urls == ["https://example.com/a"]
+    assert discovery.links_hash == "new"
+
+
+def test_transient_failures():
+    assert is_transient_failure(asyncio.TimeoutError())
+    assert is_transient_failure(DomainUnavailableError("circuit open"))
+    assert is_transient_failure(aiohttp.ClientResponseError(None, (), status=503))
+    assert is_transient_failure(aiohttp.ClientResponseError(None, (), status=429))
+    assert not is_transient_failure(aiohttp.ClientResponseError(None, (), status=404))
+    assert not is_transient_failure(UnsupportedContentTypeError("application/pdf"))
@@ -0,0 +1,40 @@
+import json
+from datetime import datetime, timezone
+
+from app.worker.scraping_utils import estimate_publish_date
+
+URL = "https://news.example/politik/haushalt-beschlossen"
+
+
+def page(*json_ld: dict, head: str = "") -> str:
+    scripts = "".join(f'<script type="application/ld+json">{json.dumps(data)}</script>' for data in json_ld)
+    return f"<html><head>{head}</head><body><article>Text</article>{scripts}</body></html>"
+
+
+def test_date_of_related_article_is_ignored():
+    own = {"@type": "NewsArticle", "@id": f"{URL}#article", "datePublished": "2026-03-01T08:00:00+01:00"}
+    related = {"@type": "NewsArticle", "url": "https://news.example/sport/derby", "datePublished": "2026-10-16"}
+    assert estimate_publish_date(URL, page(related, own)) == datetime(2026, 3, 1, 7, tzinfo=timezone.utc)
+
+
+def test_only_article_on_the_page_is_its_own():
+    article = {"@graph": [{"@type": "WebPage"}, {"@type": "Article", "datePublished": "2026-03-01"}]}
+    assert estimate_publish_date(URL, page(article)) == datetime(2026, 3, 2, tzinfo=timezone.utc)
+
+
+def test_unclear_article_gives_no_date():
+    first = {"@type": "NewsArticle", "url": "https://news.example/a", "datePublished": "2026-03-01"}
+    second = {"@type": "NewsArticle", "url": "https://news.example/b", "datePublished": "2026-10-16"}
+    assert estimate_publish_date(URL, page(first, second)) is None
+
+
+def test_partial_dates_are_rejected():
+    article = {"@type": "NewsArticle", "datePublished": "2026"}
+    assert estimate_publish_date(URL, page(article)) is None
+    meta = '<meta property="article:published_time" content="March 2026">'
+    assert estimate_publish_date(URL, page(head=meta)) is None
+
+
+def test_date_of_meta_tag():
+    meta = '<meta property="article:published_time" content="2026-03-01T08:00:00Z">'
+    assert estimate_publish_date(URL, page(head=meta)) == datetime(2026, 3, 1, 8, tzinfo=timezone.utc)
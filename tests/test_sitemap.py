@@ -0,0 +1,95 @@
+import asyncio
+import gzip
+from datetime import datetime, timezone
+
+from aiohttp import web
+from loguru import logger
+
+from app.core.enums import ScrapingSourceEnum
+from app.worker.http_client import FetchResult, close_http_session
+from app.worker.scraping_models import ScrapingSourceWorkflow, TopicWorkflow
+from app.worker.scraping_utils import SitemapParser, extract_sources_from_sitemap
+
+ARTICLE = """<html><head><title>Artikel</title>
+<meta property="article:published_time" content="{date}"></head>
+<body><article>{text}</article></body></html>"""
+ARTICLE_TEXT = "<p>Der Stadtrat hat heute über den Haushalt beraten und einen Beschluss gefasst.</p>" * 30
+
+
+def sitemap(tag: str, entries: list[tuple[str, str]]) -> bytes:
+    root, entry = ("sitemapindex", "sitemap") if tag == "index" else ("urlset", "url")
+    items = "".join(f"<{entry}><loc>{loc}</loc><lastmod>{lastmod}</lastmod></{entry}>" for loc, lastmod in entries)
+    return f'<?xml version="1.0"?><{root} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{items}</{root}>'.encode()
+
+
+def test_parser_reads_gzipped_sitemap_fed_in_small_chunks():
+    body = gzip.compress(sitemap("urlset", [(f"https://example.com/{number}", "2026-01-10") for number in range(50)]))
+    parser = SitemapParser()
+    for offset in range(0, len(body), 7):
+        parser.feed(body[offset : offset + 7])
+    parser.close()
+
+    assert len(parser.pages) == 50
+    assert parser.pages[0] == ("https://example.com/0", datetime(2026, 1, 11, tzinfo=timezone.utc))
+    assert parser.sitemaps == []
+
+
+async def read_sitemap() -> list[str]:
+    async def nested(request):
+        return web.Response(
+            body=gzip.compress(
+                sitemap(
+                    "urlset",
+                    [
+                        (f"http://localhost:{port}/articles/new", "2026-01-10"),
+                        (f"http://localhost:{port}/articles/old", "2025-06-01"),
+                    ],
+                )
+            ),
+            content_type="application/gzip",
+        )
+
+    async def article(request):
+        date = "2026-01-10T10:00:00Z" if request.match_info["name"] == "new" else "2025-06-01T10:00:00Z"
+        return web.Response(text=ARTICLE.format(date=date, text=ARTICLE_TEXT), content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/sitemap-2026.xml.gz", nested)
+    app.router.add_get("/articles/{name}", article)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        index_url = f"http://localhost:{port}/sitemap.xml"
+        index = FetchResult(
+            url=index_url,
+            status=200,
+            headers={},
+            body=sitemap(
+                "index",
+                [
+                    (f"http://localhost:{port}/sitemap-2026.xml.gz", "2026-01-10"),
+                    (f"http://localhost:{port}/sitemap-2025.xml.gz", "2025-06-01"),  # Unchanged, never requested
+                ],
+            ),
+        )
+        scraping_source = ScrapingSourceWorkflow(
+            id=1,
+            topic_id=1,
+            base_url=index_url,
+            source_type=ScrapingSourceEnum.SITEMAP,
+            last_scraped_at=datetime(2026, 1, 1),  # Stored without a timezone
+            topic=TopicWorkflow(id=1, name="Stadtrat", description="Sitzungen des Stadtrats"),
+        )
+        sources = await extract_sources_from_sitemap(scraping_source, logger, index)
+        return [source.url for source in sources]
+    finally:
+        # The shared session belongs to this test's event loop
+        await close_http_session()
+        await runner.cleanup()
+
+
+def test_streams_nested_sitemaps_and_keeps_articles_changed_since_last_scrape():
+    assert [url.rsplit("/", 1)[1] for url in asyncio.run(read_sitemap())] == ["new"]
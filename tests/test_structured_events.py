@@ -0,0 +1,26 @@
+from datetime import date, timedelta
+
+from app.worker.structured_events import event_from_item
+
+
+def duration(start: str, end: str) -> timedelta | None:
+    return event_from_item({"name": "Stadtfest", "startDate": start, "endDate": end}).duration
+
+
+def test_duration_of_dates_counts_the_last_day():
+    assert duration("2099-07-01", "2099-07-03") == timedelta(days=3)
+
+
+def test_duration_with_date_only_end_lasts_until_the_end_of_that_day():
+    assert duration("2099-07-01T18:00:00+02:00", "2099-07-03") == timedelta(days=2, hours=6)
+    assert duration("2099-07-01T18:00:00", "2099-07-01") == timedelta(hours=6)
+
+
+def test_duration_with_date_only_start_begins_at_midnight():
+    assert duration("2099-07-01", "2099-07-01T18:00:00") == timedelta(hours=18)
+
+
+def test_missing_description_falls_back_to_title():
+    event = event_from_item({"name": "Stadtfest", "startDate": "2099-07-01"})
+    assert event.description == "Stadtfest"
+    assert event.date == date(2099, 7, 1)
@@ -0,0 +1,37 @@
+import pytest
+
+from app.worker import html_parsing
+from app.worker.html_document import HtmlDocument
+from app.worker.html_parsing import (
+    compute_subtree_metrics,
+    extract_main_content_by_ratio,
+    find_leaf_text_elements,
+    prefilter_html,
+)
+
+from .per_node_metrics import fixture_paths, per_node_leaf_text_elements, per_node_subtree_metrics
+
+FIXTURES = fixture_paths()
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=[path.name for path in FIXTURES])
+@pytest.mark.parametrize("prefiltered", [False, True])
+def test_metrics_match_per_node_computation(path, prefiltered):
+    soup = HtmlDocument(path.read_text()).soup
+    if prefiltered:
+        prefilter_html(soup)
+
+    metrics = compute_subtree_metrics(soup)
+    assert metrics == per_node_subtree_metrics(soup)
+    assert find_leaf_text_elements(soup, metrics) == per_node_leaf_text_elements(soup)
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=[path.name for path in FIXTURES])
+def test_main_content_matches_per_node_computation(path, monkeypatch):
+    html = path.read_text()
+    expected_content = extract_main_content_by_ratio(HtmlDocument(html))
+
+    monkeypatch.setattr(html_parsing, "compute_subtree_metrics", per_node_subtree_metrics)
+    per_node_content = extract_main_content_by_ratio(HtmlDocument(html))
+
+    assert str(expected_content) == str(per_node_content)